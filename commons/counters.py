@@ -0,0 +1,74 @@
+from django.db.models import Count, Q
+
+from spartagames.redis_client import r
+
+from .models import Notification
+
+
+# 유저별 알림 개수 (Redis 해시: total, unread, synced)
+# 알림 생성/읽음 처리 시 증감하고, 알림 목록 조회 시에는 DB count 대신 사용
+NOTIFICATION_COUNTS_PREFIX = "commons:notifications:counts"
+# 카운터 만료 시간 (DB에서 다시 계산한 시점부터, 증감해도 연장하지 않음)
+# 알림 저장과 카운터 증감 사이에 다시 계산되어 생긴 오차는 만료 후 다음 조회 때 바로잡힘
+NOTIFICATION_COUNTS_TIMEOUT = 60 * 60
+
+# 카운터가 없을 때만 DB에서 계산한 값으로 생성 (동시에 다시 계산하거나 증감한 값을 덮어쓰지 않음)
+_REBUILD_SCRIPT = """
+if redis.call("HEXISTS", KEYS[1], "synced") == 0 then
+    redis.call("HSET", KEYS[1], "total", ARGV[1], "unread", ARGV[2], "synced", 1)
+    redis.call("EXPIRE", KEYS[1], ARGV[3])
+end
+return redis.call("HMGET", KEYS[1], "total", "unread")
+"""
+# 카운터가 있을 때만 증감 (없으면 다음 조회 때 DB에서 계산)
+_INCREMENT_SCRIPT = """
+if redis.call("HEXISTS", KEYS[1], "synced") == 1 then
+    redis.call("HINCRBY", KEYS[1], "total", ARGV[1])
+    redis.call("HINCRBY", KEYS[1], "unread", ARGV[2])
+end
+return 0
+"""
+_CLEAR_UNREAD_SCRIPT = """
+if redis.call("HEXISTS", KEYS[1], "synced") == 1 then
+    redis.call("HSET", KEYS[1], "unread", 0)
+end
+return 0
+"""
+
+
+def _counts_key(user_id):
+    return f"{NOTIFICATION_COUNTS_PREFIX}:{user_id}"
+
+
+def get_notification_counts(user_id):
+    """
+    유저의 전체/읽지 않은 알림 개수
+    반환값: {"total": 전체 개수, "unread": 읽지 않은 개수}
+    """
+    key = _counts_key(user_id)
+    total, unread, synced = r.hmget(key, "total", "unread", "synced")
+    if synced is None:
+        # 카운터가 없으면 DB에서 한 번 계산
+        counts = Notification.objects.filter(user_id=user_id).aggregate(
+            total=Count("id"),
+            unread=Count("id", filter=Q(is_read=False)),
+        )
+        total, unread = r.eval(_REBUILD_SCRIPT, 1, key, counts["total"], counts["unread"], NOTIFICATION_COUNTS_TIMEOUT)
+    return {"total": max(int(total or 0), 0), "unread": max(int(unread or 0), 0)}
+
+
+def increment_notification_counts(user_ids, total=1, unread=1):
+    """
+    알림 개수 증감 (알림 생성 시 total, unread 증가 / 읽음 처리 시 unread 감소)
+    """
+    pipe = r.pipeline()
+    for user_id in user_ids:
+        pipe.eval(_INCREMENT_SCRIPT, 1, _counts_key(user_id), total, unread)
+    pipe.execute()
+
+
+def clear_unread_notification_count(user_id):
+    """
+    읽지 않은 알림 개수를 0으로 설정 (모두 읽음 처리 시)
+    """
+    r.eval(_CLEAR_UNREAD_SCRIPT, 1, _counts_key(user_id))
@@ -0,0 +1,185 @@
+import asyncio
+import inspect
+import logging
+import statistics
+import time
+import uuid
+
+import asgiref.sync
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework_simplejwt.tokens import AccessToken
+
+from spartagames.authentication import CachedJWTAuthentication
+from spartagames.custom_middleware import CustomXFrameOptionsMiddleware, DRFStandardResponseMiddleware
+from spartagames.logging_context import clear_request_context, set_request_context
+
+
+logger = logging.getLogger("sparta_games")
+
+BENCH_EMAIL = "bench-asgi@bench.local"
+
+
+class LegacyRequestContextMiddleware(MiddlewareMixin):
+    """
+    기존 RequestContextMiddleware (비교용)
+    MiddlewareMixin + async __call__ 이라서 ASGI 에서 앞뒤 미들웨어와 이벤트 루프/스레드를 오가고
+    JWT 유저 조회를 이벤트 루프 안에서 실행함
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.jwt_authenticator = CachedJWTAuthentication()
+
+    async def __call__(self, request):
+        try:
+            request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+            request.request_id = request_id
+
+            user = getattr(request, "user", None)
+            try:
+                auth = self.jwt_authenticator.authenticate(request)
+                if auth is not None:
+                    user, _ = auth
+                    request.user = user
+            except Exception:
+                user = None
+
+            if user and request.user.is_authenticated:
+                user_id = request.user.pk
+            else:
+                user_id = "anonymous"
+
+            set_request_context(request_id=request_id, user_id=user_id, path=request.path, method=request.method)
+            logger.info(
+                "REQUEST START",
+                extra={"request_id": request_id, "user_id": user_id, "path": request.path, "method": request.method},
+            )
+
+            response = self.get_response(request)
+            if inspect.iscoroutine(response):
+                response = await response
+
+            logger.info(
+                f"REQUEST END (status_code: {response.status_code})",
+                extra={"request_id": request_id, "status_code": response.status_code},
+            )
+            response["X-Request-ID"] = request_id
+            return response
+        finally:
+            clear_request_context()
+
+
+class LegacyCustomXFrameOptionsMiddleware(MiddlewareMixin):
+    # 기존 방식: ASGI 에서 process_response 를 sync_to_async 로 실행
+    process_response = CustomXFrameOptionsMiddleware.process_response
+
+
+class LegacyDRFStandardResponseMiddleware(MiddlewareMixin):
+    process_response = DRFStandardResponseMiddleware.process_response
+    _is_std_response_format = DRFStandardResponseMiddleware._is_std_response_format
+    _wrap_drf_response = DRFStandardResponseMiddleware._wrap_drf_response
+
+
+LEGACY_MIDDLEWARE = {
+    "spartagames.custom_middleware.RequestContextMiddleware": f"{__name__}.LegacyRequestContextMiddleware",
+    "spartagames.custom_middleware.CustomXFrameOptionsMiddleware": f"{__name__}.LegacyCustomXFrameOptionsMiddleware",
+    "spartagames.custom_middleware.DRFStandardResponseMiddleware": f"{__name__}.LegacyDRFStandardResponseMiddleware",
+}
+
+
+class HopCounter:
+    """
+    sync_to_async (이벤트 루프 -> 스레드), async_to_sync (스레드 -> 이벤트 루프) 전환 횟수
+    """
+
+    def __init__(self):
+        self.sync_to_async = 0
+        self.async_to_sync = 0
+
+    def __enter__(self):
+        counter = self
+        self.original = (asgiref.sync.SyncToAsync.__call__, asgiref.sync.AsyncToSync.__call__)
+        sync_to_async_call, async_to_sync_call = self.original
+
+        async def counted_sync_to_async(self, *args, **kwargs):
+            counter.sync_to_async += 1
+            return await sync_to_async_call(self, *args, **kwargs)
+
+        def counted_async_to_sync(self, *args, **kwargs):
+            counter.async_to_sync += 1
+            return async_to_sync_call(self, *args, **kwargs)
+
+        asgiref.sync.SyncToAsync.__call__ = counted_sync_to_async
+        asgiref.sync.AsyncToSync.__call__ = counted_async_to_sync
+        return self
+
+    def __exit__(self, *exc):
+        asgiref.sync.SyncToAsync.__call__, asgiref.sync.AsyncToSync.__call__ = self.original
+
+
+async def asgi_get(app, path, token=None):
+    headers = [(b"host", b"localhost")]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "", "headers": headers,
+        "client": ("127.0.0.1", 50000), "server": ("localhost", 80),
+    }
+    communicator = ApplicationCommunicator(app, scope)
+    await communicator.send_input({"type": "http.request", "body": b""})
+    start = await communicator.receive_output(10)
+    await communicator.receive_output(10)
+    await communicator.wait()
+    return start["status"]
+
+
+class Command(BaseCommand):
+    help = (
+        "ASGI(daphne 가 실행하는 Django ASGI 애플리케이션) 요청당 sync/async 전환 횟수와 응답 시간 벤치마크: "
+        "기존 MiddlewareMixin 기반 RequestContextMiddleware 등과 현재 미들웨어 비교"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/commons/api/alarm/", help="요청 경로 (GET)")
+        parser.add_argument("--requests", type=int, default=200, help="경우별 요청 수")
+
+    def handle(self, *args, **options):
+        user, _ = get_user_model().objects.get_or_create(
+            email=BENCH_EMAIL, defaults={"nickname": "benchasgi", "password": "!"}
+        )
+        token = str(AccessToken.for_user(user))
+        legacy_middleware = [LEGACY_MIDDLEWARE.get(path, path) for path in settings.MIDDLEWARE]
+
+        try:
+            self.stdout.write(f"path: {options['path']}, requests: {options['requests']}")
+            self.stdout.write(f"{'middleware':<12}{'auth':<7}{'status':>7}{'sync_to_async':>15}{'async_to_sync':>15}{'mean ms':>9}")
+            for name, middleware in (("legacy", legacy_middleware), ("current", settings.MIDDLEWARE)):
+                with override_settings(MIDDLEWARE=middleware):
+                    app = ASGIHandler()
+                for auth, request_token in (("jwt", token), ("anon", None)):
+                    self.stdout.write(asyncio.run(
+                        self.measure(app, name, auth, options["path"], request_token, options["requests"])
+                    ))
+        finally:
+            user.delete()
+
+    async def measure(self, app, name, auth, path, token, count):
+        # 첫 요청은 URL/유저 캐시 등을 채우므로 제외
+        await asgi_get(app, path, token)
+        timings = []
+        with HopCounter() as hops:
+            for _ in range(count):
+                started = time.perf_counter()
+                status_code = await asgi_get(app, path, token)
+                timings.append((time.perf_counter() - started) * 1000)
+        return (
+            f"{name:<12}{auth:<7}{status_code:>7}{hops.sync_to_async / count:>15.1f}"
+            f"{hops.async_to_sync / count:>15.1f}{statistics.mean(timings):>9.2f}"
+        )
@@ -0,0 +1,103 @@
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from commons.models import Notification
+from commons.utils import NotificationSubType, create_notifications_bulk, get_notification_message
+
+
+BENCH_EMAIL_DOMAIN = "bench.local"
+
+
+def legacy_create_notification(user, noti_type, noti_sub_type, related_object=None, game_title=None):
+    """
+    기존 create_notification (비교용)
+    유저마다 ContentType 조회, INSERT, async_to_sync(group_send) 를 차례로 실행
+    """
+    message = get_notification_message(noti_sub_type, game_title)
+    content_type = None
+    content_id = None
+    if related_object:
+        content_type = ContentType.objects.get_for_model(related_object)
+        content_id = related_object.pk
+
+    notif = Notification.objects.create(
+        user=user, noti_type=noti_type, message=message, content_type=content_type, content_id=content_id,
+    )
+    channel_layer = get_channel_layer()
+    async_to_sync(channel_layer.group_send)(
+        f"user_{user.id}",
+        {
+            "type": "notify",
+            "content": {
+                "id": notif.id,
+                "noti_type": notif.noti_type,
+                "message": notif.message,
+                "create_dt": notif.create_dt.isoformat(),
+                "is_read": notif.is_read,
+            }
+        }
+    )
+    return notif
+
+
+class Command(BaseCommand):
+    help = (
+        "알림 일괄 생성 벤치마크: 유저마다 create_notification 을 호출하는 기존 방식과 "
+        "create_notifications_bulk (create_notifications_task 본문) 비교. "
+        "설정된 DB, 채널 레이어(Redis)를 사용하며 벤치마크용 유저와 알림은 끝나면 삭제함"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=1000, help="알림 받을 유저 수")
+        parser.add_argument("--skip-legacy", action="store_true", help="기존 방식 측정 생략")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        count = options["recipients"]
+        User.objects.bulk_create(
+            [
+                User(email=f"bench-noti{i}@{BENCH_EMAIL_DOMAIN}", nickname=f"benchnoti{i}", password="!")
+                for i in range(count)
+            ],
+            batch_size=1000,
+        )
+        users = list(User.objects.filter(email__startswith="bench-noti", email__endswith=f"@{BENCH_EMAIL_DOMAIN}"))
+        related_object = users[0]
+        noti_type = Notification.NotificationType.GAME_UPLOAD
+        noti_sub_type = NotificationSubType.REVIEW_REGISTER
+
+        try:
+            self.stdout.write(f"recipients: {len(users)}")
+            self.stdout.write(f"{'case':<28}{'seconds':>9}{'queries':>9}{'notifs/s':>10}")
+            if not options["skip_legacy"]:
+                def legacy():
+                    for user in users:
+                        legacy_create_notification(user, noti_type, noti_sub_type, related_object=related_object, game_title="bench")
+                self.measure("legacy (per user)", legacy, len(users))
+
+            content_type_id = ContentType.objects.get_for_model(related_object).pk
+            self.measure(
+                "create_notifications_bulk",
+                lambda: create_notifications_bulk(
+                    [user.pk for user in users], noti_type, noti_sub_type,
+                    content_type_id=content_type_id, content_id=related_object.pk, game_title="bench",
+                ),
+                len(users),
+            )
+        finally:
+            Notification.objects.filter(user__in=users).delete()
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    def measure(self, name, func, count):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            func()
+            seconds = time.perf_counter() - started
+        self.stdout.write(f"{name:<28}{seconds:>9.2f}{len(queries.captured_queries):>9}{count / seconds:>10.0f}")
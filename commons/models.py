@@ -44,3 +44,9 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-create_dt']
+        indexes = [
+            # 알림 목록 (유저별 최신순 cursor 페이지네이션)
+            models.Index(fields=["user", "-create_dt"], name="notification_user_dt_idx"),
+            # 읽지 않은 알림 조회/모두 읽음 처리
+            models.Index(fields=["user", "is_read"], name="notification_user_read_idx"),
+        ]
@@ -0,0 +1,29 @@
+import logging
+
+from celery import shared_task
+
+from .utils import NotificationSubType, create_notifications_bulk
+
+
+logger = logging.getLogger("sparta_games_celery")
+
+
+@shared_task
+def create_notifications_task(user_ids, noti_type, noti_sub_type, content_type_id=None, content_id=None, game_title=None):
+    """
+    알림 생성 및 실시간 전송 (commons.utils.queue_notifications 에서 등록)
+    """
+    try:
+        notifs = create_notifications_bulk(
+            user_ids,
+            noti_type,
+            NotificationSubType(noti_sub_type),
+            content_type_id=content_type_id,
+            content_id=content_id,
+            game_title=game_title,
+        )
+    except Exception as e:
+        logger.error(f"알림 생성 실패: {e}", exc_info=True)
+        raise
+    logger.info(f"알림 {len(notifs)}개 생성 및 전송 완료 ({noti_sub_type})")
+    return len(notifs)
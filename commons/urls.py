@@ -8,5 +8,6 @@ urlpatterns = [
     # ---------- API---------- #
     path("api/presigned-url/upload/", views.S3UploadPresignedUrlView.as_view(), name="presigned_url_for_upload"),
     path("api/alarm/", views.NotificationListView.as_view(), name="notification_list"),
+    path("api/alarm/read/", views.NotificationMarkAllReadView.as_view(), name="notification_read_all"),
     path("api/alarm/<int:noti_id>/read/", views.NotificationMarkReadView.as_view(), name="notification_read"),
 ]
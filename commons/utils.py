@@ -1,11 +1,21 @@
+import asyncio
+
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 from enum import Enum
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from .counters import increment_notification_counts
 from .models import Notification
 
 
+# 여러 유저에게 알림을 보낼 때 한 번에 INSERT 할 행 수
+NOTIFICATION_BATCH_SIZE = 500
+# 실시간 전송(group_send)을 동시에 보낼 최대 개수 (Redis 연결 수 제한)
+NOTIFICATION_SEND_CONCURRENCY = 50
+
+
 # class NOTI_MESSAGE_TEMPLATES(str, Enum):
 class NotificationSubType(str, Enum):
     REGISTER_REQUEST = "검수요청"
@@ -26,13 +36,50 @@ NOTI_MESSAGE_TEMPLATES = {
 }
 
 
-def create_notification(user, noti_type, noti_sub_type, related_object=None, game_title=None):
-
+def get_notification_message(noti_sub_type, game_title=None):
     message_func = NOTI_MESSAGE_TEMPLATES.get(noti_sub_type)
     if message_func:
-        message = message_func(game_title)
-    else:
-        message = "새로운 알림이 도착했습니다."
+        return message_func(game_title)
+    return "새로운 알림이 도착했습니다."
+
+
+def _notification_event(notif):
+    return {
+        "type": "notify",
+        "content": {
+            "id": notif.id,
+            "noti_type": notif.noti_type,
+            "message": notif.message,
+            "create_dt": notif.create_dt.isoformat(),
+            "is_read": notif.is_read,
+        }
+    }
+
+
+async def _group_send_all(channel_layer, notifs):
+    semaphore = asyncio.Semaphore(NOTIFICATION_SEND_CONCURRENCY)
+
+    async def send(notif):
+        async with semaphore:
+            await channel_layer.group_send(f"user_{notif.user_id}", _notification_event(notif))
+
+    await asyncio.gather(*(send(notif) for notif in notifs))
+
+
+def send_notifications(notifs):
+    """
+    실시간 전송 (Django Channels)
+    알림 여러 개를 하나의 이벤트 루프에서 동시에 전송 (알림마다 async_to_sync 를 호출하지 않음)
+    """
+    if not notifs:
+        return
+    channel_layer = get_channel_layer()
+    async_to_sync(_group_send_all)(channel_layer, notifs)
+
+
+def create_notification(user, noti_type, noti_sub_type, related_object=None, game_title=None):
+
+    message = get_notification_message(noti_sub_type, game_title)
 
     content_type = None
     content_id = None
@@ -47,21 +94,58 @@ def create_notification(user, noti_type, noti_sub_type, related_object=None, gam
         content_type=content_type,
         content_id=content_id
     )
+    increment_notification_counts([notif.user_id])
 
     # 실시간 전송 (Django Channels)
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        f"user_{user.id}",
-        {
-            "type": "notify",
-            "content": {
-                "id": notif.id,
-                "noti_type": notif.noti_type,
-                "message": notif.message,
-                "create_dt": notif.create_dt.isoformat(),
-                "is_read": notif.is_read,
-            }
-        }
-    )
+    send_notifications([notif])
 
     return notif
+
+
+def create_notifications_bulk(user_ids, noti_type, noti_sub_type, content_type_id=None, content_id=None, game_title=None):
+    """
+    여러 유저에게 같은 알림 생성 (bulk_create) 후 실시간 전송
+    반환값: 생성한 Notification 목록
+    """
+    message = get_notification_message(noti_sub_type, game_title)
+    notifs = Notification.objects.bulk_create(
+        [
+            Notification(
+                user_id=user_id,
+                noti_type=noti_type,
+                message=message,
+                content_type_id=content_type_id,
+                content_id=content_id,
+            )
+            for user_id in dict.fromkeys(user_ids)
+        ],
+        batch_size=NOTIFICATION_BATCH_SIZE,
+    )
+    increment_notification_counts([notif.user_id for notif in notifs])
+    send_notifications(notifs)
+    return notifs
+
+
+def queue_notifications(users, noti_type, noti_sub_type, related_object=None, game_title=None):
+    """
+    알림 생성/전송을 Celery 작업으로 넘김 (요청 처리 중에는 DB INSERT, Redis 전송을 기다리지 않음)
+    트랜잭션 안에서 호출하면 커밋된 후에 작업을 등록함
+    users: User 또는 user id 목록
+    """
+    from .tasks import create_notifications_task
+
+    user_ids = [getattr(user, "pk", user) for user in users]
+    content_type_id = None
+    content_id = None
+    if related_object:
+        content_type_id = ContentType.objects.get_for_model(related_object).id
+        content_id = related_object.pk
+
+    transaction.on_commit(lambda: create_notifications_task.delay(
+        user_ids,
+        noti_type,
+        noti_sub_type,
+        content_type_id=content_type_id,
+        content_id=content_id,
+        game_title=game_title,
+    ))
@@ -3,7 +3,6 @@ import os
 import re
 import uuid
 
-import boto3
 from bs4 import BeautifulSoup
 
 from django.conf import settings
@@ -22,9 +21,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
+from spartagames.s3 import get_s3_client
 from spartagames.utils import std_response
-from spartagames.config import AWS_AUTH, AWS_S3_BUCKET_NAME, AWS_S3_REGION_NAME, AWS_S3_CUSTOM_DOMAIN, AWS_S3_BUCKET_IMAGES
+from spartagames.config import AWS_S3_BUCKET_NAME, AWS_S3_REGION_NAME, AWS_S3_CUSTOM_DOMAIN, AWS_S3_BUCKET_IMAGES
 
+from .counters import clear_unread_notification_count, get_notification_counts, increment_notification_counts
 from .models import Notification
 from .pagination import NotificationPagination
 from .serializers import NotificationSerializer
@@ -42,12 +43,7 @@ def generate_presigned_url_for_upload(base_path, extension):
             status_code=status.HTTP_400_BAD_REQUEST
         )
     
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=AWS_AUTH["aws_access_key_id"],
-        aws_secret_access_key=AWS_AUTH["aws_secret_access_key"],
-        region_name=AWS_S3_REGION_NAME,
-    )
+    s3 = get_s3_client(AWS_S3_REGION_NAME)
     time_data = timezone.now().strftime("%Y%m%d%H%M%S%f")
     object_key = f'{base_path}/{time_data}_{uuid.uuid4()}.{extension}'
     
@@ -135,12 +131,15 @@ class NotificationListView(APIView):
 
         serializer = NotificationSerializer(paginated_qs, many=True)
         response_data = paginator.get_paginated_response(serializer.data).data
-        
+
+        # 전체 알림 count 대신 Redis 카운터 사용
+        counts = get_notification_counts(user.id)
+
         # return response_data
         return std_response(
             data=response_data["results"],
             message="알람을 불러왔습니다.", status="success",
-            pagination={"count": qs.count(), "next":response_data["next"], "previous":response_data["previous"]},
+            pagination={"count": counts["total"], "unread_count": counts["unread"], "next":response_data["next"], "previous":response_data["previous"]},
             status_code=status.HTTP_200_OK
         )
 
@@ -152,6 +151,21 @@ class NotificationMarkReadView(APIView):
         qs = Notification.objects.get(id=noti_id)
         if qs.user != request.user:
             return std_response(message="잘못된 접근입니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_403_FORBIDDEN)
-        qs.is_read = True
-        qs.save()
+        # 읽지 않은 알림인 경우에만 읽지 않은 알림 개수 감소
+        if Notification.objects.filter(id=qs.id, is_read=False).update(is_read=True):
+            increment_notification_counts([request.user.id], total=0, unread=-1)
         return std_response(message="알림 읽음 처리를 완료했습니다.", status="success", status_code=status.HTTP_200_OK)
+
+
+class NotificationMarkAllReadView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def patch(self, request):
+        # UPDATE 한 번으로 처리
+        updated = Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        clear_unread_notification_count(request.user.id)
+        return std_response(
+            data={"updated": updated},
+            message="모든 알림 읽음 처리를 완료했습니다.", status="success",
+            status_code=status.HTTP_200_OK
+        )
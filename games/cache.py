@@ -0,0 +1,81 @@
+import time
+
+from django.core.cache import cache
+
+from .models import Like
+from .serializers import GameListSerializer
+
+
+# 메인 홈 게임 목록 캐시 (섹션별 카드 목록, 유저와 무관한 데이터만 저장)
+HOME_FEED_CACHE_PREFIX = "games:home_feed"
+HOME_FEED_CACHE_VERSION_KEY = f"{HOME_FEED_CACHE_PREFIX}:version"
+# 무효화가 누락되더라도 별점, 제작자 닉네임 등은 이 시간 안에 갱신됨
+HOME_FEED_CACHE_TIMEOUT = 60 * 10
+# 섹션별 게임 수(limit) 허용 범위 (limit 값마다 캐시 키가 따로 생기므로 제한)
+HOME_FEED_LIMIT_MIN = 1
+HOME_FEED_LIMIT_MAX = 20
+
+
+def get_home_feed_cache_version():
+    version = cache.get(HOME_FEED_CACHE_VERSION_KEY)
+    if version is None:
+        # 버전 키가 사라진 경우 이전 버전과 겹치지 않도록 현재 시각으로 초기화
+        cache.add(HOME_FEED_CACHE_VERSION_KEY, int(time.time()), timeout=None)
+        version = cache.get(HOME_FEED_CACHE_VERSION_KEY)
+    return version
+
+
+def invalidate_home_feed_cache():
+    """
+    게임 승인, 칩 재할당, 게임 수정 시 호출
+    버전을 올려 기존 섹션 캐시를 모두 무효화함 (이전 버전 데이터는 TTL 후 만료)
+    """
+    try:
+        cache.incr(HOME_FEED_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(HOME_FEED_CACHE_VERSION_KEY, int(time.time()), timeout=None)
+
+
+def get_home_feed_sections(sections, limit):
+    """
+    섹션별 게임 카드 목록을 캐시에서 가져오고, 없는 섹션만 DB에서 조회하여 캐시에 저장
+    sections: {섹션 이름: 게임 쿼리셋을 반환하는 함수}
+    """
+    version = get_home_feed_cache_version()
+    keys = {
+        name: f"{HOME_FEED_CACHE_PREFIX}:v{version}:{name}:{limit}"
+        for name in sections
+    }
+    cached = cache.get_many(keys.values())
+
+    result = {}
+    missing = {}
+    for name, key in keys.items():
+        if key in cached:
+            result[name] = cached[key]
+        else:
+            # 유저 정보 없이 직렬화 (is_liked는 응답 직전에 덮어씀)
+            result[name] = list(GameListSerializer(sections[name](), many=True, context={}).data)
+            missing[key] = result[name]
+
+    if missing:
+        cache.set_many(missing, timeout=HOME_FEED_CACHE_TIMEOUT)
+
+    return result
+
+
+def overlay_is_liked(card_lists, user):
+    """
+    캐시된 카드 목록에 현재 유저의 즐겨찾기 여부를 한 번의 쿼리로 반영
+    """
+    liked_game_ids = set()
+    if user and user.is_authenticated:
+        game_ids = {card["id"] for cards in card_lists for card in cards}
+        if game_ids:
+            liked_game_ids = set(
+                Like.objects.filter(user=user, game_id__in=game_ids).values_list("game_id", flat=True)
+            )
+
+    for cards in card_lists:
+        for card in cards:
+            card["is_liked"] = card["id"] in liked_game_ids
@@ -0,0 +1,139 @@
+from datetime import datetime
+import json
+import uuid
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from spartagames.redis_client import r
+
+from .models import Game
+
+
+# 게임 조회/플레이 이벤트 버퍼 (요청 처리 중에는 Redis 리스트에 쌓고, games.tasks.flush_game_events 에서 일괄 저장)
+GAME_EVENTS_KEY = "games:events"
+# 저장 중인 이벤트 배치 (DB 커밋 후 삭제, 워커가 강제 종료되면 다음 실행에서 다시 저장)
+GAME_EVENTS_PROCESSING_KEY = "games:events:processing"
+# 플레이 시작 토큰 (플레이 종료 시 시작 시각 확인용)
+PLAY_TOKEN_PREFIX = "games:play"
+PLAY_TOKEN_TIMEOUT = 60 * 60 * 24
+# 아직 DB에 반영되지 않은 유저별 게임 플레이 시간 (초)
+PENDING_PLAYTIME_KEY = "games:playtime:pending"
+# 게임 노출 여부 캐시
+GAME_PLAYABLE_CACHE_TIMEOUT = 60
+
+# 저장 중인 배치가 남아 있으면 그대로, 없으면 버퍼 앞쪽 ARGV[1]개를 저장 중 리스트로 옮김
+_CLAIM_SCRIPT = """
+local events = redis.call("LRANGE", KEYS[2], 0, -1)
+if #events == 0 then
+    events = redis.call("LRANGE", KEYS[1], 0, ARGV[1] - 1)
+    if #events > 0 then
+        redis.call("LTRIM", KEYS[1], #events, -1)
+        redis.call("RPUSH", KEYS[2], unpack(events))
+    end
+end
+return events
+"""
+
+
+def is_game_playable(game_id):
+    """
+    노출 중인 게임인지 확인 (짧게 캐시하여 이벤트 요청마다 DB를 조회하지 않음)
+    """
+    key = f"games:playable:{game_id}"
+    playable = cache.get(key)
+    if playable is None:
+        playable = Game.objects.filter(pk=game_id, is_visible=True).exists()
+        cache.set(key, playable, timeout=GAME_PLAYABLE_CACHE_TIMEOUT)
+    return playable
+
+
+def _push_event(event, client=r):
+    client.rpush(GAME_EVENTS_KEY, json.dumps(event))
+
+
+def record_view(user_id, game_id):
+    """
+    게임 조회 이벤트 기록
+    """
+    _push_event({
+        "type": "view",
+        "user_id": user_id,
+        "game_id": game_id,
+        "at": timezone.now().isoformat(),
+    })
+
+
+def start_play(user_id, game_id):
+    """
+    플레이 시작 토큰 발급 (시작 시각은 Redis에 저장)
+    """
+    token = uuid.uuid4().hex
+    r.set(
+        f"{PLAY_TOKEN_PREFIX}:{token}",
+        json.dumps({"user_id": user_id, "game_id": game_id, "start_at": timezone.now().isoformat()}),
+        ex=PLAY_TOKEN_TIMEOUT,
+    )
+    return token
+
+
+def finish_play(token, user_id, game_id):
+    """
+    플레이 종료 이벤트 기록
+    토큰이 없거나 다른 유저/게임의 토큰이면 None, 정상이면 (시작 시각, 종료 시각, 플레이 시간) 반환
+    """
+    key = f"{PLAY_TOKEN_PREFIX}:{token}"
+    play = r.getdel(key)
+    if play is None:
+        return None
+    play = json.loads(play)
+    if play["user_id"] != user_id or play["game_id"] != game_id:
+        # 다른 유저/게임의 토큰이면 원래대로 되돌림
+        r.set(key, json.dumps(play), ex=PLAY_TOKEN_TIMEOUT)
+        return None
+
+    start_at = datetime.fromisoformat(play["start_at"])
+    end_at = timezone.now()
+    playtime = int((end_at - start_at).total_seconds())
+    # 이벤트와 미반영 플레이 시간을 함께 기록 (그 사이 저장되면 미반영 시간이 음수가 됨)
+    pipe = r.pipeline(transaction=True)
+    _push_event({
+        "type": "play",
+        "user_id": user_id,
+        "game_id": game_id,
+        "start_at": play["start_at"],
+        "end_at": end_at.isoformat(),
+        "playtime": playtime,
+    }, client=pipe)
+    pipe.hincrby(PENDING_PLAYTIME_KEY, f"{user_id}:{game_id}", playtime)
+    pipe.execute()
+    return start_at, end_at, playtime
+
+
+def get_pending_playtime(user_id, game_id):
+    """
+    아직 DB에 반영되지 않은 플레이 시간 (초)
+    """
+    return int(r.hget(PENDING_PLAYTIME_KEY, f"{user_id}:{game_id}") or 0)
+
+
+def claim_game_events(batch_size):
+    """
+    저장할 이벤트 배치를 최대 batch_size개 가져옴
+    버퍼에서 저장 중 리스트로 한 번에 옮기고, ack_game_events 를 호출할 때까지 남겨 둠
+    이전 실행이 저장 도중 종료되어 남은 배치가 있으면 그 배치를 먼저 반환
+    (DB 커밋 직후 종료된 경우에는 같은 배치가 한 번 더 저장될 수 있음)
+    """
+    return r.eval(_CLAIM_SCRIPT, 2, GAME_EVENTS_KEY, GAME_EVENTS_PROCESSING_KEY, batch_size)
+
+
+def ack_game_events(playtimes):
+    """
+    DB에 저장한 배치를 삭제하고, 반영된 플레이 시간을 미반영 플레이 시간에서 차감
+    playtimes: {(user_id, game_id): 초}
+    """
+    pipe = r.pipeline(transaction=True)
+    for (user_id, game_id), seconds in playtimes.items():
+        pipe.hincrby(PENDING_PLAYTIME_KEY, f"{user_id}:{game_id}", -seconds)
+    pipe.delete(GAME_EVENTS_PROCESSING_KEY)
+    pipe.execute()
@@ -0,0 +1,67 @@
+import io
+import os
+
+from PIL import Image, ImageOps
+from django.core.files.base import ContentFile
+
+
+# 썸네일/스크린샷 WebP 변환본 크기 (긴 변 기준 최대 px, 원본보다 크게 늘리지 않음)
+# card: 게임 카드 목록, detail: 게임 상세, retina: 상세 고해상도(2x)
+IMAGE_VARIANT_SIZES = {
+    "card": 480,
+    "detail": 1280,
+    "retina": 2560,
+}
+IMAGE_VARIANT_FORMAT = "WEBP"
+IMAGE_VARIANT_QUALITY = 80
+
+
+def make_image_variants(field_file):
+    """
+    이미지 원본으로 크기별 WebP 변환본을 만들어 원본과 같은 폴더에 저장
+    반환값: {"src": 원본 경로, <크기 이름>: 변환본 경로, ...}
+    """
+    storage = field_file.storage
+    with storage.open(field_file.name, "rb") as f:
+        img = Image.open(f)
+        img.load()
+    # 카메라 회전 정보(EXIF) 반영
+    img = ImageOps.exif_transpose(img)
+    if img.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in img.getbands() or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+    base_name = os.path.splitext(field_file.name)[0]
+    variants = {"src": field_file.name}
+    for size_name, max_size in IMAGE_VARIANT_SIZES.items():
+        resized = img.copy()
+        resized.thumbnail((max_size, max_size), Image.LANCZOS)
+
+        buffer = io.BytesIO()
+        resized.save(buffer, IMAGE_VARIANT_FORMAT, quality=IMAGE_VARIANT_QUALITY, method=4)
+        variants[size_name] = storage.save(f"{base_name}_{size_name}.webp", ContentFile(buffer.getvalue()))
+    return variants
+
+
+def delete_image_variants(storage, variants):
+    """
+    변환본 삭제 (원본을 교체/삭제할 때 사용)
+    """
+    for size_name in IMAGE_VARIANT_SIZES:
+        if variants.get(size_name):
+            storage.delete(variants[size_name])
+
+
+def get_image_variant_urls(field_file, variants):
+    """
+    크기별 이미지 url
+    변환본이 아직 없거나 원본이 바뀐 경우 원본 url 사용
+    """
+    if not field_file:
+        return None
+    original_url = field_file.url
+    is_ready = variants.get("src") == field_file.name
+    return {
+        size_name: field_file.storage.url(variants[size_name]) if is_ready and variants.get(size_name) else original_url
+        for size_name in IMAGE_VARIANT_SIZES
+    }
@@ -0,0 +1,126 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from games.events import GAME_EVENTS_KEY
+from games.models import Game, PlayLog, TotalPlayTime
+from games.tasks import flush_game_events
+from games.views import GamePlaytimeAPIView
+from spartagames.redis_client import r
+from spartagames.utils import std_response
+
+
+BENCH_EMAIL_DOMAIN = "bench.local"
+
+
+class LegacyGamePlaytimeAPIView(APIView):
+    """
+    기존 GamePlaytimeAPIView (비교용)
+    플레이 시작 시 exists(), get(), create(), 종료 시 get_or_create() 와 save() 2번을 요청 처리 중에 실행
+    """
+
+    def get(self, request, game_id):
+        if Game.objects.filter(pk=game_id, is_visible=True).exists():
+            game = Game.objects.get(pk=game_id, is_visible=True)
+            playtime = PlayLog.objects.create(user=request.user, game=game, start_at=timezone.now())
+            return std_response(data={"playtime_id": playtime.pk}, status="success", status_code=status.HTTP_200_OK)
+        return std_response(status="fail", status_code=status.HTTP_404_NOT_FOUND)
+
+    def post(self, request, game_id):
+        if Game.objects.filter(pk=game_id, is_visible=True).exists():
+            game = Game.objects.get(pk=game_id, is_visible=True)
+            playlog = PlayLog.objects.get(pk=request.data.get("playtime_id"))
+            totalplaytime, _ = TotalPlayTime.objects.get_or_create(user=request.user, game=game)
+            playlog.end_at = timezone.now()
+            totalplaytime.latest_at = timezone.now()
+            totaltime = (playlog.end_at - playlog.start_at).total_seconds()
+            playlog.playtime = totaltime
+            totalplaytime.totaltime = totalplaytime.totaltime + totaltime
+            playlog.save()
+            totalplaytime.save()
+            return std_response(status="success", status_code=status.HTTP_200_OK)
+        return std_response(status="fail", status_code=status.HTTP_404_NOT_FOUND)
+
+
+class Command(BaseCommand):
+    help = (
+        "게임 플레이 시작/종료 API 부하 벤치마크: 기존 동기 DB 저장 방식과 Redis 이벤트 버퍼 방식의 초당 요청 수 비교. "
+        "설정된 DB, Redis 에 벤치마크용 유저/게임을 만들고 끝나면 삭제하므로 운영 환경에서는 실행하지 않음"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8, help="동시 요청 스레드 수 (스레드마다 유저 1명)")
+        parser.add_argument("--plays", type=int, default=200, help="스레드별 플레이 횟수 (플레이 1번 = 시작/종료 요청 2번)")
+        parser.add_argument("--skip-legacy", action="store_true", help="기존 방식 측정 생략")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = [
+            User.objects.create(email=f"bench-events{i}@{BENCH_EMAIL_DOMAIN}", nickname=f"benchevents{i}", password="!")
+            for i in range(options["threads"])
+        ]
+        game = Game.objects.create(
+            title="bench", thumbnail="images/thumbnail/bench.png", gamefile="zips/bench.zip",
+            maker=users[0], content="bench", register_state=1, star=0, review_cnt=0,
+        )
+        views = [("current", GamePlaytimeAPIView.as_view())]
+        if not options["skip_legacy"]:
+            views.insert(0, ("legacy", LegacyGamePlaytimeAPIView.as_view()))
+
+        try:
+            self.stdout.write(f"{'view':<9}{'requests':>10}{'seconds':>9}{'req/s':>9}{'errors':>8}")
+            for name, view in views:
+                self.stdout.write(self.run_load(view, name, users, game.pk, options["plays"]))
+
+            # 버퍼에 쌓인 이벤트를 DB에 저장하는 시간
+            pending = r.llen(GAME_EVENTS_KEY)
+            started = time.perf_counter()
+            while r.llen(GAME_EVENTS_KEY):
+                flush_game_events()
+            seconds = time.perf_counter() - started
+            self.stdout.write(
+                f"flush_game_events: {pending} events, {seconds:.2f} s "
+                f"({pending / seconds if seconds else 0:.0f} events/s)"
+            )
+        finally:
+            # 벤치마크 유저 삭제 (게임, PlayLog, TotalPlayTime 함께 삭제)
+            User.objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}", pk__in=[user.pk for user in users]).delete()
+
+    def run_load(self, view, name, users, game_id, plays):
+        factory = APIRequestFactory()
+
+        def play_loop(user):
+            errors = 0
+            try:
+                for _ in range(plays):
+                    request = factory.get(f"/games/api/{game_id}/playtime/")
+                    force_authenticate(request, user)
+                    response = view(request, game_id=game_id)
+                    if response.status_code != 200:
+                        errors += 1
+                        continue
+                    request = factory.post(
+                        f"/games/api/{game_id}/playtime/",
+                        {"playtime_id": response.data["data"]["playtime_id"]},
+                        format="json",
+                    )
+                    force_authenticate(request, user)
+                    if view(request, game_id=game_id).status_code != 200:
+                        errors += 1
+                return errors
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(users)) as executor:
+            errors = sum(executor.map(play_loop, users))
+        seconds = time.perf_counter() - started
+        requests = len(users) * plays * 2
+        return f"{name:<9}{requests:>10}{seconds:>9.2f}{requests / seconds:>9.0f}{errors:>8}"
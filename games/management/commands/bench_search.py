@@ -0,0 +1,179 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from games.models import Game, GameCategory, Like
+from games.serializers import GameListSerializer
+from games.views import game_list_search
+from spartagames.pagination import ReviewCustomPagination
+from spartagames.utils import std_response
+
+
+ADJECTIVES = ("dark", "tiny", "lost", "brave", "neon", "silent", "rapid", "frozen", "golden", "wild")
+NOUNS = ("dragon", "castle", "runner", "island", "knight", "planet", "forest", "robot", "dungeon", "racer")
+CATEGORIES = ("RPG", "FPS", "PUZZLE", "ACTION", "RACING", "STRATEGY")
+
+
+class _Rollback(Exception):
+    pass
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def legacy_game_list_search(request):
+    """
+    기존 game_list_search (비교용)
+    icontains 3개 + distinct 조건으로 전체 결과를 list() 로 불러온 뒤 페이지네이션
+    """
+    keyword = request.query_params.get('keyword')
+
+    query = Q(is_visible=True, register_state=1)
+    if keyword:
+        query &= Q(
+            Q(category__name__icontains=keyword) |
+            Q(title__icontains=keyword) |
+            Q(maker__nickname__icontains=keyword)
+        )
+    games = Game.objects.filter(query).distinct().order_by('-created_at')
+
+    favorite_games = []
+    if request.user.is_authenticated:
+        favorite_games = games.filter(likes__user=request.user)
+        favorite_cnt = len(favorite_games)
+        if favorite_games:
+            games = games.exclude(pk__in=favorite_games.values_list('pk', flat=True))
+    all_games = list(favorite_games) + list(games)
+    if all_games == []:
+        return std_response(message="검색한 게임이 없습니다.", status="fail", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
+
+    paginator = ReviewCustomPagination()
+    paginated_games = paginator.paginate_queryset(all_games, request)
+    game_serializer = GameListSerializer(paginated_games, many=True, context={'user': request.user})
+    response_data = paginator.get_paginated_response(game_serializer.data).data
+
+    if request.user.is_authenticated:
+        if paginator.page.number == 1 and favorite_games.exists():
+            all_games = response_data["results"]["all_games"]
+            list_of_games = []
+            for i in range(favorite_cnt):
+                list_of_games.append(all_games.pop(i))
+                all_games.insert(0, {})
+            response_data["results"]["favorite_games"] = list_of_games
+    data_response = {"all_games": response_data["results"]["all_games"]}
+    if request.user.is_authenticated:
+        data_response["favorite_games"] = response_data["results"]["favorite_games"]
+    return std_response(data=data_response, message="게임 검색이 완료되었습니다.", status="success",
+                        pagination={"count": response_data["count"], "next": response_data["next"], "previous": response_data["previous"]},
+                        status_code=status.HTTP_200_OK)
+
+
+def create_games(count, seed=0):
+    """
+    벤치마크용 게임 count 개 생성 (제작자 20게임당 1명, 카테고리 1개씩)
+    """
+    rng = random.Random(seed)
+    User = get_user_model()
+    categories = [GameCategory.objects.get_or_create(name=name)[0] for name in CATEGORIES]
+    start = User.objects.count()
+    makers = User.objects.bulk_create([
+        User(email=f"bench-maker{start + i}@bench.local", nickname=f"benchmaker{start + i}", password="!")
+        for i in range(max(count // 20, 1))
+    ])
+
+    games, game_categories = [], []
+    for i in range(count):
+        maker = makers[i % len(makers)]
+        category = rng.choice(categories)
+        title = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}"
+        games.append(Game(
+            title=title,
+            thumbnail="images/thumbnail/bench.png",
+            gamefile="zips/bench.zip",
+            maker=maker,
+            content="bench",
+            register_state=1,
+            star=0,
+            review_cnt=0,
+            # games.utils.build_search_document 와 같은 형식
+            search_document="\n".join([title, maker.nickname, category.name]).lower(),
+        ))
+        game_categories.append(category)
+    games = Game.objects.bulk_create(games, batch_size=5000)
+    Game.category.through.objects.bulk_create(
+        [Game.category.through(game_id=game.pk, gamecategory_id=category.pk) for game, category in zip(games, game_categories)],
+        batch_size=5000,
+    )
+    return games
+
+
+class Command(BaseCommand):
+    help = (
+        "게임 검색(game_list_search) 벤치마크: 기존 icontains 검색과 search_document trigram 검색 비교. "
+        "데이터는 트랜잭션 안에서 만들고 끝나면 롤백함"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", default="10000,100000", help="게임 수 (쉼표로 구분)")
+        parser.add_argument("--keywords", default=",dragon,benchmaker7,rpg", help="검색어 (쉼표로 구분, 빈 값은 검색어 없음)")
+        parser.add_argument("--repeat", type=int, default=5, help="경우별 반복 횟수 (중앙값 출력)")
+        parser.add_argument("--skip-legacy", action="store_true", help="기존 방식 측정 생략")
+
+    def handle(self, *args, **options):
+        keywords = options["keywords"].split(",")
+        if connection.vendor != "postgresql":
+            # trigram 유사도(TrigramSimilarity)는 PostgreSQL 에서만 동작
+            self.stderr.write("PostgreSQL 이 아니므로 검색어 없는 경우만 측정합니다.")
+            keywords = [keyword for keyword in keywords if not keyword]
+
+        views = [("current", game_list_search)]
+        if not options["skip_legacy"]:
+            views.insert(0, ("legacy", legacy_game_list_search))
+
+        self.stdout.write(f"{'games':>8} {'keyword':<14}{'view':<9}{'median ms':>10}{'queries':>9}{'count':>8}{'status':>8}")
+        try:
+            with transaction.atomic():
+                created = 0
+                user = get_user_model().objects.create(email="bench-user@bench.local", nickname="benchuser", password="!")
+                for total in [int(value) for value in options["games"].split(",")]:
+                    games = create_games(total - created, seed=total)
+                    created = total
+                    # 로그인 유저의 즐겨찾기 3개 (기존 방식은 즐겨찾기가 1페이지 크기(4)보다 많으면 오류가 남)
+                    Like.objects.filter(user=user).delete()
+                    Like.objects.bulk_create([Like(user=user, game=game) for game in random.Random(total).sample(games, min(3, len(games)))])
+                    if connection.vendor == "postgresql":
+                        with connection.cursor() as cursor:
+                            cursor.execute("ANALYZE games_game")
+
+                    for keyword in keywords:
+                        for name, view in views:
+                            self.stdout.write(self.measure(view, user, keyword, total, name, options["repeat"]))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def measure(self, view, user, keyword, total, name, repeat):
+        factory = APIRequestFactory()
+        params = {"keyword": keyword} if keyword else {}
+        timings = []
+        for _ in range(repeat):
+            request = factory.get("/games/api/list/search/", params)
+            force_authenticate(request, user)
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = view(request)
+                timings.append((time.perf_counter() - started) * 1000)
+        count = (response.data.get("pagination") or {}).get("count", 0)
+        return (
+            f"{total:>8} {keyword or '-':<14}{name:<9}{statistics.median(timings):>10.1f}"
+            f"{len(queries.captured_queries):>9}{count:>8}{response.status_code:>8}"
+        )
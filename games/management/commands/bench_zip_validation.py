@@ -0,0 +1,180 @@
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+from django.core.management.base import BaseCommand
+
+from games.uploads import S3RangeReader
+from games.utils import read_zip_entries, validate_zip_file
+
+
+class CountingFile:
+    """
+    읽은 크기와 read 호출 수를 세는 파일 객체
+    """
+
+    def __init__(self, fp, name=None):
+        self.fp = fp
+        self.name = name or getattr(fp, "name", "")
+        self.size = os.fstat(fp.fileno()).st_size
+        self.read_bytes = 0
+        self.read_calls = 0
+
+    def read(self, size=-1):
+        data = self.fp.read(size)
+        self.read_calls += 1
+        self.read_bytes += len(data)
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self.fp.seek(offset, whence)
+
+    def tell(self):
+        return self.fp.tell()
+
+    def seekable(self):
+        return True
+
+
+class LocalRangeS3:
+    """
+    로컬 파일을 S3 객체처럼 제공하는 클라이언트 (HeadObject, GetObject 와 Range 만 지원)
+    요청 수와 전송량을 기록
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.requests = 0
+        self.sent_bytes = 0
+
+    def head_object(self, Bucket, Key):
+        self.requests += 1
+        return {"ContentLength": os.path.getsize(self.path)}
+
+    def get_object(self, Bucket, Key, Range=None):
+        self.requests += 1
+        fp = open(self.path, "rb")
+        if Range is None:
+            self.sent_bytes += os.path.getsize(self.path)
+            return {"Body": fp}
+        start, end = (int(value) for value in Range[len("bytes="):].split("-"))
+        with fp:
+            fp.seek(start)
+            data = fp.read(end - start + 1)
+        self.sent_bytes += len(data)
+        return {"Body": _BytesBody(data)}
+
+
+class _BytesBody:
+    def __init__(self, data):
+        self.data = data
+
+    def read(self):
+        return self.data
+
+
+def make_unity_build_zip(path, total_size, file_count):
+    """
+    Unity WebGL 빌드 구성의 zip 생성 (압축하지 않고 저장, 크기 대부분은 Build/*.data)
+    """
+    small_count = max(file_count - 5, 0)
+    small_size = 16 * 1024
+    data_size = max(total_size - small_count * small_size, 0)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+        zf.writestr("index.html", "<html><body></body></html>")
+        zf.writestr("Build/build.loader.js", "loader")
+        zf.writestr("Build/build.framework.js.gz", os.urandom(1024))
+        zf.writestr("Build/build.wasm.gz", os.urandom(1024))
+        with zf.open("Build/build.data.gz", "w", force_zip64=True) as entry:
+            remaining = data_size
+            while remaining:
+                chunk = os.urandom(min(remaining, 8 * 1024 * 1024))
+                entry.write(chunk)
+                remaining -= len(chunk)
+        for i in range(small_count):
+            zf.writestr(f"TemplateData/asset{i}.png", os.urandom(small_size))
+
+
+def timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return result, min(timings) * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "zip 파일 검증 벤치마크: zipfile.ZipFile 로 여는 기존 방식과 EOCD/중앙 디렉터리만 읽는 "
+        "read_zip_entries / validate_zip_file 비교 (로컬 파일, S3 Range GET). calls: 로컬은 read 호출 수, S3 는 요청 수"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size-mb", type=int, default=500, help="zip 파일 크기 (MB)")
+        parser.add_argument("--files", type=int, default=2000, help="zip 안의 파일 수")
+        parser.add_argument("--repeat", type=int, default=5, help="경우별 반복 횟수 (최솟값 출력)")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = os.path.join(tmp_dir, "build.zip")
+            make_unity_build_zip(zip_path, options["size_mb"] * 1024 * 1024, options["files"])
+            zip_size = os.path.getsize(zip_path)
+            self.stdout.write(f"zip: {zip_size / 1024 / 1024:.1f} MB, {options['files']} files")
+            self.stdout.write(f"{'case':<34}{'ms':>9}{'calls':>10}{'read KB':>12}{'valid':>7}")
+            repeat = options["repeat"]
+
+            # 1. 로컬 파일 (TemporaryUploadedFile)
+            def legacy_local():
+                with open(zip_path, "rb") as fp:
+                    counting = CountingFile(fp)
+                    with zipfile.ZipFile(counting) as zf:
+                        zf.infolist()
+                return counting, None
+
+            def current_local():
+                with open(zip_path, "rb") as fp:
+                    counting = CountingFile(fp)
+                    is_valid, _ = validate_zip_file(counting, max_size=zip_size)
+                return counting, is_valid
+
+            for name, func in (("local: zipfile.ZipFile", legacy_local), ("local: validate_zip_file", current_local)):
+                (counting, is_valid), ms = timed(func, repeat)
+                self.write_row(name, ms, counting.read_calls, counting.read_bytes, is_valid)
+
+            # 2. S3 에 직접 업로드한 파일
+            # 기존 방식: 파일 전체를 내려받은 뒤 zipfile.ZipFile 로 열기
+            def legacy_s3():
+                s3 = LocalRangeS3(zip_path)
+                body = s3.get_object(Bucket="bench", Key="build.zip")["Body"]
+                with body, tempfile.NamedTemporaryFile(dir=tmp_dir) as tmp_file:
+                    shutil.copyfileobj(body, tmp_file, 8 * 1024 * 1024)
+                    tmp_file.flush()
+                    tmp_file.seek(0)
+                    with zipfile.ZipFile(tmp_file) as zf:
+                        zf.infolist()
+                return s3, None
+
+            def current_s3():
+                s3 = LocalRangeS3(zip_path)
+                reader = S3RangeReader(s3, "bench", "build.zip", name="build.zip")
+                is_valid, _ = validate_zip_file(reader, max_size=zip_size)
+                return s3, is_valid
+
+            for name, func in (("s3: download + zipfile.ZipFile", legacy_s3), ("s3: S3RangeReader", current_s3)):
+                (s3, is_valid), ms = timed(func, repeat)
+                self.write_row(name, ms, s3.requests, s3.sent_bytes, is_valid)
+
+            # 중앙 디렉터리 파싱만
+            def parse_only():
+                with open(zip_path, "rb") as fp:
+                    return len(read_zip_entries(fp))
+            entry_count, ms = timed(parse_only, repeat)
+            self.stdout.write(f"read_zip_entries: {entry_count} entries, {ms:.1f} ms")
+
+    def write_row(self, name, ms, requests, read_bytes, is_valid):
+        self.stdout.write(
+            f"{name:<34}{ms:>9.1f}{requests:>10}{read_bytes / 1024:>12.1f}{'-' if is_valid is None else str(is_valid):>7}"
+        )
@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-17 21:53
+
+from django.db import migrations, models
+
+
+# 마이그레이션 작성 시점의 칩 선택 규칙 (games.utils.select_display_chips 를 고쳐도 이 마이그레이션 결과는 바뀌지 않도록 복사해 둠)
+DIFFICULTY_CHIPS = ("EASY", "NORMAL", "HARD")
+PRIORITY_CHIPS = ("Daily Top", "New Game", "Bookmark Top", "Long Play", "Review Top")
+MAX_DISPLAY_CHIPS = 3
+
+
+def select_display_chips(chips):
+    chips = sorted(chips, key=lambda chip: chip.pk)
+    result = []
+
+    # 난이도 칩 하나 선택
+    difficulty_chip = next((chip for chip in chips if chip.name in DIFFICULTY_CHIPS), None)
+    if difficulty_chip:
+        result.append({"id": difficulty_chip.id, "name": difficulty_chip.name})
+
+    # 우선순위 칩 최대 2개 추가
+    for chip_name in PRIORITY_CHIPS:
+        if len(result) >= MAX_DISPLAY_CHIPS:
+            break
+        chip = next((chip for chip in chips if chip.name == chip_name), None)
+        if chip:
+            result.append({"id": chip.id, "name": chip.name})
+
+    return result
+
+
+def fill_display_chips(apps, schema_editor):
+    # 기존 게임들의 칩 스냅샷 채우기
+    Game = apps.get_model('games', 'Game')
+    games = list(Game.objects.prefetch_related('chip'))
+    for game in games:
+        game.display_chips = select_display_chips(game.chip.all())
+    Game.objects.bulk_update(games, ['display_chips'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_alter_game_content_alter_review_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='display_chips',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(fill_display_chips, migrations.RunPython.noop),
+    ]
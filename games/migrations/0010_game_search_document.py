@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-17 21:55
+
+from django.contrib.postgres.operations import TrigramExtension
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def build_search_document(game):
+    # 마이그레이션 작성 시점의 검색용 문서 규칙 (games.utils.build_search_document 와 독립적으로 유지)
+    # 제목, 제작자 닉네임, 카테고리명을 줄바꿈으로 구분
+    parts = [game.title, game.maker.nickname]
+    parts.extend(category.name for category in game.category.all())
+    return "\n".join(parts).lower()
+
+
+def fill_search_document(apps, schema_editor):
+    # 기존 게임들의 검색용 문서 채우기
+    Game = apps.get_model('games', 'Game')
+    games = list(Game.objects.select_related('maker').prefetch_related('category'))
+    for game in games:
+        game.search_document = build_search_document(game)
+    Game.objects.bulk_update(games, ['search_document'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0009_game_display_chips'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='game',
+            name='search_document',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(fill_search_document, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='game',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_document'], name='game_search_document_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2 on 2026-10-17 22:01
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_review_like_counters(apps, schema_editor):
+    # 기존 리뷰들의 좋아요/싫어요 수 채우기
+    Review = apps.get_model('games', 'Review')
+    reviews = list(Review.objects.annotate(
+        like_total=Count('reviews', filter=Q(reviews__is_like=1)),
+        dislike_total=Count('reviews', filter=Q(reviews__is_like=2)),
+    ).filter(Q(like_total__gt=0) | Q(dislike_total__gt=0)))
+    for review in reviews:
+        review.like_count = review.like_total
+        review.dislike_count = review.dislike_total
+    Review.objects.bulk_update(reviews, ['like_count', 'dislike_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0010_game_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='dislike_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='like_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_review_like_counters, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['game', 'is_visible', 'like_count', 'created_at'], name='review_game_like_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['game', 'is_visible', 'dislike_count', 'created_at'], name='review_game_dislike_idx'),
+        ),
+    ]
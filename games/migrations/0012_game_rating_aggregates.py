@@ -0,0 +1,51 @@
+# Generated by Django 4.2 on 2026-10-17 22:03
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def fill_game_rating_aggregates(apps, schema_editor):
+    # 노출 중인 리뷰 기준으로 기존 게임들의 별점/난이도 집계 채우기 (리뷰 수, 별점 평균도 다시 계산)
+    Game = apps.get_model('games', 'Game')
+    visible = Q(reviews__is_visible=True)
+    games = list(Game.objects.annotate(
+        actual_review_cnt=Count('reviews', filter=visible),
+        actual_star_sum=Sum('reviews__star', filter=visible),
+        actual_difficulty_cnt=Count('reviews__difficulty', filter=visible),
+        actual_difficulty_sum=Sum('reviews__difficulty', filter=visible),
+    ))
+    for game in games:
+        game.review_cnt = game.actual_review_cnt
+        game.star_sum = game.actual_star_sum or 0
+        game.difficulty_cnt = game.actual_difficulty_cnt
+        game.difficulty_sum = game.actual_difficulty_sum or 0
+        game.star = game.star_sum / game.review_cnt if game.review_cnt else 0
+    Game.objects.bulk_update(
+        games, ['review_cnt', 'star_sum', 'difficulty_cnt', 'difficulty_sum', 'star'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0011_review_like_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='difficulty_cnt',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='difficulty_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='star_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_game_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-17 22:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0012_game_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='thumbnail_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='screenshot',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
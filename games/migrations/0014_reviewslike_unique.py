@@ -0,0 +1,49 @@
+# Generated by Django 4.2 on 2026-10-17 23:40
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+def dedupe_review_likes(apps, schema_editor):
+    # 유저/리뷰별로 가장 마지막에 생성된 좋아요/싫어요만 남기고 삭제
+    ReviewsLike = apps.get_model('games', 'ReviewsLike')
+    Review = apps.get_model('games', 'Review')
+    duplicates = list(
+        ReviewsLike.objects.values('user_id', 'review_id')
+        .annotate(cnt=Count('id'), last_id=Max('id'))
+        .filter(cnt__gt=1)
+    )
+    if not duplicates:
+        return
+
+    review_ids = set()
+    for row in duplicates:
+        ReviewsLike.objects.filter(
+            user_id=row['user_id'], review_id=row['review_id'], id__lt=row['last_id']
+        ).delete()
+        review_ids.add(row['review_id'])
+
+    # 중복 행이 있던 리뷰의 좋아요/싫어요 수 다시 계산
+    reviews = list(Review.objects.filter(id__in=review_ids).annotate(
+        like_total=Count('reviews', filter=Q(reviews__is_like=1)),
+        dislike_total=Count('reviews', filter=Q(reviews__is_like=2)),
+    ))
+    for review in reviews:
+        review.like_count = review.like_total
+        review.dislike_count = review.dislike_total
+    Review.objects.bulk_update(reviews, ['like_count', 'dislike_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0013_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_review_likes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='reviewslike',
+            constraint=models.UniqueConstraint(fields=('user', 'review'), name='reviewslike_user_review_unique'),
+        ),
+    ]
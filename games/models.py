@@ -2,6 +2,7 @@ import os
 import re
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
@@ -45,6 +46,9 @@ class Game(models.Model):
 
     title = models.CharField(max_length=100)
     thumbnail = models.ImageField(upload_to="images/thumbnail/")
+    # 썸네일 WebP 변환본 ({"src": 원본 경로, "card": 경로, "detail": 경로, "retina": 경로})
+    # games.tasks.generate_game_image_variants 에서 생성, 원본이 바뀌면 src 가 달라지므로 원본 사용
+    thumbnail_variants = models.JSONField(default=dict, blank=True)
     youtube_url = models.URLField(blank=True, null=True)
     maker = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="games"
@@ -61,12 +65,32 @@ class Game(models.Model):
     chip = models.ManyToManyField(
         Chip, related_name="games"
     )
+    # 카드에 노출할 칩 스냅샷 (순서 유지, [{"id": .., "name": ..}, ...])
+    # 칩 부여/제거 시 games.utils.refresh_display_chips()로 갱신
+    display_chips = models.JSONField(default=list, blank=True)
     is_visible = models.BooleanField(default=True)
     star = models.FloatField()
     review_cnt = models.IntegerField()
+    # 별점/난이도 집계 (games.ratings에서 DB 증감으로 갱신, star는 star_sum / review_cnt)
+    star_sum = models.IntegerField(default=0)
+    difficulty_sum = models.IntegerField(default=0)
+    difficulty_cnt = models.IntegerField(default=0)
+    # 검색용 문서 (제목, 제작자 닉네임, 카테고리명을 소문자로 합친 값)
+    # 게임 수정, 닉네임 변경 시 games.utils.refresh_search_documents()로 갱신
+    search_document = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # 부분 문자열 검색(LIKE '%keyword%')용 trigram 인덱스
+            GinIndex(
+                name="game_search_document_trgm",
+                fields=["search_document"],
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+
 
 class Like(models.Model):
     user = models.ForeignKey(
@@ -138,10 +162,20 @@ class Review(models.Model):
     content = models.TextField(max_length=300)
     star = models.IntegerField(null=True)
     difficulty = models.IntegerField(null=True)
+    # 좋아요/싫어요 수 (toggle_review_like에서 DB 증감으로 갱신)
+    like_count = models.IntegerField(default=0)
+    dislike_count = models.IntegerField(default=0)
     is_visible = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # 게임별 리뷰 좋아요순/싫어요순 정렬
+            models.Index(fields=["game", "is_visible", "like_count", "created_at"], name="review_game_like_idx"),
+            models.Index(fields=["game", "is_visible", "dislike_count", "created_at"], name="review_game_dislike_idx"),
+        ]
+
 
 class ReviewsLike(models.Model):
     user = models.ForeignKey(
@@ -152,6 +186,12 @@ class ReviewsLike(models.Model):
     )
     is_like = models.IntegerField(default=0)
 
+    class Meta:
+        constraints = [
+            # 유저당 리뷰 하나에 좋아요/싫어요 한 건 (toggle_review_like의 get_or_create 중복 생성 방지)
+            models.UniqueConstraint(fields=["user", "review"], name="reviewslike_user_review_unique"),
+        ]
+
 
 class Screenshot(models.Model):
     src = models.ImageField(
@@ -159,6 +199,8 @@ class Screenshot(models.Model):
         blank=True,
         null=True,
     )
+    # 스크린샷 WebP 변환본 (Game.thumbnail_variants 와 같은 형식)
+    variants = models.JSONField(default=dict, blank=True)
     game = models.ForeignKey(
         Game, on_delete=models.CASCADE, related_name="screenshots"
     )
@@ -3,6 +3,8 @@
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from spartagames.pagination import KeysetPagination
+
 class CategoryGamesPagination(PageNumberPagination):
     page_size = 16  # 기본 페이지 크기 설정
     page_size_query_param = 'limit'  # 클라이언트가 페이지 크기를 조정할 수 있는 파라미터
@@ -26,4 +28,22 @@ class ReviewPagination(PageNumberPagination):
             "results": {
                 "all_reviews": data,
             },
-        })
\ No newline at end of file
+        })
+
+class CategoryGamesCursorPagination(KeysetPagination):
+    page_size = 16  # 기본 페이지 크기 설정
+    ordering = ('-created_at', '-id')
+
+class ReviewCursorPagination(KeysetPagination):
+    page_size = 6  # 기본 페이지 크기 설정
+    ordering = ('-created_at', '-id')  # 정렬 조건에 따라 뷰에서 변경
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.total_count,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": {
+                "all_reviews": data,
+            },
+        })
@@ -0,0 +1,146 @@
+from datetime import timedelta
+import uuid
+
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from spartagames.redis_client import r
+
+from .models import Game, Like, PlayLog, Review, View
+
+
+# 게임 랭킹 집계 (Redis ZSET, member: 게임 id, score: 집계값)
+# 일별 집계: games:rank:<metric>:<YYYYMMDD> (views, reviews, playtime)
+# 누적 집계: games:rank:<metric>:total (likes)
+RANKING_KEY_PREFIX = "games:rank"
+DAILY_METRICS = ("views", "reviews", "playtime")
+TOTAL_METRICS = ("likes",)
+# 일별 집계 보관 기간 (가장 긴 집계 기간 + 여유)
+DAILY_BUCKET_TTL_DAYS = 9
+
+
+def daily_key(metric, day):
+    return f"{RANKING_KEY_PREFIX}:{metric}:{day:%Y%m%d}"
+
+
+def total_key(metric):
+    return f"{RANKING_KEY_PREFIX}:{metric}:total"
+
+
+def incr_daily(metric, counts, day=None):
+    """
+    일별 집계 증가
+    counts: {게임 id: 증가값}, day: 이벤트 발생일 (기본값 오늘)
+    """
+    if not counts:
+        return
+    key = daily_key(metric, day or timezone.localdate())
+    pipe = r.pipeline()
+    for game_id, amount in counts.items():
+        pipe.zincrby(key, amount, game_id)
+    pipe.expire(key, timedelta(days=DAILY_BUCKET_TTL_DAYS))
+    pipe.execute()
+
+
+def incr_total(metric, game_id, amount=1):
+    """
+    누적 집계 증감
+    """
+    r.zincrby(total_key(metric), amount, game_id)
+
+
+def window_keys(metric, days):
+    """
+    최근 days일 집계에 사용할 일별 키 목록
+    하루 단위로 집계하므로 오늘 + 지난 days일 (최대 days+1일치) 을 합산함
+    """
+    today = timezone.localdate()
+    return [daily_key(metric, today - timedelta(days=offset)) for offset in range(days + 1)]
+
+
+def get_scores(weights):
+    """
+    여러 집계를 가중치로 합산한 게임별 점수
+    weights: {키: 가중치}
+    반환값: {게임 id: 점수} (점수가 있는 게임만)
+    """
+    if not weights:
+        return {}
+    tmp_key = f"{RANKING_KEY_PREFIX}:tmp:{uuid.uuid4().hex}"
+    pipe = r.pipeline()
+    pipe.zunionstore(tmp_key, weights)
+    pipe.zrange(tmp_key, 0, -1, withscores=True)
+    pipe.delete(tmp_key)
+    _, scores, _ = pipe.execute()
+    return {int(game_id): score for game_id, score in scores}
+
+
+def top_games(scores, limit, min_score=None, fill=False):
+    """
+    노출 중인 게임 중 점수가 높은 순(같으면 최신순)으로 limit개의 게임 id 반환
+    fill=True 이면 점수가 있는 게임이 부족할 때 최신 게임으로 채움
+    """
+    if min_score is not None:
+        scores = {game_id: score for game_id, score in scores.items() if score >= min_score}
+
+    visible_games = Game.objects.filter(is_visible=True, register_state=1)
+    created_at = dict(visible_games.filter(pk__in=scores).values_list("pk", "created_at"))
+    ranked = sorted(created_at, key=lambda game_id: (scores[game_id], created_at[game_id]), reverse=True)[:limit]
+
+    if fill and len(ranked) < limit:
+        ranked += list(
+            visible_games.exclude(pk__in=ranked).order_by("-created_at").values_list("pk", flat=True)[:limit - len(ranked)]
+        )
+    return ranked
+
+
+def rebuild_rankings(days=DAILY_BUCKET_TTL_DAYS - 1):
+    """
+    DB 기준으로 랭킹 집계를 다시 만듦 (Redis 데이터 유실, 누락된 이벤트 보정)
+    새 키에 채운 뒤 RENAME으로 교체하여 조회 중에도 비어있는 순간이 없도록 함
+    """
+    today = timezone.localdate()
+    since = timezone.now() - timedelta(days=days + 1)
+
+    daily = {metric: {} for metric in DAILY_METRICS}
+    for day, game_id, count in (
+        View.objects.filter(created_at__gte=since)
+        .annotate(day=TruncDate("created_at")).values_list("day", "game_id").annotate(count=Count("id"))
+    ):
+        daily["views"].setdefault(day, {})[game_id] = count
+    for day, game_id, count in (
+        Review.objects.filter(created_at__gte=since)
+        .annotate(day=TruncDate("created_at")).values_list("day", "game_id").annotate(count=Count("id"))
+    ):
+        daily["reviews"].setdefault(day, {})[game_id] = count
+    for day, game_id, total in (
+        PlayLog.objects.filter(end_at__gte=since, playtime__isnull=False)
+        .annotate(day=TruncDate("end_at")).values_list("day", "game_id").annotate(total=Sum("playtime"))
+    ):
+        daily["playtime"].setdefault(day, {})[game_id] = total
+
+    totals = {
+        "likes": dict(Like.objects.values_list("game_id").annotate(count=Count("id"))),
+    }
+
+    pipe = r.pipeline()
+    for metric, buckets in daily.items():
+        for offset in range(days + 1):
+            day = today - timedelta(days=offset)
+            _replace_zset(pipe, daily_key(metric, day), buckets.get(day, {}), ttl=timedelta(days=DAILY_BUCKET_TTL_DAYS))
+    for metric, counts in totals.items():
+        _replace_zset(pipe, total_key(metric), counts)
+    pipe.execute()
+
+
+def _replace_zset(pipe, key, mapping, ttl=None):
+    if not mapping:
+        pipe.delete(key)
+        return
+    tmp_key = f"{key}:rebuild"
+    pipe.delete(tmp_key)
+    pipe.zadd(tmp_key, mapping)
+    if ttl:
+        pipe.expire(tmp_key, ttl)
+    pipe.rename(tmp_key, key)
@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from .models import Game
+
+
+# 게임 별점 평균 (별점 합계 / 리뷰 수, 리뷰가 없으면 0)
+AVERAGE_STAR = Coalesce(
+    Cast("star_sum", FloatField()) / NullIf(F("review_cnt"), Value(0)),
+    Value(0.0),
+)
+
+
+RATING_FIELDS = ("review_cnt", "star_sum", "difficulty_cnt", "difficulty_sum")
+
+# 노출 중인 리뷰 기준 실제 집계값 (reconcile 용)
+_VISIBLE_REVIEWS = Q(reviews__is_visible=True)
+ACTUAL_RATING_ANNOTATIONS = {
+    "actual_review_cnt": Count("reviews", filter=_VISIBLE_REVIEWS),
+    "actual_star_sum": Coalesce(Sum("reviews__star", filter=_VISIBLE_REVIEWS), 0),
+    "actual_difficulty_cnt": Count("reviews__difficulty", filter=_VISIBLE_REVIEWS),
+    "actual_difficulty_sum": Coalesce(Sum("reviews__difficulty", filter=_VISIBLE_REVIEWS), 0),
+}
+
+
+def review_rating(star, difficulty, sign=1):
+    """
+    리뷰 하나가 게임 집계(리뷰 수, 별점 합계, 난이도 수, 난이도 합계)에 더하는 값
+    sign=-1 이면 빼는 값
+    """
+    has_difficulty = difficulty is not None
+    return {
+        "review_cnt": sign,
+        "star_sum": sign * (star or 0),
+        "difficulty_cnt": sign * has_difficulty,
+        "difficulty_sum": sign * (difficulty or 0),
+    }
+
+
+def merge_rating(*deltas):
+    merged = {}
+    for delta in deltas:
+        for field, value in delta.items():
+            merged[field] = merged.get(field, 0) + value
+    return merged
+
+
+def apply_game_rating(game_id, delta):
+    """
+    게임 집계값을 DB에서 증감하고 별점 평균을 다시 계산
+    트랜잭션 안에서 호출하면 첫 UPDATE에서 게임 행이 잠기므로 동시에 작성된 리뷰도 누락되지 않음
+    """
+    updates = {field: F(field) + value for field, value in delta.items() if value}
+    if not updates:
+        return
+    Game.objects.filter(pk=game_id).update(**updates)
+    Game.objects.filter(pk=game_id).update(star=AVERAGE_STAR)
+
+
+def has_rating_drift(game):
+    """
+    ACTUAL_RATING_ANNOTATIONS로 조회한 게임의 저장된 집계값이 실제 리뷰와 다른지 확인
+    """
+    if any(getattr(game, field) != getattr(game, f"actual_{field}") for field in RATING_FIELDS):
+        return True
+    expected_star = game.actual_star_sum / game.actual_review_cnt if game.actual_review_cnt else 0
+    return abs(game.star - expected_star) > 1e-6
+
+
+def reconcile_game_rating(game_id):
+    """
+    게임 행을 잠근 상태에서 리뷰 기준으로 집계값을 다시 계산하여 저장
+    """
+    with transaction.atomic():
+        # 리뷰 작성/수정/삭제와 동시에 실행되어도 집계가 어긋나지 않도록 게임 행 잠금
+        if not list(Game.objects.select_for_update().filter(pk=game_id).values_list("pk", flat=True)):
+            return
+        actual = Game.objects.filter(pk=game_id).aggregate(**ACTUAL_RATING_ANNOTATIONS)
+        rating = {field: actual[f"actual_{field}"] for field in RATING_FIELDS}
+        Game.objects.filter(pk=game_id).update(**rating)
+        Game.objects.filter(pk=game_id).update(star=AVERAGE_STAR)
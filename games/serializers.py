@@ -1,18 +1,45 @@
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
+from .images import get_image_variant_urls
 from .models import Game, Review, GameCategory, Screenshot, ReviewsLike, Like
 
 
+class GameListBatchSerializer(serializers.ListSerializer):
+    """
+    게임 카드 목록 일괄 직렬화
+    페이지 단위로 제작자, 카테고리, 즐겨찾기 여부를 고정된 개수의 쿼리로 불러온 뒤
+    각 카드 직렬화 시 재사용 (칩은 Game.display_chips 스냅샷 사용)
+    """
+
+    def to_representation(self, data):
+        games = list(data)
+        prefetch_related_objects(games, "maker", "category")
+
+        # 현재 유저의 즐겨찾기 여부를 한 번에 조회
+        liked_game_ids = set()
+        user = self.context.get('user')
+        if games and user and user.is_authenticated:
+            liked_game_ids = set(
+                Like.objects.filter(user=user, game__in=games).values_list('game_id', flat=True)
+            )
+        self.context['liked_game_ids'] = liked_game_ids
+
+        return super().to_representation(games)
+
+
 class GameListSerializer(serializers.ModelSerializer):
     maker_data = serializers.SerializerMethodField()
     chips= serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     category_data = serializers.SerializerMethodField()
     star = serializers.SerializerMethodField()
+    thumbnail_variants = serializers.SerializerMethodField()
     
     class Meta:
         model = Game
-        fields = ("id", "title", "thumbnail",
+        fields = ("id", "title", "thumbnail", "thumbnail_variants",
                   "star", "maker_data", "content", "chips", "is_liked", "category_data")
+        list_serializer_class = GameListBatchSerializer
     
     def get_maker_data(self, obj):
         return {
@@ -24,28 +51,14 @@ class GameListSerializer(serializers.ModelSerializer):
         return round(obj.star, 2) if obj.star is not None else 0
     
     def get_chips(self, obj):
-        chips = obj.chip.all()
-        difficulty_chips = ["EASY", "NORMAL", "HARD"]
-        priority_chips = ["Daily Top", "New Game", "Bookmark Top", "Long Play", "Review Top"]
-
-        result = []
-
-        # 난이도 칩 하나 선택
-        difficulty_chip = chips.filter(name__in=difficulty_chips).first()
-        if difficulty_chip:
-            result.append({"id": difficulty_chip.id, "name": difficulty_chip.name})
-
-        # 우선순위 칩 최대 2개 추가
-        for chip_name in priority_chips:
-            if len(result) >= 3:
-                break
-            chip = chips.filter(name=chip_name).first()
-            if chip:
-                result.append({"id": chip.id, "name": chip.name})
-
-        return result
+        return obj.display_chips
     
     def get_is_liked(self, obj):
+        # 목록 직렬화 시 미리 조회한 즐겨찾기 목록 사용
+        liked_game_ids = self.context.get('liked_game_ids')
+        if liked_game_ids is not None:
+            return obj.pk in liked_game_ids
+
         user = self.context.get('user')
         # 사용자가 인증된 경우 해당 게임에 대한 좋아요 상태를 확인
         if user and user.is_authenticated:
@@ -56,6 +69,10 @@ class GameListSerializer(serializers.ModelSerializer):
         # 카테고리 리스트를 반환
         return [{"id": category.id, "name": category.name,} for category in obj.category.all()]
 
+    def get_thumbnail_variants(self, obj):
+        # 크기별 WebP 썸네일 url (변환 전이면 원본 url)
+        return get_image_variant_urls(obj.thumbnail, obj.thumbnail_variants)
+
 
 class GameCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -69,10 +86,11 @@ class GameDetailSerializer(serializers.ModelSerializer):
     is_liked = serializers.SerializerMethodField()
     chips= serializers.SerializerMethodField()
     star = serializers.SerializerMethodField()
+    thumbnail_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Game
-        fields = ("id", "maker_data", "title", "thumbnail",
+        fields = ("id", "maker_data", "title", "thumbnail", "thumbnail_variants",
                   "star", "content", "chips", "is_liked", "youtube_url",
                   "gamefile", "gamepath", "register_state", "is_visible", "review_cnt")
         read_only_fields = ('maker',)
@@ -93,33 +111,38 @@ class GameDetailSerializer(serializers.ModelSerializer):
         return False
     
     def get_chips(self, obj):
-        chips = obj.chip.all()
-        difficulty_chips = ["EASY", "NORMAL", "HARD"]
-        priority_chips = ["Daily Top", "New Game", "Bookmark Top", "Long Play", "Review Top"]
+        return obj.display_chips
 
-        result = []
+    def get_thumbnail_variants(self, obj):
+        # 크기별 WebP 썸네일 url (변환 전이면 원본 url)
+        return get_image_variant_urls(obj.thumbnail, obj.thumbnail_variants)
 
-        # 난이도 칩 하나 선택
-        difficulty_chip = chips.filter(name__in=difficulty_chips).first()
-        if difficulty_chip:
-            result.append({"id": difficulty_chip.id, "name": difficulty_chip.name})
 
-        # 우선순위 칩 최대 2개 추가
-        for chip_name in priority_chips:
-            if len(result) >= 3:
-                break
-            chip = chips.filter(name=chip_name).first()
-            if chip:
-                result.append({"id": chip.id, "name": chip.name})
+class ReviewListBatchSerializer(serializers.ListSerializer):
+    """
+    리뷰 목록 일괄 직렬화
+    페이지 단위로 작성자와 현재 유저의 좋아요/싫어요 상태를 고정된 개수의 쿼리로 불러온 뒤 재사용
+    """
 
-        return result
+    def to_representation(self, data):
+        reviews = list(data)
+        prefetch_related_objects(reviews, "author")
+
+        # 현재 유저의 좋아요/싫어요 상태를 한 번에 조회
+        review_like_states = {}
+        user = self.context.get('user')
+        if reviews and user and user.is_authenticated:
+            review_like_states = dict(
+                ReviewsLike.objects.filter(user=user, review__in=reviews).values_list('review_id', 'is_like')
+            )
+        self.context['review_like_states'] = review_like_states
+
+        return super().to_representation(reviews)
 
 
 class ReviewSerializer(serializers.ModelSerializer):
     author_data = serializers.SerializerMethodField()
-    game_id = serializers.IntegerField(source='game.id', read_only=True)
-    like_count = serializers.SerializerMethodField()
-    dislike_count = serializers.SerializerMethodField()
+    game_id = serializers.IntegerField(read_only=True)
     user_is_like = serializers.SerializerMethodField()
 
     class Meta:
@@ -128,7 +151,8 @@ class ReviewSerializer(serializers.ModelSerializer):
             'id', 'author_data', 'game_id', 'like_count', 'dislike_count', 'user_is_like',
             'content', 'star', 'difficulty', 'is_visible', 'created_at', 'updated_at',
         ]
-        read_only_fields = ('is_visible', 'game', 'author',)
+        read_only_fields = ('is_visible', 'game', 'author', 'like_count', 'dislike_count',)
+        list_serializer_class = ReviewListBatchSerializer
     
     def get_author_data(self, obj):
         return {
@@ -137,13 +161,12 @@ class ReviewSerializer(serializers.ModelSerializer):
             "image": obj.author.image.url if obj.author.image else '',
         }
     
-    def get_like_count(self, obj):
-        return ReviewsLike.objects.filter(review=obj, is_like=1).count()
-
-    def get_dislike_count(self, obj):
-        return ReviewsLike.objects.filter(review=obj, is_like=2).count()
-
     def get_user_is_like(self, obj):
+        # 목록 직렬화 시 미리 조회한 좋아요/싫어요 상태 사용
+        review_like_states = self.context.get('review_like_states')
+        if review_like_states is not None:
+            return review_like_states.get(obj.pk, 0)
+
         # 현재 요청을 보낸 사용자 확인
         user = self.context.get('user', None)
         # 사용자가 인증되지 않은 경우 0 반환
@@ -157,9 +180,15 @@ class ReviewSerializer(serializers.ModelSerializer):
 
 
 class ScreenshotSerializer(serializers.ModelSerializer):
+    variants = serializers.SerializerMethodField()
+
     class Meta:
         model = Screenshot
-        fields = ('id', 'src', )
+        fields = ('id', 'src', 'variants', )
+
+    def get_variants(self, obj):
+        # 크기별 WebP 스크린샷 url (변환 전이면 원본 url)
+        return get_image_variant_urls(obj.src, obj.variants)
 
 
 class CategorySerailizer(serializers.ModelSerializer):
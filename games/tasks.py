@@ -1,46 +1,49 @@
-from datetime import timedelta
+from datetime import datetime
+import json
 from django.utils import timezone
 from celery import shared_task
-from django.db.models import Count, Q,Sum
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
 import logging
-from .models import Game, Chip
+from spartagames.redis_client import r
+from .cache import invalidate_home_feed_cache
+from .events import ack_game_events, claim_game_events
+from .images import delete_image_variants, make_image_variants
+from .uploads import abort_stale_gamefile_uploads
+from .models import Game, Chip, PlayLog, Screenshot, TotalPlayTime, View
+from .ratings import ACTUAL_RATING_ANNOTATIONS, has_rating_drift, reconcile_game_rating
+from .utils import assign_chip_based_on_difficulty, set_chip_games
+from . import ranking
 
 
 logger = logging.getLogger("sparta_games_celery")
 
 
+# 랭킹 칩별 부여 개수
+TOP_GAMES_LIMIT = 4
+
+
 @shared_task
 def assign_chips_to_top_games():
     """
     매일 상위 4개의 게임에 'Daily Top' 칩을 할당합니다.
-    기존에 할당된 'Daily Top' 칩을 제거하고 다시 할당합니다.
+    점수: 누적 즐겨찾기 수 * 0.4 + 최근 하루 리뷰 수 * 0.3 + 최근 하루 조회 수 * 0.3 (Redis 랭킹 집계 사용)
+    기존에 할당된 'Daily Top' 칩과 비교하여 바뀐 게임만 일괄 변경합니다.
     """
     try:
         # 'Daily Top' 칩 가져오기 (없으면 생성)
         daily_chip, _ = Chip.objects.get_or_create(name='Daily Top')
-        
-        # 기존에 'Daily Top' 칩이 할당된 게임들에서 칩 제거
-        games_with_daily_chip = Game.objects.filter(chip=daily_chip)
-        for game in games_with_daily_chip:
-            game.chip.remove(daily_chip)
-        
-        # 좋아요 수가 가장 많은 상위 4개 게임 가져오기
-        top_games = Game.objects.annotate(
-            score=(
-                Count('likes') * 0.4 +
-                Count('reviews', filter=Q(reviews__created_at__gte=timezone.now() - timedelta(days=1))) * 0.3 +
-                Count('views', filter=Q(views__created_at__gte=timezone.now() - timedelta(days=1))) * 0.3
-            )
-        ).filter(
-            is_visible=True,
-            register_state=1,
-        ).order_by('-score', '-created_at')[:4]
-        
-        # 상위 4개 게임에 'Daily Top' 칩 할당
-        for game in top_games:
-            game.chip.add(daily_chip)
-        
-        logger.info(f"Assigned 'Daily Top' chip to {len(top_games)} games.")
+
+        weights = {ranking.total_key("likes"): 0.4}
+        weights.update({key: 0.3 for key in ranking.window_keys("reviews", days=1)})
+        weights.update({key: 0.3 for key in ranking.window_keys("views", days=1)})
+
+        # 점수가 높은 상위 4개 게임 (점수가 있는 게임이 부족하면 최신 게임으로 채움)
+        top_game_ids = ranking.top_games(ranking.get_scores(weights), TOP_GAMES_LIMIT, fill=True)
+        changed_ids = set_chip_games(daily_chip, top_game_ids)
+
+        logger.info(f"Assigned 'Daily Top' chip to {len(top_game_ids)} games. ({len(changed_ids)} changed)")
     except Exception as e:
         logger.error(f"Error in assigning 'Daily Top' chips: {str(e)}", exc_info=True)
 
@@ -55,13 +58,11 @@ def cleanup_new_game_chip():
         new_game_chip = Chip.objects.filter(name='New Game').first()
         if not new_game_chip:
             return "새로 생성된 게임 칩이 없습니다."
-        
-        # 'New Game' 칩이 할당된 모든 게임에서 칩 제거
-        games_with_new_game = Game.objects.filter(chip=new_game_chip)
-        for game in games_with_new_game:
-            game.chip.remove(new_game_chip)
-        
-        logger.info(f"Removed 'New Game' chip from {len(games_with_new_game)} games.")
+
+        # 'New Game' 칩이 할당된 모든 게임에서 칩 일괄 제거
+        removed_ids = set_chip_games(new_game_chip, [])
+
+        logger.info(f"Removed 'New Game' chip from {len(removed_ids)} games.")
     except Exception as e:
         logger.error(f"Error in cleaning up 'New Game' chips: {str(e)}", exc_info=True)
 
@@ -70,94 +71,276 @@ def cleanup_new_game_chip():
 def assign_bookmark_top_chips():
     """
     매일 상위 4개의 게임에 'Bookmark Top' 칩을 할당합니다.
-    최소 5개의 즐겨찾기를 가진 게임 중에서 즐겨찾기 수가 가장 많은 상위 4개를 선정합니다.
+    최소 5개의 즐겨찾기를 가진 게임 중에서 즐겨찾기 수가 가장 많은 상위 4개를 선정합니다. (Redis 랭킹 집계 사용)
     중복 할당을 허용합니다.
     """
     try:
         # 'Bookmark Top' 칩 가져오기 (없으면 생성)
         bookmark_chip, created = Chip.objects.get_or_create(name='Bookmark Top')
-        
-        # 최소 5개의 즐겨찾기를 가진 게임 중 즐겨찾기 수가 가장 많은 상위 4개 게임 가져오기
-        top_bookmarked_games = Game.objects.annotate(
-            bookmark_count=Count('likes')
-        ).filter(
-            bookmark_count__gte=5,
-            is_visible=True,
-            register_state=1
-        ).order_by('-bookmark_count', '-created_at')[:4]
-        
-        # 상위 4개 게임에 'Bookmark Top' 칩 할당 (중복 허용)
-        for game in top_bookmarked_games:
-            game.chip.add(bookmark_chip)
-        
-        logger.info(f"Assigned 'Bookmark Top' chip to {len(top_bookmarked_games)} games.")
+
+        # 최소 5개의 즐겨찾기를 가진 게임 중 즐겨찾기 수가 가장 많은 상위 4개 게임
+        scores = ranking.get_scores({ranking.total_key("likes"): 1})
+        top_game_ids = ranking.top_games(scores, TOP_GAMES_LIMIT, min_score=5)
+
+        # 상위 4개 게임에 'Bookmark Top' 칩 할당 (중복 허용, 기존 칩 유지)
+        changed_ids = set_chip_games(bookmark_chip, top_game_ids, replace=False)
+
+        logger.info(f"Assigned 'Bookmark Top' chip to {len(top_game_ids)} games. ({len(changed_ids)} changed)")
     except Exception as e:
         logger.error(f"Error in assigning 'Bookmark Top' chips: {str(e)}", exc_info=True)
-    
+
 @shared_task
 def assign_long_play_chips():
     """
     매일 상위 4개의 게임에 'Long Play' 칩을 할당합니다.
-    지난 일주일 동안 사용자들의 총 플레이 시간이 가장 높은 4개의 게임을 선정합니다.
-    기존에 할당된 'Long Play' 칩을 제거하고 새로 할당합니다.
+    지난 일주일 동안 사용자들의 총 플레이 시간이 가장 높은 4개의 게임을 선정합니다. (Redis 랭킹 집계 사용)
+    기존에 할당된 'Long Play' 칩과 비교하여 바뀐 게임만 일괄 변경합니다.
     """
     try:
         # 'Long Play' 칩 가져오기 (없으면 생성)
         long_play_chip, created = Chip.objects.get_or_create(name='Long Play')
-        
-        # 기존에 'Long Play' 칩이 할당된 게임들에서 칩 제거
-        games_with_long_play_chip = Game.objects.filter(chip=long_play_chip)
-        for game in games_with_long_play_chip:
-            game.chip.remove(long_play_chip)
-        
-        # 지난 일주일 동안의 총 플레이 시간을 계산
-        one_week_ago = timezone.now() - timedelta(weeks=1)
-        top_long_play_games = Game.objects.annotate(
-            total_playtime=Sum('playlog__playtime')
-        ).filter(
-            total_playtime__isnull=False,
-            #total_playtime__gte=0,  # 최소 조건 설정 가능
-            is_visible=True,
-            register_state=1
-        ).order_by('-total_playtime', '-created_at')[:4]
-        
-        # 상위 4개 게임에 'Long Play' 칩 할당
-        for game in top_long_play_games:
-            game.chip.add(long_play_chip)
-        
-        logger.info(f"Assigned 'Long Play' chip to {len(top_long_play_games)} games.")
+
+        # 지난 일주일 동안의 총 플레이 시간
+        weights = {key: 1 for key in ranking.window_keys("playtime", days=7)}
+        top_game_ids = ranking.top_games(ranking.get_scores(weights), TOP_GAMES_LIMIT)
+        changed_ids = set_chip_games(long_play_chip, top_game_ids)
+
+        logger.info(f"Assigned 'Long Play' chip to {len(top_game_ids)} games. ({len(changed_ids)} changed)")
     except Exception as e:
         logger.error(f"Error in assigning 'Long Play' chips: {str(e)}", exc_info=True)
-    
+
 @shared_task
 def assign_review_top_chips():
     """
     매일 상위 4개의 게임에 'Review Top' 칩을 할당합니다.
-    지난 하루 동안 최소 10개의 리뷰가 달린 게임 중에서 리뷰 수가 가장 많은 상위 4개를 선정합니다.
-    기존에 할당된 'Review Top' 칩을 제거하고 새로 할당합니다.
+    최소 10개의 리뷰가 달린 게임 중에서 리뷰 수가 가장 많은 상위 4개를 선정합니다.
+    리뷰 수는 Game.review_cnt (리뷰 작성/삭제 시 갱신) 를 사용합니다.
+    기존에 할당된 'Review Top' 칩과 비교하여 바뀐 게임만 일괄 변경합니다.
     """
     try:
         # 'Review Top' 칩 가져오기 (없으면 생성)
         review_top_chip, created = Chip.objects.get_or_create(name='Review Top')
-        
-        # 기존에 'Review Top' 칩이 할당된 게임들에서 칩 제거
-        games_with_review_top_chip = Game.objects.filter(chip=review_top_chip)
-        for game in games_with_review_top_chip:
-            game.chip.remove(review_top_chip)
-        
-        # 총 리뷰 수가 최소 10개 이상인 게임 중 리뷰 수가 가장 많은 상위 4개 게임 가져오기
-        top_reviewed_games = Game.objects.annotate(
-            total_review_count=Count('reviews')
-        ).filter(
-            total_review_count__gte=10,
+
+        # 총 리뷰 수가 최소 10개 이상인 게임 중 리뷰 수가 가장 많은 상위 4개 게임
+        top_game_ids = list(Game.objects.filter(
+            review_cnt__gte=10,
             is_visible=True,
             register_state=1
-        ).order_by('-total_review_count', '-created_at')[:4]
-        
-        # 상위 4개 게임에 'Review Top' 칩 할당
-        for game in top_reviewed_games:
-            game.chip.add(review_top_chip)
-        
-        logger.info(f"Assigned 'Review Top' chip to {len(top_reviewed_games)} games.")
+        ).order_by('-review_cnt', '-created_at').values_list('pk', flat=True)[:TOP_GAMES_LIMIT])
+        changed_ids = set_chip_games(review_top_chip, top_game_ids)
+
+        logger.info(f"Assigned 'Review Top' chip to {len(top_game_ids)} games. ({len(changed_ids)} changed)")
+    except Exception as e:
+        logger.error(f"Error in assigning 'Review Top' chips: {str(e)}", exc_info=True)
+
+
+@shared_task
+def rebuild_game_rankings():
+    """
+    매일 DB 기준으로 Redis 랭킹 집계를 다시 만듭니다. (Redis 데이터 유실, 누락된 이벤트 보정)
+    """
+    try:
+        ranking.rebuild_rankings()
+        logger.info("Rebuilt game rankings.")
     except Exception as e:
-        logger.error(f"Error in assigning 'Review Top' chips: {str(e)}", exc_info=True)
\ No newline at end of file
+        logger.error(f"Error in rebuilding game rankings: {str(e)}", exc_info=True)
+
+
+@shared_task
+def reconcile_game_ratings():
+    """
+    매일 리뷰 기준으로 게임 별점/난이도 집계를 다시 계산합니다.
+    한 번의 집계 쿼리로 어긋난 게임을 찾고, 해당 게임만 행을 잠근 뒤 다시 계산하여 저장합니다.
+    """
+    try:
+        games = Game.objects.annotate(**ACTUAL_RATING_ANNOTATIONS).only(
+            "id", "star", "review_cnt", "star_sum", "difficulty_cnt", "difficulty_sum",
+        )
+        drifted_ids = [game.pk for game in games.iterator() if has_rating_drift(game)]
+
+        for game_id in drifted_ids:
+            reconcile_game_rating(game_id)
+            assign_chip_based_on_difficulty(Game.objects.get(pk=game_id))
+
+        logger.info(f"Reconciled ratings of {len(drifted_ids)} games.")
+    except Exception as e:
+        logger.error(f"Error in reconciling game ratings: {str(e)}", exc_info=True)
+
+
+@shared_task
+def cleanup_gamefile_uploads():
+    """
+    매일 완료되지 않고 방치된 게임 파일 multipart upload 를 취소합니다.
+    업로드 상태 보관 기간이 지난 업로드만 취소하며, 업로드한 part 는 S3에서 삭제됩니다.
+    """
+    try:
+        aborted = abort_stale_gamefile_uploads()
+        logger.info(f"Aborted {aborted} stale gamefile uploads.")
+    except Exception as e:
+        logger.error(f"Error in cleaning up gamefile uploads: {str(e)}", exc_info=True)
+
+
+# 한 번에 꺼내 저장할 이벤트 수, 한 번 실행에서 처리할 최대 배치 수
+GAME_EVENTS_BATCH_SIZE = 1000
+GAME_EVENTS_MAX_BATCHES = 20
+
+
+@shared_task
+def flush_game_events():
+    """
+    주기적으로 Redis 버퍼에 쌓인 게임 조회/플레이 이벤트를 DB에 일괄 저장합니다.
+    View, PlayLog는 bulk_create, TotalPlayTime은 bulk_update/bulk_create로 반영합니다.
+    """
+    # 이전 실행이 끝나지 않았으면 건너뜀 (TotalPlayTime 중복 생성 방지)
+    lock = r.lock("games:events:flush", timeout=300, blocking_timeout=0)
+    if not lock.acquire():
+        return
+    try:
+        for _ in range(GAME_EVENTS_MAX_BATCHES):
+            raw_events = claim_game_events(GAME_EVENTS_BATCH_SIZE)
+            if not raw_events:
+                break
+            try:
+                playtimes = _save_game_events([json.loads(raw) for raw in raw_events])
+            except Exception as e:
+                # 배치는 저장 중 리스트에 남아 다음 실행에서 다시 저장
+                logger.error(f"Error in flushing game events: {str(e)}", exc_info=True)
+                break
+            ack_game_events(playtimes)
+            _count_ranking_events(raw_events)
+            logger.info(f"Flushed {len(raw_events)} game events.")
+    finally:
+        lock.release()
+
+
+def _save_game_events(events):
+    """
+    이벤트 목록을 한 트랜잭션에서 저장하고, 미반영 플레이 시간에서 차감할 플레이 시간을 반환
+    (삭제된 유저/게임의 플레이 시간도 차감 대상에 포함)
+    """
+    # 그 사이 삭제된 유저/게임의 이벤트는 제외
+    user_ids = set(get_user_model().objects.filter(
+        pk__in={event["user_id"] for event in events}
+    ).values_list("pk", flat=True))
+    game_ids = set(Game.objects.filter(
+        pk__in={event["game_id"] for event in events}
+    ).values_list("pk", flat=True))
+
+    views = []
+    playlogs = []
+    playtimes = {}
+    latest_at = {}
+    dropped_playtimes = {}
+    for event in events:
+        key = (event["user_id"], event["game_id"])
+        if event["user_id"] not in user_ids or event["game_id"] not in game_ids:
+            if event["type"] == "play":
+                dropped_playtimes[key] = dropped_playtimes.get(key, 0) + event["playtime"]
+            continue
+
+        if event["type"] == "view":
+            views.append(View(user_id=event["user_id"], game_id=event["game_id"]))
+        elif event["type"] == "play":
+            end_at = datetime.fromisoformat(event["end_at"])
+            playlogs.append(PlayLog(
+                user_id=event["user_id"],
+                game_id=event["game_id"],
+                start_at=datetime.fromisoformat(event["start_at"]),
+                end_at=end_at,
+                playtime=event["playtime"],
+            ))
+            playtimes[key] = playtimes.get(key, 0) + event["playtime"]
+            latest_at[key] = max(latest_at.get(key, end_at), end_at)
+
+    with transaction.atomic():
+        View.objects.bulk_create(views, batch_size=500)
+        PlayLog.objects.bulk_create(playlogs, batch_size=500)
+
+        # 유저별 게임 누적 플레이 시간 반영 (기존 행은 DB에서 증가, 없으면 생성)
+        totals = {}
+        if playtimes:
+            rows = TotalPlayTime.objects.filter(
+                user_id__in={user_id for user_id, _ in playtimes},
+                game_id__in={game_id for _, game_id in playtimes},
+            ).order_by("pk")
+            for row in rows:
+                totals.setdefault((row.user_id, row.game_id), row)
+
+        updated = []
+        created = []
+        for key, seconds in playtimes.items():
+            row = totals.get(key)
+            if row:
+                row.totaltime = F("totaltime") + seconds
+                row.latest_at = latest_at[key]
+                updated.append(row)
+            else:
+                created.append(TotalPlayTime(
+                    user_id=key[0], game_id=key[1], totaltime=seconds, latest_at=latest_at[key],
+                ))
+        TotalPlayTime.objects.bulk_update(updated, ["totaltime", "latest_at"], batch_size=500)
+        TotalPlayTime.objects.bulk_create(created, batch_size=500)
+
+    for key, seconds in dropped_playtimes.items():
+        playtimes[key] = playtimes.get(key, 0) + seconds
+    return playtimes
+
+
+def _count_ranking_events(raw_events):
+    """
+    저장한 조회/플레이 이벤트를 발생일 기준 랭킹 일별 집계에 반영
+    """
+    daily = {}
+    for raw in raw_events:
+        event = json.loads(raw)
+        if event["type"] == "view":
+            metric, at, amount = "views", event["at"], 1
+        else:
+            metric, at, amount = "playtime", event["end_at"], event["playtime"]
+        day = timezone.localdate(datetime.fromisoformat(at))
+        counts = daily.setdefault((metric, day), {})
+        counts[event["game_id"]] = counts.get(event["game_id"], 0) + amount
+
+    for (metric, day), counts in daily.items():
+        ranking.incr_daily(metric, counts, day=day)
+
+
+@shared_task
+def generate_game_image_variants(game_id):
+    """
+    게임 썸네일/스크린샷의 크기별 WebP 변환본을 만듭니다.
+    게임 등록/수정 시 썸네일이나 스크린샷이 바뀌면 실행되며, 변환본이 없거나 원본이 바뀐 이미지만 변환합니다.
+    """
+    game = Game.objects.filter(pk=game_id).first()
+    if game is None:
+        return
+
+    is_updated = False
+    if game.thumbnail and game.thumbnail_variants.get("src") != game.thumbnail.name:
+        try:
+            variants = make_image_variants(game.thumbnail)
+        except Exception as e:
+            logger.error(f"게임 {game_id} 썸네일 변환 실패: {e}", exc_info=True)
+        else:
+            # 변환 중에 썸네일이 바뀌었으면 저장하지 않음
+            if Game.objects.filter(pk=game_id, thumbnail=game.thumbnail.name).update(thumbnail_variants=variants):
+                is_updated = True
+            else:
+                delete_image_variants(game.thumbnail.storage, variants)
+
+    for screenshot in Screenshot.objects.filter(game_id=game_id):
+        if not screenshot.src or screenshot.variants.get("src") == screenshot.src.name:
+            continue
+        try:
+            variants = make_image_variants(screenshot.src)
+        except Exception as e:
+            logger.error(f"스크린샷 {screenshot.pk} 변환 실패: {e}", exc_info=True)
+            continue
+        if not Screenshot.objects.filter(pk=screenshot.pk).update(variants=variants):
+            # 변환 중에 스크린샷이 삭제됨
+            delete_image_variants(screenshot.src.storage, variants)
+
+    # 게임 카드 목록에 변환본 url 반영
+    if is_updated:
+        invalidate_home_feed_cache()
+    logger.info(f"게임 {game_id} 이미지 변환을 완료했습니다.")
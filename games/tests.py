@@ -1,3 +1,165 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import Chip, Game, GameCategory, Like, Review, TotalPlayTime
+from .utils import refresh_display_chips, refresh_search_documents
+
+
+# 목록 API 쿼리 수 회귀 테스트
+# 게임 카드 직렬화(GameListSerializer)는 페이지 단위로 한 번에 불러오므로 게임 수와 관계없이 쿼리 수가 같아야 함
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class GameListQueryCountTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(email="player@test.com", password="pw", nickname="player")
+        cls.categories = [GameCategory.objects.create(name=name) for name in ("RPG", "FPS", "PUZZLE")]
+        cls.chips = [
+            Chip.objects.create(name=name)
+            for name in ("EASY", "NORMAL", "HARD", "Daily Top", "New Game", "Bookmark Top", "Long Play", "Review Top")
+        ]
+        cls.user.game_category.set(cls.categories)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def create_games(self, count):
+        games = []
+        for _ in range(count):
+            maker = get_user_model().objects.create_user(
+                email=f"maker{Game.objects.count()}@test.com", password="pw", nickname=f"maker{Game.objects.count()}"
+            )
+            game = Game.objects.create(
+                title=f"game {Game.objects.count()}",
+                thumbnail="images/thumbnail/test.png",
+                gamefile="zips/test.zip",
+                maker=maker,
+                content="content",
+                register_state=1,
+                star=0,
+                review_cnt=0,
+            )
+            # 카드마다 카테고리, 칩, 즐겨찾기, 플레이 기록이 모두 있는 경우
+            game.category.set(self.categories)
+            game.chip.add(self.chips[1], self.chips[3], self.chips[4])
+            Like.objects.create(user=self.user, game=game)
+            TotalPlayTime.objects.create(user=self.user, game=game, latest_at=timezone.now(), totaltime=60)
+            games.append(game)
+        refresh_display_chips(games)
+        refresh_search_documents(games)
+        return games
+
+    def assertQueryCountStable(self, num, request):
+        """
+        게임 수를 늘려도 쿼리 수가 num 으로 같은지 확인 (로그인 유저 기준)
+        """
+        self.client.force_authenticate(self.user)
+        for count in (4, 12):
+            self.create_games(count)
+            cache.clear()
+            with self.assertNumQueries(num):
+                response = request()
+            self.assertEqual(response.status_code, 200)
+
+    def test_home_feed(self):
+        self.assertQueryCountStable(
+            # 카테고리 목록 + 섹션 6개 x (게임, 제작자, 카테고리) + 즐겨찾기 여부
+            20,
+            lambda: self.client.get("/games/api/list/", {"limit": 8}),
+        )
+
+    def test_home_feed_cached(self):
+        self.client.force_authenticate(self.user)
+        self.create_games(4)
+        self.client.get("/games/api/list/")
+        # 캐시된 경우 카테고리 목록과 즐겨찾기 여부만 조회
+        with self.assertNumQueries(2):
+            response = self.client.get("/games/api/list/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_home_feed_invalid_limit(self):
+        # 허용 범위 밖의 limit 은 캐시 키를 만들기 전에 거절
+        for limit in ("0", "-1", "21", "abc"):
+            with self.assertNumQueries(0):
+                response = self.client.get("/games/api/list/", {"limit": limit})
+            self.assertEqual(response.status_code, 400)
+
+    def test_category_list(self):
+        self.assertQueryCountStable(
+            # 카테고리, exists, count, 페이지, 제작자, 카테고리, 즐겨찾기
+            7,
+            lambda: self.client.get("/games/api/list/categories/", {"category": "RPG"}),
+        )
+
+    def test_search(self):
+        self.assertQueryCountStable(
+            # 즐겨찾기/나머지 count, 페이지, 제작자, 카테고리, 즐겨찾기 여부
+            6,
+            lambda: self.client.get("/games/api/list/search/"),
+        )
+
+    def test_search_keyword(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("trigram 검색은 PostgreSQL 에서만 동작")
+        self.assertQueryCountStable(
+            6,
+            lambda: self.client.get("/games/api/list/search/", {"keyword": "game"}),
+        )
+
+    def test_gamepacks(self):
+        self.assertQueryCountStable(
+            # 유저, 즐겨찾기 게임, 제작자, 카테고리, 즐겨찾기 여부
+            5,
+            lambda: self.client.get(f"/users/api/{self.user.id}/gamepacks/"),
+        )
+
+    def test_recently_played_games(self):
+        self.assertQueryCountStable(
+            # 유저, exists, count, 페이지, 제작자, 카테고리, 즐겨찾기 여부
+            7,
+            lambda: self.client.get(f"/users/api/{self.user.id}/recent/"),
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ReviewCursorPaginationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(email="player@test.com", password="pw", nickname="player")
+        cls.game = Game.objects.create(
+            title="game", thumbnail="images/thumbnail/test.png", gamefile="zips/test.zip",
+            maker=cls.user, content="content", register_state=1, star=0, review_cnt=0,
+        )
+        for i in range(10):
+            author = User.objects.create_user(email=f"author{i}@test.com", password="pw", nickname=f"author{i}")
+            Review.objects.create(author=author, game=cls.game, content="review", star=3, difficulty=1)
+        Review.objects.create(author=cls.user, game=cls.game, content="mine", star=5, difficulty=1)
+
+    def test_my_review_on_first_page_from_previous_cursor(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        first = client.get(f"/games/api/list/{self.game.id}/reviews/", {"pagination": "cursor"}).json()
+        self.assertIn("my_review", first["data"])
+
+        second = client.get(first["pagination"]["next"]).json()
+        self.assertNotIn("my_review", second["data"])
+
+        # 이전 페이지 커서로 첫 페이지에 돌아와도 내 리뷰 포함
+        back = client.get(second["pagination"]["previous"]).json()
+        self.assertIn("my_review", back["data"])
+        self.assertIsNone(back["pagination"]["previous"])
+        self.assertEqual(
+            [review["id"] for review in back["data"]["all_reviews"]],
+            [review["id"] for review in first["data"]["all_reviews"]],
+        )
@@ -0,0 +1,304 @@
+from datetime import timedelta
+import math
+import os
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from spartagames.s3 import get_s3_client
+
+from .utils import validate_zip_file
+
+
+# 게임 zip 파일 S3 직접 업로드 (presigned multipart upload)
+# 웹 서버는 업로드 시작/part 서명/완료 처리만 하고 파일 내용은 클라이언트가 S3로 바로 올림
+GAMEFILE_MAX_SIZE = 500 * 1024 * 1024
+# part 크기 (S3 제한: 마지막 part를 제외하고 5MB 이상, part 최대 10,000개)
+GAMEFILE_PART_SIZE = 16 * 1024 * 1024
+# 업로드 진행 상태 보관 기간 (이 시간 안에 업로드를 완료하고 게임 등록/수정을 요청해야 함)
+GAMEFILE_UPLOAD_TIMEOUT = 60 * 60 * 24
+# part 업로드 url 유효 시간
+GAMEFILE_PART_URL_EXPIRES = 60 * 60
+# zip 파일 끝부분 (EOCD)을 읽을 때 한 번에 가져올 최소 크기
+RANGE_READ_MIN_SIZE = 64 * 1024
+
+
+class GameFileUploadError(Exception):
+    pass
+
+
+class S3RangeReader:
+    """
+    S3 객체를 Range GET으로 필요한 부분만 읽는 파일 객체 (seek 가능)
+    zip 파일 검증(read_zip_entries) 시 끝부분(EOCD)과 중앙 디렉터리만 읽음
+    validate_zip_file 에서 사용하는 name, size 속성을 가짐
+    """
+
+    def __init__(self, s3, bucket, key, size=None, name=None):
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.size = size if size is not None else s3.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        self.name = name or key
+        self.pos = 0
+        self.request_count = 0
+        # 마지막으로 가져온 구간 (시작 위치, 데이터)
+        self._buffer_start = 0
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            pos = offset
+        elif whence == os.SEEK_CUR:
+            pos = self.pos + offset
+        elif whence == os.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if pos < 0:
+            raise OSError("negative seek position")
+        self.pos = pos
+        return self.pos
+
+    def read(self, size=-1):
+        end = self.size if size is None or size < 0 else min(self.pos + size, self.size)
+        if self.pos >= end:
+            return b""
+
+        buffer_end = self._buffer_start + len(self._buffer)
+        if not (self._buffer_start <= self.pos and end <= buffer_end):
+            # 작은 read가 연속으로 들어오므로 최소 RANGE_READ_MIN_SIZE 만큼 가져옴
+            fetch_end = min(max(end, self.pos + RANGE_READ_MIN_SIZE), self.size)
+            self._buffer = self._get_range(self.pos, fetch_end)
+            self._buffer_start = self.pos
+
+        data = self._buffer[self.pos - self._buffer_start:end - self._buffer_start]
+        self.pos += len(data)
+        return data
+
+    def _get_range(self, start, end):
+        self.request_count += 1
+        resp = self.s3.get_object(Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end - 1}")
+        return resp["Body"].read()
+
+    def close(self):
+        self._buffer = b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _state_key(upload_id):
+    return f"games:gamefile_upload:{upload_id}"
+
+
+def get_gamefile_upload(user, upload_id):
+    """
+    유저가 시작한 업로드 상태 (없거나 다른 유저의 업로드면 None)
+    """
+    upload = cache.get(_state_key(upload_id))
+    if upload is None or upload["user_id"] != user.id:
+        return None
+    return upload
+
+
+def initiate_gamefile_upload(user, filename, size):
+    """
+    multipart upload 시작
+    업로드 경로는 Game.gamefile 의 upload_to 와 같은 규칙(media/zips/<시각>_<파일명>.zip)을 따름
+    """
+    if not filename or not filename.lower().endswith(".zip"):
+        raise GameFileUploadError("ZIP 파일만 업로드 가능합니다.")
+    if size <= 0 or size > GAMEFILE_MAX_SIZE:
+        raise GameFileUploadError(f"ZIP 파일 크기는 최대 {GAMEFILE_MAX_SIZE / (1024 * 1024)}MB 이어야 합니다.")
+
+    time_data = timezone.now().strftime("%Y%m%d%H%M%S%f")
+    file_name, extension = os.path.splitext(os.path.basename(filename))
+    name = f"zips/{time_data}_{file_name}{extension.lower()}"
+
+    s3 = get_s3_client()
+    resp = s3.create_multipart_upload(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=f"media/{name}",
+        ContentType="application/zip",
+    )
+    upload = {
+        "upload_id": resp["UploadId"],
+        "user_id": user.id,
+        "name": name,
+        "size": size,
+        "part_size": GAMEFILE_PART_SIZE,
+        "part_count": math.ceil(size / GAMEFILE_PART_SIZE),
+        "completed": False,
+    }
+    cache.set(_state_key(upload["upload_id"]), upload, timeout=GAMEFILE_UPLOAD_TIMEOUT)
+    return upload
+
+
+def sign_gamefile_parts(upload, part_numbers):
+    """
+    part 업로드용 presigned url 발급
+    반환값: {part 번호: url}
+    """
+    if not part_numbers or any(not 1 <= number <= upload["part_count"] for number in part_numbers):
+        raise GameFileUploadError(f"part 번호는 1 ~ {upload['part_count']} 사이여야 합니다.")
+
+    s3 = get_s3_client()
+    return {
+        number: s3.generate_presigned_url(
+            ClientMethod="upload_part",
+            Params={
+                "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
+                "Key": f"media/{upload['name']}",
+                "UploadId": upload["upload_id"],
+                "PartNumber": number,
+            },
+            ExpiresIn=GAMEFILE_PART_URL_EXPIRES,
+        )
+        for number in part_numbers
+    }
+
+
+def list_gamefile_parts(upload):
+    """
+    업로드가 끝난 part 목록 (이어서 업로드할 때 사용)
+    """
+    s3 = get_s3_client()
+    parts = []
+    params = {
+        "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
+        "Key": f"media/{upload['name']}",
+        "UploadId": upload["upload_id"],
+    }
+    while True:
+        resp = s3.list_parts(**params)
+        parts += [
+            {"part_number": part["PartNumber"], "etag": part["ETag"], "size": part["Size"]}
+            for part in resp.get("Parts", [])
+        ]
+        if not resp.get("IsTruncated"):
+            return parts
+        params["PartNumberMarker"] = resp["NextPartNumberMarker"]
+
+
+def complete_gamefile_upload(upload, parts):
+    """
+    multipart upload 완료 후 zip 파일 검증
+    S3에서 zip 파일의 끝부분(EOCD)과 중앙 디렉터리만 Range GET으로 읽어서 검증함
+    검증에 실패하면 업로드한 파일을 삭제하고 GameFileUploadError 발생
+    """
+    try:
+        parts = sorted(
+            ({"PartNumber": int(part["part_number"]), "ETag": part["etag"]} for part in parts),
+            key=lambda part: part["PartNumber"],
+        )
+    except (KeyError, TypeError, ValueError):
+        raise GameFileUploadError("part 목록 형식이 올바르지 않습니다.")
+    if not parts:
+        raise GameFileUploadError("업로드한 part가 없습니다.")
+
+    s3 = get_s3_client()
+    key = f"media/{upload['name']}"
+    try:
+        s3.complete_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=key,
+            UploadId=upload["upload_id"],
+            MultipartUpload={"Parts": parts},
+        )
+    except ClientError as e:
+        raise GameFileUploadError(f"업로드를 완료하지 못했습니다. ({e.response['Error'].get('Message', e)})")
+
+    reader = S3RangeReader(s3, settings.AWS_STORAGE_BUCKET_NAME, key, name=upload["name"])
+    with reader:
+        is_valid, error_msg = validate_zip_file(reader, max_size=GAMEFILE_MAX_SIZE)
+    if not is_valid:
+        s3.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+        cache.delete(_state_key(upload["upload_id"]))
+        raise GameFileUploadError(error_msg)
+
+    upload["completed"] = True
+    upload["size"] = reader.size
+    cache.set(_state_key(upload["upload_id"]), upload, timeout=GAMEFILE_UPLOAD_TIMEOUT)
+    return upload
+
+
+def abort_gamefile_upload(upload):
+    """
+    업로드 취소 (업로드한 part 삭제)
+    """
+    s3 = get_s3_client()
+    if upload["completed"]:
+        s3.delete_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=f"media/{upload['name']}")
+    else:
+        s3.abort_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=f"media/{upload['name']}",
+            UploadId=upload["upload_id"],
+        )
+    cache.delete(_state_key(upload["upload_id"]))
+
+
+def abort_stale_gamefile_uploads():
+    """
+    업로드 상태 보관 기간(GAMEFILE_UPLOAD_TIMEOUT)이 지나도록 완료되지 않은 multipart upload 취소
+    클라이언트가 취소 요청 없이 떠난 업로드의 part 가 S3에 계속 남지 않도록 주기적으로 실행
+    반환값: 취소한 업로드 수
+    """
+    s3 = get_s3_client()
+    expired_before = timezone.now() - timedelta(seconds=GAMEFILE_UPLOAD_TIMEOUT)
+    params = {"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Prefix": "media/zips/"}
+    aborted = 0
+    while True:
+        resp = s3.list_multipart_uploads(**params)
+        for upload in resp.get("Uploads", []):
+            if upload["Initiated"] >= expired_before:
+                continue
+            try:
+                s3.abort_multipart_upload(
+                    Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                    Key=upload["Key"],
+                    UploadId=upload["UploadId"],
+                )
+            except ClientError as e:
+                # 그 사이 완료/취소된 업로드
+                if e.response["Error"].get("Code") != "NoSuchUpload":
+                    raise
+            cache.delete(_state_key(upload["UploadId"]))
+            aborted += 1
+        if not resp.get("IsTruncated"):
+            return aborted
+        params["KeyMarker"] = resp["NextKeyMarker"]
+        params["UploadIdMarker"] = resp["NextUploadIdMarker"]
+
+
+def get_completed_gamefile(user, upload_id):
+    """
+    게임 등록/수정에 사용할 게임 파일 경로 (Game.gamefile 에 저장할 이름)
+    업로드와 검증이 끝나지 않았으면 None
+    """
+    upload = get_gamefile_upload(user, upload_id)
+    if upload is None or not upload["completed"]:
+        return None
+    return upload["name"]
+
+
+def release_gamefile_upload(upload_id):
+    """
+    게임 등록/수정에 사용한 업로드 상태 삭제 (같은 파일로 다시 등록하지 못하도록)
+    """
+    cache.delete(_state_key(upload_id))
@@ -10,6 +10,10 @@ urlpatterns = [
     path("api/list/search/", views.game_list_search, name="search"),
     path('api/list/categories/', views.category_games_list, name='category_games_list'),
     path("api/list/<int:game_id>/", views.GameDetailAPIView.as_view(), name="game_detail"),
+    path("api/gamefile/uploads/", views.GameFileUploadAPIView.as_view(), name="gamefile_upload"),
+    path("api/gamefile/uploads/<str:upload_id>/", views.GameFileUploadDetailAPIView.as_view(), name="gamefile_upload_detail"),
+    path("api/gamefile/uploads/<str:upload_id>/parts/", views.GameFileUploadPartAPIView.as_view(), name="gamefile_upload_parts"),
+    path("api/gamefile/uploads/<str:upload_id>/complete/", views.GameFileUploadCompleteAPIView.as_view(), name="gamefile_upload_complete"),
     path("api/list/<int:game_id>/like/", views.GameLikeAPIView.as_view(), name="game_like"),
     # path("api/list/<int:game_pk>/star/", views.GameStarAPIView.as_view(), name="game_star"),
     path("api/list/<int:game_id>/reviews/", views.ReviewAPIView.as_view(), name="reviews"),
@@ -1,12 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import os
 import re
 import requests
 import stat
+import struct
 import zipfile
 
-from django.db.models import Avg
-from .models import Chip
+from django.db.models import prefetch_related_objects
+from .cache import invalidate_home_feed_cache
+from .models import Chip, Game
 
 from spartagames.config import DISCORD_GAME_UPLOAD_CHANNEL_WEBHOOK_URL
 from spartagames.exceptions import DiscordAlertException
@@ -39,22 +42,59 @@ UNITY_DATA_EXTENSIONS = (
     ".data.unityweb", ".data.br", ".data.gz", ".data",
 )
 
+# 업로드 허용 이미지 형식 (Pillow 가 파일 앞부분의 magic bytes 로 판별한 형식)
+IMAGE_ALLOWED_FORMATS = ("JPEG", "MPO", "PNG", "GIF", "WEBP", "BMP")
+# 이미지 최대 픽셀 수 (가로 x 세로, 8K 이미지 약 3,300만 픽셀)
+IMAGE_MAX_PIXELS = 50_000_000
+# 이미지 동시 검증 스레드 수
+IMAGE_VALIDATION_MAX_WORKERS = 4
+
+# 게임 카드에 노출할 칩 (난이도 칩 1개 + 우선순위 칩, 최대 3개)
+DIFFICULTY_CHIPS = ("EASY", "NORMAL", "HARD")
+PRIORITY_CHIPS = ("Daily Top", "New Game", "Bookmark Top", "Long Play", "Review Top")
+MAX_DISPLAY_CHIPS = 3
+
 
 def validate_image(image):
     """
     이미지 파일 형식만 검증하는 함수 (확장자 무관)
+    파일 앞부분(헤더)으로 형식과 크기만 확인하고 픽셀 데이터는 디코딩하지 않음
+    (전체 디코딩은 WebP 변환 작업(games.tasks.generate_game_image_variants)에서 수행)
     """
     try:
         img = Image.open(image)
-        img.verify()  # 파일 손상 여부 확인
+        if img.format not in IMAGE_ALLOWED_FORMATS:
+            return False, "유효한 이미지 파일이 아닙니다."
 
-        # 확실한 검증을 위해 다시 열어서 실제로 로드해보기
-        img = Image.open(image)
-        img.load()  # 로드 과정에서 오류 발생 시 비정상적인 이미지
+        # 과도한 크기의 이미지 (decompression bomb) 확인
+        width, height = img.size
+        if width <= 0 or height <= 0 or width * height > IMAGE_MAX_PIXELS:
+            return False, "이미지 크기가 너무 큽니다."
 
+        # 파일 구조 확인 (PNG는 chunk CRC 확인, 픽셀 데이터는 디코딩하지 않음)
+        img.verify()
         return True, None
+    except Image.DecompressionBombError:
+        return False, "이미지 크기가 너무 큽니다."
     except Exception:
         return False, "유효한 이미지 파일이 아닙니다."
+    finally:
+        # 이후 파일 저장을 위해 처음 위치로 되돌림
+        if hasattr(image, "seek"):
+            image.seek(0)
+
+
+def validate_images(images):
+    """
+    여러 이미지 파일을 동시에 검증 (첫 번째 실패 결과 반환)
+    """
+    if len(images) <= 1:
+        return validate_image(images[0]) if images else (True, None)
+    with ThreadPoolExecutor(max_workers=min(len(images), IMAGE_VALIDATION_MAX_WORKERS)) as executor:
+        for is_valid, error_msg in executor.map(validate_image, images):
+            if not is_valid:
+                return is_valid, error_msg
+    return True, None
 
 
 # 비정상적인 path 판단 (zip slip 사전 체크)
@@ -76,8 +116,155 @@ def _is_abnormal_path(p: str) -> bool:
     return False
 
 
+# zip 파일 중앙 디렉터리 파싱용 구조 (zipfile 모듈과 같은 형식)
+_EOCD_SIGNATURE = b"PK\x05\x06"
+_EOCD_STRUCT = struct.Struct("<4s4H2LH")
+_ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+_ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+_ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+_ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+_CENTRAL_DIR_SIGNATURE = b"PK\x01\x02"
+_CENTRAL_DIR_STRUCT = struct.Struct("<4s4B4HL2L5H2L")
+_ZIP64_EXTRA_ID = 0x0001
+# EOCD 뒤에 올 수 있는 주석 최대 길이
+_MAX_COMMENT_SIZE = 0xFFFF
+
+
+class ZipEntry:
+    """
+    중앙 디렉터리의 파일 정보 (zipfile.ZipInfo 중 검증에 필요한 값만 가짐)
+    """
+    __slots__ = ("filename", "flag_bits", "compress_size", "file_size", "create_system", "external_attr")
+
+    def __init__(self, filename, flag_bits, compress_size, file_size, create_system, external_attr):
+        self.filename = filename
+        self.flag_bits = flag_bits
+        self.compress_size = compress_size
+        self.file_size = file_size
+        self.create_system = create_system
+        self.external_attr = external_attr
+
+    def is_dir(self):
+        return self.filename.endswith('/')
+
+
+def _read_at(fp, offset, size):
+    fp.seek(offset)
+    data = fp.read(size)
+    if len(data) != size:
+        raise zipfile.BadZipFile("File is truncated")
+    return data
+
+
+def read_zip_entries(fp):
+    """
+    zip 파일의 끝부분(EOCD)과 중앙 디렉터리만 읽어서 파일 정보 목록을 반환
+    fp 는 seek/read 가 가능한 파일 객체 (업로드 파일, S3 Range GET 파일 객체 등)
+    압축된 파일 내용은 읽지 않으므로 S3에서는 Range GET 2~3번으로 끝남
+    zip64 형식 지원, 형식이 올바르지 않으면 zipfile.BadZipFile 발생
+    """
+    fp.seek(0, os.SEEK_END)
+    file_size = fp.tell()
+    if file_size < _EOCD_STRUCT.size:
+        raise zipfile.BadZipFile("File is not a zip file")
+
+    # 1. EOCD 찾기 (주석이 있으면 EOCD가 끝에서 최대 64KB 앞에 있음)
+    tail_size = min(file_size, _EOCD_STRUCT.size + _MAX_COMMENT_SIZE)
+    tail_offset = file_size - tail_size
+    tail = _read_at(fp, tail_offset, tail_size)
+    eocd_pos = tail.rfind(_EOCD_SIGNATURE)
+    while eocd_pos >= 0 and eocd_pos + _EOCD_STRUCT.size > len(tail):
+        eocd_pos = tail.rfind(_EOCD_SIGNATURE, 0, eocd_pos)
+    if eocd_pos < 0:
+        raise zipfile.BadZipFile("File is not a zip file")
+    (_, disk_number, _, _, entry_count, cd_size, cd_offset, _) = _EOCD_STRUCT.unpack_from(tail, eocd_pos)
+    if disk_number != 0:
+        raise zipfile.BadZipFile("zipfiles that span multiple disks are not supported")
+    eocd_offset = tail_offset + eocd_pos
+    # zip 파일 앞에 다른 데이터가 붙어 있으면 그만큼 위치가 밀림
+    cd_end = eocd_offset
+
+    # 2. zip64 EOCD (파일 수 65,535개 또는 크기 4GB 이상)
+    locator_offset = eocd_offset - _ZIP64_LOCATOR_STRUCT.size
+    if locator_offset >= 0:
+        locator = _read_at(fp, locator_offset, _ZIP64_LOCATOR_STRUCT.size)
+        if locator[:4] == _ZIP64_LOCATOR_SIGNATURE:
+            zip64_eocd_offset = locator_offset - _ZIP64_EOCD_STRUCT.size
+            if zip64_eocd_offset < 0:
+                raise zipfile.BadZipFile("Corrupt zip64 end of central directory locator")
+            zip64_eocd = _ZIP64_EOCD_STRUCT.unpack(_read_at(fp, zip64_eocd_offset, _ZIP64_EOCD_STRUCT.size))
+            if zip64_eocd[0] != _ZIP64_EOCD_SIGNATURE:
+                raise zipfile.BadZipFile("Corrupt zip64 end of central directory record")
+            entry_count, cd_size, cd_offset = zip64_eocd[7], zip64_eocd[8], zip64_eocd[9]
+            cd_end = zip64_eocd_offset
+
+    concat = cd_end - cd_size - cd_offset
+    if concat < 0:
+        raise zipfile.BadZipFile("Bad offset for central directory")
+
+    # 3. 중앙 디렉터리 (한 번에 읽은 뒤 메모리에서 파싱)
+    central_dir = _read_at(fp, cd_offset + concat, cd_size)
+    entries = []
+    pos = 0
+    while pos + _CENTRAL_DIR_STRUCT.size <= cd_size:
+        header = _CENTRAL_DIR_STRUCT.unpack_from(central_dir, pos)
+        if header[0] != _CENTRAL_DIR_SIGNATURE:
+            raise zipfile.BadZipFile("Bad magic number for central directory")
+        flag_bits, compress_size, file_size = header[5], header[10], header[11]
+        name_len, extra_len, comment_len = header[12], header[13], header[14]
+        pos += _CENTRAL_DIR_STRUCT.size
+
+        raw_name = central_dir[pos:pos + name_len]
+        extra = central_dir[pos + name_len:pos + name_len + extra_len]
+        pos += name_len + extra_len + comment_len
+        if pos > cd_size:
+            raise zipfile.BadZipFile("Truncated central directory")
+
+        filename = raw_name.decode("utf-8" if flag_bits & 0x800 else "cp437")
+        # zipfile 과 같이 NULL 문자 뒤는 버림
+        filename = filename.split("\x00", 1)[0]
+
+        # zip64 확장 필드에 실제 크기가 있음 (원본 크기, 압축 크기 순서로 0xFFFFFFFF 인 값만 들어있음)
+        if file_size == 0xFFFFFFFF or compress_size == 0xFFFFFFFF:
+            file_size, compress_size = _read_zip64_sizes(extra, file_size, compress_size)
+
+        entries.append(ZipEntry(
+            filename=filename,
+            flag_bits=flag_bits,
+            compress_size=compress_size,
+            file_size=file_size,
+            create_system=header[2],
+            external_attr=header[17],
+        ))
+
+    if len(entries) != entry_count:
+        raise zipfile.BadZipFile("Central directory entry count mismatch")
+    return entries
+
+
+def _read_zip64_sizes(extra, file_size, compress_size):
+    pos = 0
+    while pos + 4 <= len(extra):
+        field_id, field_size = struct.unpack_from("<HH", extra, pos)
+        pos += 4
+        if field_id == _ZIP64_EXTRA_ID:
+            field = extra[pos:pos + field_size]
+            values = [struct.unpack_from("<Q", field, offset)[0] for offset in range(0, len(field) - 7, 8)]
+            if file_size == 0xFFFFFFFF:
+                if not values:
+                    raise zipfile.BadZipFile("Corrupt extra field 0001 (missing file size)")
+                file_size = values.pop(0)
+            if compress_size == 0xFFFFFFFF:
+                if not values:
+                    raise zipfile.BadZipFile("Corrupt extra field 0001 (missing compress size)")
+                compress_size = values.pop(0)
+            return file_size, compress_size
+        pos += field_size
+    raise zipfile.BadZipFile("Missing zip64 extra field")
+
+
 # symlink 확인
-def _is_symlink(info: zipfile.ZipInfo) -> bool:
+def _is_symlink(info) -> bool:
     # Unix 운영체제에서 만들어진 zip 파일일 때
     if info.create_system == 3:
         # external_attr 로부터 st_mode 를 추출한다
@@ -116,101 +303,199 @@ def validate_zip_file(zip_file, max_size=500 * 1024 * 1024):
     total_c = 0 # 총 압축된 파일들 용량
     total_u = 0 # 총 압축 해제된 파일들 용량
     try:
-        with zipfile.ZipFile(zip_file, "r") as zf:
-            infolist_of_files = [i for i in zf.infolist() if not i.is_dir()]
-            names_of_files = []
-            for i in infolist_of_files:
-                if not i.filename.endswith('/'):
-                    tmp_p = i.filename.replace('\\', '/')
-                    names_of_files.append(tmp_p[2:] if tmp_p.startswith("./") else tmp_p)
-            
-            # 1. 비정상적인 path, 과도한 압축률(zip bomb), symlink 여부 확인, 암호화된 압축파일 여부 확인
-            # a) 비정상적인 path 확인
-            if any(_is_abnormal_path(n) for n in names_of_files):
-                return False, "비정상적인 path가 존재합니다."
-            
-            # b) 과도한 압축률(zip bomb), symlink 여부 확인
-            for info in infolist_of_files:
-                # 압축률을 구하기 위해 total_c, total_u 계산
-                total_c += getattr(info, "compress_size", 0)
-                total_u += getattr(info, "file_size", 0)
-                # b) 암호화된 압축파일 여부 확인
-                # 16비트 플래그 필드의 LSB 기준 0번째 비트가 1이면 암호화된 파일
-                if info.flag_bits & 0x1:
-                    return False, "해당 zip 파일은 암호화된 상태입니다."
-                # c) symlink 여부 확인
-                if _is_symlink(info):
-                    return False, "심볼릭 링크를 확인했습니다."
-            
-            # d) 압축률 확인
-            if total_c > 0 and (total_u / total_c) > ZIP_RATIO_CUTOFF:
-                return False, "zip bomb 이 의심되는 파일입니다."
-
-            # 2. 파일 및 폴더 계층 구조 확인
-            # a) index.html 이 루트 경로에 존재하는지 확인
-            index_html_path = next((n for n in names_of_files if n.lower() == "index.html"), None)
-            if not index_html_path:
-                return False, "index.html 파일이 존재하지 않습니다."
-            # b) 루트 경로 외 다른 index.html이 존재하는지 확인
-            if any(n.lower().endswith("/index.html") for n in names_of_files):
-                return False, "루트 폴더가 아닌 다른 경로에 index.html 파일이 존재합니다."
-
-            # c) Build 폴더가 존재하는지 확인
-            build_dir = UNITY_BUILD_DIR_NAME
-            build_files = [n.lower() for n in names_of_files if n.startswith(build_dir)]
-            if not build_files:
-                return False, "Build 폴더가 존재하지 않습니다."
-
-            # d) Build 폴더 내 파일들이 존재하는지 확인
-            is_loader_exist = False
-            is_wasm_exist = False
-            is_framework_exist = False
-            is_data_exist = False
-
-            for f in build_files:
-                if not is_loader_exist and (f.endswith(".loader.js") or f.endswith("unityloader.js")):
-                    is_loader_exist = True
-                if not is_wasm_exist and f.endswith(UNITY_WASM_EXTENSIONS):
-                    is_wasm_exist = True
-                if not is_framework_exist and f.endswith(UNITY_FRAMEWORK_EXTENSIONS):
-                    is_framework_exist = True
-                if not is_data_exist and f.endswith(UNITY_DATA_EXTENSIONS):
-                    is_data_exist = True
-
-            if not is_loader_exist: return False, "*.loader.js 또는 UnityLoader.js 형식의 파일이 존재하지 않습니다."
-            if not is_wasm_exist: return False, "*.wasm[.gz|.br|.unityweb] 형식의 파일이 존재하지 않습니다."
-            if not is_framework_exist: return False, "*.framework.js[.gz|.br|.unityweb] 형식의 파일이 존재하지 않습니다."
-            if not is_data_exist: return False, "*.data[.gz|.br|.unityweb] 형식의 파일이 존재하지 않습니다."
-    
+        # 압축된 파일 내용은 읽지 않고 중앙 디렉터리만 읽어서 검사
+        infolist_of_files = [i for i in read_zip_entries(zip_file) if not i.is_dir()]
+        names_of_files = []
+        for i in infolist_of_files:
+            if not i.filename.endswith('/'):
+                tmp_p = i.filename.replace('\\', '/')
+                names_of_files.append(tmp_p[2:] if tmp_p.startswith("./") else tmp_p)
+        
+        # 1. 비정상적인 path, 과도한 압축률(zip bomb), symlink 여부 확인, 암호화된 압축파일 여부 확인
+        # a) 비정상적인 path 확인
+        if any(_is_abnormal_path(n) for n in names_of_files):
+            return False, "비정상적인 path가 존재합니다."
+        
+        # b) 과도한 압축률(zip bomb), symlink 여부 확인
+        for info in infolist_of_files:
+            # 압축률을 구하기 위해 total_c, total_u 계산
+            total_c += getattr(info, "compress_size", 0)
+            total_u += getattr(info, "file_size", 0)
+            # b) 암호화된 압축파일 여부 확인
+            # 16비트 플래그 필드의 LSB 기준 0번째 비트가 1이면 암호화된 파일
+            if info.flag_bits & 0x1:
+                return False, "해당 zip 파일은 암호화된 상태입니다."
+            # c) symlink 여부 확인
+            if _is_symlink(info):
+                return False, "심볼릭 링크를 확인했습니다."
+        
+        # d) 압축률 확인
+        if total_c > 0 and (total_u / total_c) > ZIP_RATIO_CUTOFF:
+            return False, "zip bomb 이 의심되는 파일입니다."
+
+        # 2. 파일 및 폴더 계층 구조 확인
+        # a) index.html 이 루트 경로에 존재하는지 확인
+        index_html_path = next((n for n in names_of_files if n.lower() == "index.html"), None)
+        if not index_html_path:
+            return False, "index.html 파일이 존재하지 않습니다."
+        # b) 루트 경로 외 다른 index.html이 존재하는지 확인
+        if any(n.lower().endswith("/index.html") for n in names_of_files):
+            return False, "루트 폴더가 아닌 다른 경로에 index.html 파일이 존재합니다."
+
+        # c) Build 폴더가 존재하는지 확인
+        build_dir = UNITY_BUILD_DIR_NAME
+        build_files = [n.lower() for n in names_of_files if n.startswith(build_dir)]
+        if not build_files:
+            return False, "Build 폴더가 존재하지 않습니다."
+
+        # d) Build 폴더 내 파일들이 존재하는지 확인
+        is_loader_exist = False
+        is_wasm_exist = False
+        is_framework_exist = False
+        is_data_exist = False
+
+        for f in build_files:
+            if not is_loader_exist and (f.endswith(".loader.js") or f.endswith("unityloader.js")):
+                is_loader_exist = True
+            if not is_wasm_exist and f.endswith(UNITY_WASM_EXTENSIONS):
+                is_wasm_exist = True
+            if not is_framework_exist and f.endswith(UNITY_FRAMEWORK_EXTENSIONS):
+                is_framework_exist = True
+            if not is_data_exist and f.endswith(UNITY_DATA_EXTENSIONS):
+                is_data_exist = True
+
+        if not is_loader_exist: return False, "*.loader.js 또는 UnityLoader.js 형식의 파일이 존재하지 않습니다."
+        if not is_wasm_exist: return False, "*.wasm[.gz|.br|.unityweb] 형식의 파일이 존재하지 않습니다."
+        if not is_framework_exist: return False, "*.framework.js[.gz|.br|.unityweb] 형식의 파일이 존재하지 않습니다."
+        if not is_data_exist: return False, "*.data[.gz|.br|.unityweb] 형식의 파일이 존재하지 않습니다."
+
     except Exception as e:
         return False, f"zip 파일을 검사하는 중 예외가 발생했습니다. ({e})"
 
     return True, None
 
-def assign_chip_based_on_difficulty(game):
+def select_display_chips(chips):
     """
-    게임에 난이도 칩 부여 (EASY, NORMAL, HARD)
-    난이도 평균을 이용함
+    게임에 부여된 칩 목록에서 카드에 노출할 칩을 골라 반환
+    prefetch 된 칩 목록을 넘기면 추가 쿼리 없이 파이썬에서 선택함
+    """
+    chips = sorted(chips, key=lambda chip: chip.pk)
+    result = []
+
+    # 난이도 칩 하나 선택
+    difficulty_chip = next((chip for chip in chips if chip.name in DIFFICULTY_CHIPS), None)
+    if difficulty_chip:
+        result.append({"id": difficulty_chip.id, "name": difficulty_chip.name})
+
+    # 우선순위 칩 최대 2개 추가
+    for chip_name in PRIORITY_CHIPS:
+        if len(result) >= MAX_DISPLAY_CHIPS:
+            break
+        chip = next((chip for chip in chips if chip.name == chip_name), None)
+        if chip:
+            result.append({"id": chip.id, "name": chip.name})
+
+    return result
+
+
+def refresh_display_chips(games):
+    """
+    게임들의 카드 노출용 칩 스냅샷(display_chips)을 다시 계산하여 저장
+    칩 목록을 한 번에 불러오고 bulk_update로 저장함 (updated_at은 갱신하지 않음)
+    """
+    games = list(games)
+    if not games:
+        return
+    prefetch_related_objects(games, "chip")
+    for game in games:
+        game.display_chips = select_display_chips(game.chip.all())
+    Game.objects.bulk_update(games, ["display_chips"])
+
+
+def build_search_document(game):
+    """
+    게임 검색용 문서 생성 (제목, 제작자 닉네임, 카테고리명)
+    항목 경계를 넘는 검색어가 매칭되지 않도록 줄바꿈으로 구분
     """
-    #게임에 대한 평균 난이도
-    average_difficulty = game.reviews.filter(is_visible=True).aggregate(
-        average_difficulty=Avg('difficulty')
-    )['average_difficulty'] or 0
+    parts = [game.title, game.maker.nickname]
+    parts.extend(category.name for category in game.category.all())
+    return "\n".join(parts).lower()
 
-    easy_chip, _ = Chip.objects.get_or_create(name="EASY")
-    normal_chip, _ = Chip.objects.get_or_create(name="NORMAL")
-    hard_chip, _ = Chip.objects.get_or_create(name="HARD")
 
-    #기존 칩 제거
-    game.chip.remove(easy_chip, normal_chip, hard_chip)
+def refresh_search_documents(games):
+    """
+    게임들의 검색용 문서(search_document)를 다시 계산하여 저장 (updated_at은 갱신하지 않음)
+    """
+    games = list(games)
+    if not games:
+        return
+    prefetch_related_objects(games, "maker", "category")
+    for game in games:
+        game.search_document = build_search_document(game)
+    Game.objects.bulk_update(games, ["search_document"])
 
-    #기준에 맞게 칩 부여
+
+def set_chip_games(chip, game_ids, replace=True):
+    """
+    칩이 부여된 게임 목록을 game_ids로 일괄 변경 (게임-칩 중간 테이블 diff)
+    replace=False 이면 기존 게임은 유지하고 추가만 함
+    칩이 바뀐 게임 id 목록 반환
+    """
+    through = Game.chip.through
+    current_ids = set(through.objects.filter(chip=chip).values_list("game_id", flat=True))
+    game_ids = set(game_ids)
+
+    removed_ids = current_ids - game_ids if replace else set()
+    added_ids = game_ids - current_ids
+    if removed_ids:
+        through.objects.filter(chip=chip, game_id__in=removed_ids).delete()
+    if added_ids:
+        through.objects.bulk_create([through(game_id=game_id, chip=chip) for game_id in added_ids])
+
+    changed_ids = removed_ids | added_ids
+    if changed_ids:
+        # 칩이 바뀐 게임들의 칩 스냅샷 갱신
+        refresh_display_chips(Game.objects.filter(pk__in=changed_ids))
+        invalidate_home_feed_cache()
+    return changed_ids
+
+
+def get_difficulty_chip_name(difficulty_sum, difficulty_cnt):
+    """
+    난이도 평균으로 난이도 칩 이름 결정 (EASY, NORMAL, HARD)
+    """
+    average_difficulty = difficulty_sum / difficulty_cnt if difficulty_cnt else 0
     if average_difficulty < 0.7:
-        game.chip.add(easy_chip)
+        return "EASY"
     elif average_difficulty > 1.3:
-        game.chip.add(hard_chip)
-    else:
-        game.chip.add(normal_chip)
+        return "HARD"
+    return "NORMAL"
+
+
+def assign_chip_based_on_difficulty(game):
+    """
+    게임에 난이도 칩 부여 (EASY, NORMAL, HARD)
+    게임에 저장된 난이도 합계/개수의 평균을 이용함
+    """
+    game.refresh_from_db(fields=["difficulty_sum", "difficulty_cnt"])
+    chip_name = get_difficulty_chip_name(game.difficulty_sum, game.difficulty_cnt)
+
+    # 난이도 칩이 바뀌는 경우에만 칩 교체
+    current_chips = set(game.chip.filter(name__in=DIFFICULTY_CHIPS).values_list("name", flat=True))
+    if current_chips != {chip_name}:
+        difficulty_chips = [Chip.objects.get_or_create(name=name)[0] for name in DIFFICULTY_CHIPS]
+
+        #기존 칩 제거
+        game.chip.remove(*difficulty_chips)
+
+        #기준에 맞게 칩 부여
+        game.chip.add(next(chip for chip in difficulty_chips if chip.name == chip_name))
+
+        # 칩 스냅샷 갱신 (prefetch 캐시가 남아있지 않도록 새로 조회)
+        refresh_display_chips(Game.objects.filter(pk=game.pk))
+
+    # 메인 홈 게임 목록 캐시 무효화 (칩, 별점 변경 반영)
+    invalidate_home_feed_cache()
 
 
 def send_discord_notification(game, msg_text="📢 새로운 게임이 업로드되었습니다! 관리자 계정으로 확인해주세요.\n"):
@@ -4,7 +4,9 @@ import re
 from django.core.files.storage import default_storage
 from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import transaction
+from django.db.models import F
 
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -13,7 +15,7 @@ from rest_framework.permissions import IsAuthenticated, AllowAny  # 로그인 
 from rest_framework import status
 from rest_framework.decorators import permission_classes
 
-from games.pagination import CategoryGamesPagination, ReviewPagination
+from games.pagination import CategoryGamesPagination, CategoryGamesCursorPagination, ReviewPagination, ReviewCursorPagination
 
 from .models import (
     Chip,
@@ -40,12 +42,29 @@ from django.conf import settings
 from openai import OpenAI
 from django.utils import timezone
 from spartagames.utils import std_response
-from spartagames.pagination import ReviewCustomPagination
+from spartagames.pagination import PinnedQuerySets, ReviewCustomPagination, use_cursor_pagination
 import random
 from urllib.parse import urlencode
-from .utils import assign_chip_based_on_difficulty, validate_image, validate_zip_file, send_discord_notification
+from .cache import HOME_FEED_LIMIT_MAX, HOME_FEED_LIMIT_MIN, get_home_feed_sections, invalidate_home_feed_cache, overlay_is_liked
+from . import ranking
+from .events import finish_play, get_pending_playtime, is_game_playable, record_view, start_play
+from .images import delete_image_variants
+from .ratings import apply_game_rating, merge_rating, review_rating
+from .tasks import generate_game_image_variants
+from .uploads import (
+    GameFileUploadError,
+    abort_gamefile_upload,
+    complete_gamefile_upload,
+    get_completed_gamefile,
+    get_gamefile_upload,
+    initiate_gamefile_upload,
+    list_gamefile_parts,
+    release_gamefile_upload,
+    sign_gamefile_parts,
+)
+from .utils import assign_chip_based_on_difficulty, refresh_display_chips, refresh_search_documents, validate_image, validate_images, validate_zip_file, send_discord_notification
 from commons.models import Notification
-from commons.utils import NotificationSubType, create_notification
+from commons.utils import NotificationSubType, queue_notifications
 
 
 class GameListAPIView(APIView):
@@ -67,8 +86,12 @@ class GameListAPIView(APIView):
 
     def get(self, request):
         order = request.query_params.get('order')
-        new_game_chip = Chip.objects.filter(name="New Game").first()
-        limit = int(request.query_params.get('limit', 4))
+        try:
+            limit = int(request.query_params.get('limit', 4))
+        except (TypeError, ValueError):
+            limit = None
+        if limit is None or not HOME_FEED_LIMIT_MIN <= limit <= HOME_FEED_LIMIT_MAX:
+            return std_response(message=f"limit는 {HOME_FEED_LIMIT_MIN}~{HOME_FEED_LIMIT_MAX} 사이의 숫자여야 합니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
         categories = list(GameCategory.objects.all().values_list('name',flat=True))
         if not categories:
             return std_response(message="카테고리가 존재하지 않는다. 카테고리 생성이 필요하다", status="fail", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
@@ -77,16 +100,18 @@ class GameListAPIView(APIView):
             return std_response(message="카테고리가 2개 이하입니다. 카테고리가 최소 3개 필요합니다.", status="fail", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
             #return Response({"message": "카테고리가 2개 이하입니다. 카테고리가 최소 3개 필요합니다."}, status=status.HTTP_404_NOT_FOUND)
         selected_categories = random.sample(categories, 3)
-        
-        rand1 = Game.objects.filter(is_visible=True, register_state=1,category__name=selected_categories[0]).order_by('-created_at')[:limit]
-        rand2 = Game.objects.filter(is_visible=True, register_state=1,category__name=selected_categories[1]).order_by('-created_at')[:limit]
-        rand3 = Game.objects.filter(is_visible=True, register_state=1,category__name=selected_categories[2]).order_by('-created_at')[:limit]
-        favorites = Game.objects.filter(chip__name="Daily Top",is_visible=True, register_state=1).order_by('-created_at')[:limit]
-        updated_games = Game.objects.filter(is_visible=True, register_state=1).order_by('-updated_at')[:limit]
-        if new_game_chip:
-            recent_games = Game.objects.filter(chip=new_game_chip, is_visible=True, register_state=1).order_by('-created_at')[:limit]
-        else:
-            recent_games = Game.objects.none()  # new_game 칩이 없으면 빈 QuerySet
+
+        visible_games = Game.objects.filter(is_visible=True, register_state=1)
+
+        # 섹션별 게임 목록 쿼리 (캐시에 없는 섹션만 실행됨)
+        sections = {
+            f"category:{name}": (lambda name=name: visible_games.filter(category__name=name).order_by('-created_at')[:limit])
+            for name in selected_categories
+        }
+        sections["trending_games"] = lambda: visible_games.filter(chip__name="Daily Top").order_by('-created_at')[:limit]
+        sections["updated"] = lambda: visible_games.order_by('-updated_at')[:limit]
+        # new_game 칩이 없으면 빈 목록
+        sections["recent"] = lambda: visible_games.filter(chip__name="New Game").order_by('-created_at')[:limit]
 
         # 2024-12-30 FE 요청으로 games/api/list 에서 게임팩 삭제, users/api/<int:user_pk>/gamepacks/ 로 이관
         # # 유저 존재 시 my_game_pack 추가
@@ -123,31 +148,27 @@ class GameListAPIView(APIView):
         else:
             rows = rows.order_by('-created_at') """
 
-        # 시리얼라이저 및 데이터 확인
-        serializer = GameListSerializer(rand1, many=True, context={'user': request.user})
-        serializer2 = GameListSerializer(rand2, many=True, context={'user': request.user})
-        serializer3 = GameListSerializer(rand3, many=True, context={'user': request.user})
-        favorite_serializer = GameListSerializer(favorites, many=True, context={'user': request.user}).data if favorites.exists() else []
-        recent_serializer = GameListSerializer(recent_games, many=True, context={'user': request.user}).data if recent_games.exists() else []
-        updated_serializer = GameListSerializer(updated_games, many=True, context={'user': request.user}).data if updated_games.exists() else []
+        # 섹션별 카드 목록은 캐시(유저 무관)에서 가져오고, 즐겨찾기 여부만 한 번의 쿼리로 덮어씀
+        game_lists = get_home_feed_sections(sections, limit)
+        overlay_is_liked(game_lists.values(), request.user)
 
         # 응답 데이터 구성
         data = {
             "rand1": {
                 "category_name": selected_categories[0],
-                "game_list": serializer.data if rand1.exists() else []
+                "game_list": game_lists[f"category:{selected_categories[0]}"]
             },
             "rand2": {
                 "category_name": selected_categories[1],
-                "game_list": serializer2.data if rand2.exists() else []
+                "game_list": game_lists[f"category:{selected_categories[1]}"]
             },
             "rand3": {
                 "category_name": selected_categories[2],
-                "game_list": serializer3.data if rand3.exists() else []
+                "game_list": game_lists[f"category:{selected_categories[2]}"]
             },
-            "trending_games": favorite_serializer,
-            "recent": recent_serializer,
-            "updated": updated_serializer,
+            "trending_games": game_lists["trending_games"],
+            "recent": game_lists["recent"],
+            "updated": game_lists["updated"],
         }
         # 2024-12-30 FE 요청으로 games/api/list 에서 게임팩 삭제, users/api/<int:user_pk>/gamepacks/ 로 이관
         # if request.user.is_authenticated:
@@ -164,6 +185,10 @@ class GameListAPIView(APIView):
         # 필수 항목 확인
         required_fields = ["title", "category", "content", "gamefile","thumbnail"]
         missing_fields = [field for field in required_fields if not request.data.get(field)]
+        # S3에 직접 업로드한 게임 파일은 gamefile 대신 gamefile_upload_id 로 전달
+        gamefile_upload_id = request.data.get("gamefile_upload_id")
+        if gamefile_upload_id:
+            missing_fields = [field for field in missing_fields if field != "gamefile"]
 
         # 누락된 필수 항목이 있을 경우 에러 메시지 반환
         if missing_fields:
@@ -182,19 +207,24 @@ class GameListAPIView(APIView):
 
         # 스크린샷 검증
         screenshots = request.FILES.getlist("new_screenshots")
-        for screenshot in screenshots:
-            is_valid, error_msg = validate_image(screenshot)
-            if not is_valid:
-                return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
-                #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
-
-        # ZIP 파일 검증
-        gamefile = request.FILES.get("gamefile")
-        is_valid, error_msg = validate_zip_file(gamefile)
+        is_valid, error_msg = validate_images(screenshots)
         if not is_valid:
             return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
             #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
 
+        # ZIP 파일 검증
+        if gamefile_upload_id:
+            # S3 직접 업로드는 업로드 완료 시 검증함
+            gamefile = get_completed_gamefile(request.user, gamefile_upload_id)
+            if not gamefile:
+                return std_response(message="업로드가 완료된 게임 파일을 찾을 수 없습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+        else:
+            gamefile = request.FILES.get("gamefile")
+            is_valid, error_msg = validate_zip_file(gamefile)
+            if not is_valid:
+                return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+                #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
+
         # 카테고리 이름 가져오기
         category_name = request.data.get('category')
         if not category_name:
@@ -217,10 +247,15 @@ class GameListAPIView(APIView):
             star=0,
             review_cnt=0,
         )
+        if gamefile_upload_id:
+            release_gamefile_upload(gamefile_upload_id)
 
         # 카테고리 하나만 설정
         game.category.set([category])
 
+        # 검색용 문서 저장
+        refresh_search_documents([game])
+
         new_game_chip, created = Chip.objects.get_or_create(name="New Game")
         game.chip.add(new_game_chip)
 
@@ -228,10 +263,16 @@ class GameListAPIView(APIView):
         normal_chip, _ = Chip.objects.get_or_create(name="NORMAL")
         game.chip.add(normal_chip)
 
+        # 카드 노출용 칩 스냅샷 저장
+        refresh_display_chips([game])
+
         # 이후 Screenshot model에 저장
         for item in screenshots:
             scrfeenshot=Screenshot.objects.create(src=item, game=game)
 
+        # 썸네일, 스크린샷 WebP 변환본 생성 (변환 전까지는 원본 사용)
+        transaction.on_commit(lambda: generate_game_image_variants.delay(game.id))
+
         # 게임 등록 로그에 데이터 추가
         game.logs_game.create(
             recoder = request.user,
@@ -244,8 +285,8 @@ class GameListAPIView(APIView):
         send_discord_notification(game)
 
         # 페이지 알림
-        notif = create_notification(
-            user=request.user,
+        queue_notifications(
+            users=[request.user],
             noti_type=Notification.NotificationType.GAME_UPLOAD,
             noti_sub_type=NotificationSubType.REGISTER_REQUEST,
             related_object=game,
@@ -262,28 +303,29 @@ def game_list_search(request):
     keyword = request.query_params.get('keyword')
 
     # 기본 필터 조건
-    query = Q(is_visible=True, register_state=1)
+    games = Game.objects.filter(is_visible=True, register_state=1)
 
     # 키워드 조건 추가
+    # 제목, 카테고리명, 제작자 닉네임을 합친 검색용 문서(search_document)에서 trigram 인덱스로 검색
+    # 검색어와의 유사도 순으로 정렬 (유사도가 같으면 최신순)
     if keyword:
-        query &= Q(
-            Q(category__name__icontains=keyword) |
-            Q(title__icontains=keyword) |
-            Q(maker__nickname__icontains=keyword)
-        )
-
-    # 게임 목록 필터링
-    games = Game.objects.filter(query).distinct().order_by('-created_at')
+        keyword = keyword.lower()
+        games = games.filter(search_document__contains=keyword).annotate(
+            rank=TrigramSimilarity('search_document', keyword)
+        ).order_by('-rank', '-created_at')
+    else:
+        games = games.order_by('-created_at')
 
     # 즐겨찾기 분리
-    favorite_games = []
+    favorite_games = Game.objects.none()
     if request.user.is_authenticated:
-        favorite_games = games.filter(likes__user=request.user)
-        favorite_cnt=len(favorite_games)
-        if favorite_games:
-            games = games.exclude(pk__in=favorite_games.values_list('pk', flat=True))
-    all_games = list(favorite_games) + list(games)
-    if all_games==[]:
+        liked_game_ids = Like.objects.filter(user=request.user).values('game_id')
+        favorite_games = games.filter(pk__in=liked_game_ids)
+        games = games.exclude(pk__in=liked_game_ids)
+
+    # 즐겨찾기 게임을 먼저, 나머지 게임을 이어서 페이지네이션 (현재 페이지 구간만 조회)
+    all_games = PinnedQuerySets(favorite_games, games)
+    if not all_games.count():
         return std_response(message="검색한 게임이 없습니다.", status="fail", error_code="SERVER_FAIL", status_code=status.HTTP_404_NOT_FOUND)
         #return Response({"message": "게임이 없습니다."}, status=404)
     # 페이지네이션 처리
@@ -297,14 +339,14 @@ def game_list_search(request):
     response_data = paginator.get_paginated_response(game_serializer.data).data
 
     # 1페이지일 경우 즐겨찾기 게임 추가
+    response_data["results"]["favorite_games"] = []
     if request.user.is_authenticated:
-        if paginator.page.number == 1 and favorite_games.exists():
-            all_games=response_data["results"]["all_games"]
-            list_of_games=[]
-            for i in range(favorite_cnt):
-                list_of_games.append(all_games.pop(i))
-                all_games.insert(0,{})
-            response_data["results"]["favorite_games"]=list_of_games
+        if paginator.page.number == 1 and all_games.pinned_count():
+            page_games=response_data["results"]["all_games"]
+            # 1페이지에 포함된 즐겨찾기 게임을 분리하고 그 자리는 빈 값으로 채움
+            favorite_cnt=min(all_games.pinned_count(), len(page_games))
+            response_data["results"]["favorite_games"]=page_games[:favorite_cnt]
+            response_data["results"]["all_games"]=[{}]*favorite_cnt + page_games[favorite_cnt:]
     # 응답 구성용 딕셔너리
     data_response = {
         "all_games": response_data["results"]["all_games"]
@@ -355,8 +397,11 @@ def category_games_list(request):
         #    status=404  # Not Found
         #)
     
-    # 페이지네이션 적용
-    paginator = CategoryGamesPagination()
+    # 페이지네이션 적용 (?pagination=cursor 인 경우 (created_at, id) 키셋 페이지네이션)
+    if use_cursor_pagination(request):
+        paginator = CategoryGamesCursorPagination()
+    else:
+        paginator = CategoryGamesPagination()
     paginated_games = paginator.paginate_queryset(games, request)
     serializer = GameListSerializer(paginated_games, many=True, context={'user': request.user})
     data=paginator.get_paginated_response(serializer.data).data
@@ -367,6 +412,17 @@ def category_games_list(request):
     #return paginator.get_paginated_response(serializer.data)
 
 
+# 게임 수정 시 변경 항목별로 저장할 필드
+GAME_UPDATE_FIELDS = {
+    "gamefile": ["gamefile", "register_state"],
+    # 썸네일이 바뀐 경우에만 변환본 초기화 저장 (그 외에는 변환 작업이 저장한 값을 덮어쓰지 않음)
+    "thumbnail": ["thumbnail", "thumbnail_variants"],
+    "title": ["title"],
+    "youtube_url": ["youtube_url"],
+    "content": ["content"],
+}
+
+
 class GameDetailAPIView(APIView):
     """
     포스트일 때 로그인 인증을 위한 함수
@@ -396,6 +452,10 @@ class GameDetailAPIView(APIView):
         # game이 Response라면 바로 반환
         if isinstance(game, Response):
             return game
+        # 조회 기록 (Redis 버퍼에 쌓고 flush_game_events 에서 일괄 저장)
+        if request.user.is_authenticated:
+            record_view(request.user.pk, game.pk)
+
         serializer = GameDetailSerializer(game, context={'user': request.user})
         # data에 serializer.data를 assignment
         # serializer.data의 리턴값인 ReturnDict는 불변객체이다
@@ -431,10 +491,19 @@ class GameDetailAPIView(APIView):
 
         # 게임 파일 검증 및 변경 처리
         gamefile = request.FILES.get("gamefile")
+        # S3에 직접 업로드한 게임 파일은 gamefile 대신 gamefile_upload_id 로 전달
+        gamefile_upload_id = request.data.get("gamefile_upload_id")
         if game.register_state == 2:
-            if not gamefile:
+            if not gamefile and not gamefile_upload_id:
                 return std_response(message="수정한 게임 파일을 올려주세요.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
-        if gamefile:
+        if gamefile_upload_id:
+            gamefile = get_completed_gamefile(request.user, gamefile_upload_id)
+            if not gamefile:
+                return std_response(message="업로드가 완료된 게임 파일을 찾을 수 없습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+            game.register_state = 0
+            game.gamefile = gamefile
+            changes.append("gamefile")
+        elif gamefile:
             is_valid, error_msg = validate_zip_file(gamefile)
             if not is_valid:
                 return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
@@ -453,8 +522,10 @@ class GameDetailAPIView(APIView):
             if thumbnail != game.thumbnail:
                 # 기존 파일 s3에서 삭제
                 default_storage.delete(game.thumbnail.name)
+                delete_image_variants(default_storage, game.thumbnail_variants)
                 # request로 받은 파일로 교체
                 game.thumbnail = thumbnail
+                game.thumbnail_variants = {}
                 changes.append("thumbnail")
 
         # 필드 업데이트 (값이 변경되었는지 확인)
@@ -473,7 +544,13 @@ class GameDetailAPIView(APIView):
             game.content = content
             changes.append("content")
 
-        game.save()
+        # 수정한 필드만 저장 (동시에 갱신되는 별점/리뷰 수 등 집계 필드를 덮어쓰지 않도록)
+        update_fields = ["updated_at"]
+        for field in changes:
+            update_fields += GAME_UPDATE_FIELDS[field]
+        game.save(update_fields=update_fields)
+        if gamefile_upload_id:
+            release_gamefile_upload(gamefile_upload_id)
 
         # 카테고리 변경 처리 (1개만 허용)
         category_name = request.data.get("category")
@@ -492,20 +569,24 @@ class GameDetailAPIView(APIView):
         old_screenshots = [int(pk) for pk in old_screenshots]
         for item in Screenshot.objects.filter(game=game).exclude(pk__in=old_screenshots):
             default_storage.delete(item.src.name)
+            delete_image_variants(default_storage, item.variants)
             item.delete()
 
         # 새로운 스크린샷 업로드
         # 스크린샷 검증
         screenshots = self.request.FILES.getlist("new_screenshots")
-        for screenshot in screenshots:
-            is_valid, error_msg = validate_image(screenshot)
-            if not is_valid:
-                return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
-                #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
+        is_valid, error_msg = validate_images(screenshots)
+        if not is_valid:
+            return std_response(message=error_msg, status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+            #return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
         # 데이터 추가
         for item in screenshots:
             screenshot = Screenshot.objects.create(src=item, game=game)
 
+        # 썸네일, 스크린샷 WebP 변환본 생성 (변환 전까지는 원본 사용)
+        if "thumbnail" in changes or screenshots:
+            transaction.on_commit(lambda: generate_game_image_variants.delay(game.id))
+
         # 게임 파일 수정인 경우 게임 등록 로그에 데이터 추가
         if changes:
             if "gamefile" in changes:
@@ -519,12 +600,19 @@ class GameDetailAPIView(APIView):
                 content=log_content,
             )
         
+        # 제목, 카테고리 변경 시 검색용 문서 갱신
+        if "title" in changes or "category" in changes:
+            refresh_search_documents([game])
+
+        # 메인 홈 게임 목록 캐시 무효화
+        invalidate_home_feed_cache()
+
         # register_state 가 0인 경우(검수 대기로 변경) 디스코드 알림, 페이지 알림
         if game.register_state == 0:
             send_discord_notification(game, msg_text=f"📢 게임 파일 수정 후 검수 요청이 들어왔습니다! 관리자 계정으로 확인해주세요.\n")
             
-            notif = create_notification(
-                user=request.user,
+            queue_notifications(
+                users=[request.user],
                 noti_type=Notification.NotificationType.GAME_UPLOAD,
                 noti_sub_type=NotificationSubType.REGISTER_REQUEST,
                 related_object=game,
@@ -545,7 +633,10 @@ class GameDetailAPIView(APIView):
         # 작성한 유저이거나 관리자일 경우 동작함
         if game.maker == request.user or request.user.is_staff == True:
             game.is_visible = False
-            game.save()
+            game.save(update_fields=["is_visible", "updated_at"])
+
+            # 메인 홈 게임 목록 캐시 무효화
+            invalidate_home_feed_cache()
             
             # 게임 삭제 시 게임 등록 로그에 데이터 추가
             game.logs_game.create(
@@ -561,6 +652,114 @@ class GameDetailAPIView(APIView):
             #return Response({"error": "작성자가 아닙니다"}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class GameFileUploadAPIView(APIView):
+    """
+    게임 zip 파일 S3 직접 업로드 시작
+    응답으로 받은 upload_id로 part 업로드 url을 발급받아 S3에 바로 업로드한 뒤 완료 요청을 보냄
+    완료된 upload_id를 게임 등록/수정 요청의 gamefile_upload_id 로 전달
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        filename = request.data.get("filename")
+        try:
+            size = int(request.data.get("size"))
+        except (TypeError, ValueError):
+            return std_response(message="파일 크기가 올바르지 않습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            upload = initiate_gamefile_upload(request.user, filename, size)
+        except GameFileUploadError as e:
+            return std_response(message=str(e), status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+
+        data = {
+            "upload_id": upload["upload_id"],
+            "part_size": upload["part_size"],
+            "part_count": upload["part_count"],
+        }
+        return std_response(data=data, message="게임 파일 업로드를 시작했습니다.", status="success", status_code=status.HTTP_201_CREATED)
+
+
+class GameFileUploadDetailAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get_upload(self, request, upload_id):
+        upload = get_gamefile_upload(request.user, upload_id)
+        if upload is None:
+            return std_response(message="업로드 정보를 찾을 수 없습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_404_NOT_FOUND)
+        return upload
+
+    """
+    업로드가 끝난 part 목록 조회 (이어서 업로드)
+    """
+
+    def get(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if isinstance(upload, Response):
+            return upload
+
+        data = {
+            "upload_id": upload["upload_id"],
+            "part_size": upload["part_size"],
+            "part_count": upload["part_count"],
+            "completed": upload["completed"],
+            "parts": [] if upload["completed"] else list_gamefile_parts(upload),
+        }
+        return std_response(data=data, message="업로드 정보를 불러왔습니다.", status="success", status_code=status.HTTP_200_OK)
+
+    """
+    업로드 취소
+    """
+
+    def delete(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if isinstance(upload, Response):
+            return upload
+
+        abort_gamefile_upload(upload)
+        return std_response(message="게임 파일 업로드를 취소했습니다.", status="success", status_code=status.HTTP_200_OK)
+
+
+class GameFileUploadPartAPIView(GameFileUploadDetailAPIView):
+    """
+    part 업로드용 presigned url 발급
+    """
+
+    def post(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if isinstance(upload, Response):
+            return upload
+
+        try:
+            part_numbers = [int(number) for number in request.data.get("part_numbers") or []]
+            urls = sign_gamefile_parts(upload, part_numbers)
+        except (TypeError, ValueError):
+            return std_response(message="part 번호가 올바르지 않습니다.", status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+        except GameFileUploadError as e:
+            return std_response(message=str(e), status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+
+        data = [{"part_number": number, "upload_url": url} for number, url in urls.items()]
+        return std_response(data=data, message="part 업로드 url을 발급했습니다.", status="success", status_code=status.HTTP_200_OK)
+
+
+class GameFileUploadCompleteAPIView(GameFileUploadDetailAPIView):
+    """
+    업로드 완료 및 zip 파일 검증
+    """
+
+    def post(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if isinstance(upload, Response):
+            return upload
+
+        try:
+            complete_gamefile_upload(upload, request.data.get("parts") or [])
+        except GameFileUploadError as e:
+            return std_response(message=str(e), status="fail", error_code="CLIENT_FAIL", status_code=status.HTTP_400_BAD_REQUEST)
+
+        return std_response(data={"upload_id": upload["upload_id"]}, message="게임 파일 업로드가 완료되었습니다.", status="success", status_code=status.HTTP_200_OK)
+
+
 # @api_view(['POST', 'PUT'])
 # @permission_classes([IsAuthenticated])
 # def manage_screenshots(request, game_pk):
@@ -608,11 +807,13 @@ class GameLikeAPIView(APIView):
         if like_instance:
             # 수정
             like_instance.delete()
+            ranking.incr_total("likes", game.pk, -1)
             return std_response(message="즐겨찾기 취소", status="success", status_code=status.HTTP_200_OK)
             #return Response({'message': "즐겨찾기 취소"}, status=status.HTTP_200_OK)
         else:
             # 생성
             Like.objects.create(user=request.user, game=game)
+            ranking.incr_total("likes", game.pk)
             return std_response(message="즐겨찾기", status="success", status_code=status.HTTP_200_OK)
             #return Response({'message': "즐겨찾기"}, status=status.HTTP_200_OK)
 
@@ -667,16 +868,41 @@ class ReviewAPIView(APIView):
                 my_review={}
 
         # 정렬 조건 적용
+        # 좋아요/싫어요 수는 Review에 저장된 값 사용 (게임별 정렬 인덱스)
         if order == 'likes':
-            reviews = reviews.annotate(
-                like_count=Count('reviews', filter=Q(reviews__is_like=1))
-            ).order_by('-like_count', '-created_at')
+            ordering = ('-like_count', '-created_at', '-id')
         elif order == 'dislikes':
-            reviews = reviews.annotate(
-                dislike_count=Count('reviews', filter=Q(reviews__is_like=2))
-            ).order_by('-dislike_count', '-created_at')
+            ordering = ('-dislike_count', '-created_at', '-id')
         else:
-            reviews = reviews.order_by('-created_at')  # 최신순
+            ordering = ('-created_at', '-id')  # 최신순
+        reviews = reviews.order_by(*ordering)
+
+        # 커서 모드 (?pagination=cursor)
+        # 내 리뷰는 첫 페이지에만 따로 내려주고, 나머지 리뷰는 정렬 기준 + id 키셋으로 페이지네이션
+        if use_cursor_pagination(request):
+            paginator = ReviewCursorPagination()
+            paginator.ordering = ordering
+            paginated_reviews = paginator.paginate_queryset(reviews, request, self)
+            serializer = ReviewSerializer(paginated_reviews, many=True, context={'user': request.user})
+            response_data = paginator.get_paginated_response(serializer.data).data
+            # 첫 페이지 여부는 커서 유무가 아니라 이전 페이지 존재 여부로 판단 (이전 페이지 커서로 돌아온 경우 포함)
+            if not paginator.has_previous:
+                all_reviews = response_data["results"]["all_reviews"]
+                if my_review:
+                    response_data["results"]["my_review"] = ReviewSerializer(my_review, context={'user': request.user}).data
+                    response_data["count"] += 1
+                else:
+                    all_reviews.insert(0, {})
+            return std_response(
+                data=response_data["results"],
+                status="success",
+                pagination={
+                    "count": response_data["count"],
+                    "next": response_data["next"],
+                    "previous": response_data["previous"],
+                },
+                status_code=status.HTTP_200_OK
+            )
 
         empty_review_placeholder = {
             "id": None,
@@ -780,15 +1006,16 @@ class ReviewAPIView(APIView):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 error_code="CLIENT_FAIL"
             )
-        game.star = game.star + ((star - game.star) / (game.review_cnt + 1))
-        game.review_cnt = game.review_cnt + 1
-        game.save()
 
         serializer = ReviewSerializer(
             data=request.data, context={'user': request.user})
         if serializer.is_valid(raise_exception=True):
-            serializer.save(author=request.user, game=game)  # 데이터베이스에 저장
+            # 리뷰 저장과 게임 별점/난이도 집계를 한 트랜잭션에서 처리
+            with transaction.atomic():
+                review = serializer.save(author=request.user, game=game)  # 데이터베이스에 저장
+                apply_game_rating(game.pk, review_rating(review.star, review.difficulty))
             assign_chip_based_on_difficulty(game)
+            ranking.incr_daily("reviews", {game.pk: 1})
             # return Response(serializer.data, status=status.HTTP_201_CREATED)
             return std_response(
                 data=serializer.data,
@@ -872,12 +1099,26 @@ class ReviewDetailAPIView(APIView):
                     status_code=status.HTTP_404_NOT_FOUND,
                     error_code="CLIENT_FAIL"
                     )
-            game.star = game.star + ((star - request.data.get('pre_star')) / (game.review_cnt))
-            game.save()
             serializer = ReviewSerializer(
                 review, data=request.data, partial=True, context={'user': request.user})
             if serializer.is_valid(raise_exception=True):
-                serializer.save()
+                # 이전 별점/난이도는 클라이언트 값(pre_star) 대신 잠근 리뷰 행에서 읽음
+                with transaction.atomic():
+                    # 조회 후 잠그기 전에 삭제(숨김)된 리뷰는 수정하지 않음 (집계에서 이미 빠졌으므로)
+                    locked_review = Review.objects.select_for_update().filter(pk=review.pk, is_visible=True).first()
+                    if locked_review is None:
+                        return std_response(
+                            message="리뷰가 존재하지 않습니다.",
+                            status="fail",
+                            status_code=status.HTTP_404_NOT_FOUND,
+                            error_code="SERVER_FAIL"
+                        )
+                    previous_rating = review_rating(locked_review.star, locked_review.difficulty, sign=-1)
+                    serializer.instance = locked_review
+                    review = serializer.save()
+                    apply_game_rating(review.game_id, merge_rating(
+                        previous_rating, review_rating(review.star, review.difficulty),
+                    ))
                 assign_chip_based_on_difficulty(review.game)
                 # return Response(serializer.data, status=status.HTTP_200_OK)
                 return std_response(
@@ -931,16 +1172,16 @@ class ReviewDetailAPIView(APIView):
                     status_code=status.HTTP_404_NOT_FOUND,
                     error_code="SERVER_FAIL"
                     )
-            if game.review_cnt > 1:
-                game.star = game.star + \
-                    ((game.star-review.star)/(game.review_cnt-1))
-            else:
-                game.star = 0
-            game.review_cnt = game.review_cnt-1
-            game.save()
-            review.is_visible = False
-            review.save()
-            assign_chip_based_on_difficulty(review.game)
+            # 리뷰 숨김 처리와 게임 별점/난이도 집계를 한 트랜잭션에서 처리
+            with transaction.atomic():
+                # 동시에 삭제 요청이 들어와도 한 번만 집계에서 빠지도록 잠근 뒤 다시 확인
+                review = Review.objects.select_for_update().filter(pk=review.pk, is_visible=True).first()
+                if review:
+                    review.is_visible = False
+                    review.save()
+                    apply_game_rating(review.game_id, review_rating(review.star, review.difficulty, sign=-1))
+            if review:
+                assign_chip_based_on_difficulty(review.game)
             # return Response({"message": "삭제를 완료했습니다"}, status=status.HTTP_200_OK)
             return std_response(
                 message="삭제를 완료했습니다",
@@ -976,27 +1217,40 @@ def toggle_review_like(request, review_id):
             status_code=status.HTTP_404_NOT_FOUND,
             error_code="SERVER_FAIL"
         )
-    # ReviewsLike 객체를 가져오거나 새로 생성
-    # get_or_create 리턴: review_like - ReviewsLike 객체(행), _ - 행 생성 여부
-    review_like, _ = ReviewsLike.objects.get_or_create(
-        user=user, review=review)
-
-    # 요청에서 받은 'action'에 따라 상태 변경
-    action = request.data.get('action', None)
-    if action == 'like':
-        if review_like.is_like != 1:  # 현재 상태가 'like'가 아니면 'like'로 변경
-            review_like.is_like = 1
-        else:
-            # 이미 'like' 상태일 경우 'no state'로 전환
-            review_like.is_like = 0
-    elif action == 'dislike':
-        if review_like.is_like != 2:  # 현재 상태가 'dislike'가 아니면 'dislike'로 변경
-            review_like.is_like = 2
-        else:
-            # 이미 'dislike' 상태일 경우 'no state'로 전환
-            review_like.is_like = 0
-
-    review_like.save()  # 변경 사항 저장
+    with transaction.atomic():
+        # ReviewsLike 객체를 가져오거나 새로 생성
+        # get_or_create 리턴: review_like - ReviewsLike 객체(행), _ - 행 생성 여부
+        review_like, _ = ReviewsLike.objects.get_or_create(
+            user=user, review=review)
+        # 동시에 같은 요청이 들어와도 카운트가 어긋나지 않도록 행 잠금 후 현재 상태 다시 조회
+        review_like = ReviewsLike.objects.select_for_update().get(pk=review_like.pk)
+        previous_state = review_like.is_like
+
+        # 요청에서 받은 'action'에 따라 상태 변경
+        action = request.data.get('action', None)
+        if action == 'like':
+            if review_like.is_like != 1:  # 현재 상태가 'like'가 아니면 'like'로 변경
+                review_like.is_like = 1
+            else:
+                # 이미 'like' 상태일 경우 'no state'로 전환
+                review_like.is_like = 0
+        elif action == 'dislike':
+            if review_like.is_like != 2:  # 현재 상태가 'dislike'가 아니면 'dislike'로 변경
+                review_like.is_like = 2
+            else:
+                # 이미 'dislike' 상태일 경우 'no state'로 전환
+                review_like.is_like = 0
+
+        review_like.save()  # 변경 사항 저장
+
+        # 리뷰의 좋아요/싫어요 수를 DB에서 증감
+        counters = {}
+        for state, field in ((1, 'like_count'), (2, 'dislike_count')):
+            delta = (review_like.is_like == state) - (previous_state == state)
+            if delta:
+                counters[field] = F(field) + delta
+        if counters:
+            Review.objects.filter(pk=review.pk).update(**counters)
     # return Response({"message": f"리뷰(id: {review_id})에 {review_like.is_like} 동작을 수행했습니다."}, status=status.HTTP_200_OK)
     return std_response(
         message=f"리뷰(id: {review_id})에 {review_like.is_like} 동작을 수행했습니다.",
@@ -1063,7 +1317,10 @@ class CategoryAPIView(APIView):
                 status_code=status.HTTP_404_NOT_FOUND,
                 error_code="SERVER_FAIL"
                 )
+        # 삭제할 카테고리에 속한 게임들은 카테고리 삭제 후 검색용 문서 갱신
+        game_ids = list(category.games.values_list('pk', flat=True))
         category.delete()
+        refresh_search_documents(Game.objects.filter(pk__in=game_ids))
         # return Response({"message": "삭제를 완료했습니다"}, status=status.HTTP_200_OK)
         return std_response(
             message="삭제를 완료했습니다",
@@ -1083,22 +1340,9 @@ class GamePlaytimeAPIView(APIView):
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 error_code="CLIENT_FAIL"
             )
-        if Game.objects.filter(pk=game_id, is_visible=True).exists():
-            try:
-                game = Game.objects.get(pk=game_id, is_visible=True)
-            except:
-                return std_response(
-                    message="게임이 존재하지 않습니다.",
-                    status="error",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    error_code="SERVER_FAIL"
-                    )
-            playtime = PlayLog.objects.create(
-                user=request.user,
-                game=game,
-                start_at=timezone.now()  # 현재 시간으로 start_time
-            )
-            playtime_id = playtime.pk
+        if is_game_playable(game_id):
+            # 플레이 시작 시각은 Redis에 저장하고 토큰을 playtime_id로 반환 (DB 저장은 종료 시 일괄 처리)
+            playtime_id = start_play(request.user.pk, game_id)
             # return Response({"message": "게임 플레이 시작시간 기록을 성공했습니다.", "playtime_id":playtime_id}, status=status.HTTP_200_OK)
             return std_response(
                 data={
@@ -1122,50 +1366,36 @@ class GamePlaytimeAPIView(APIView):
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 error_code="CLIENT_FAIL"
             )
-        if Game.objects.filter(pk=game_id, is_visible=True).exists():
-            # game=get_object_or_404(Game, pk=game_id, is_visible=True)
-            try:
-                game = Game.objects.get(pk=game_id, is_visible=True)
-            except:
-                return std_response(
-                    message="게임이 존재하지 않습니다.",
-                    status="error",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    error_code="SERVER_FAIL"
-                    )
-            # playlog = get_object_or_404(PlayLog, pk=request.data.get("playtime_id"))
-            try:
-                playlog = PlayLog.objects.get(pk=request.data.get("playtime_id"))
-            except:
+        if is_game_playable(game_id):
+            playtime_id = request.data.get("playtime_id")
+
+            # 배포 이전에 시작한 플레이는 DB의 PlayLog 로 처리
+            if str(playtime_id).isdigit():
+                return self.finish_legacy_playlog(request, game_id, playtime_id)
+
+            # 플레이 종료 이벤트를 버퍼에 기록 (PlayLog, TotalPlayTime은 flush_game_events 에서 일괄 저장)
+            play = finish_play(str(playtime_id), request.user.pk, game_id)
+            if play is None:
                 return std_response(
                     message="로그가 존재하지 않습니다.",
                     status="error",
                     status_code=status.HTTP_404_NOT_FOUND,
                     error_code="SERVER_FAIL"
                     )
-            totalplaytime,_ = TotalPlayTime.objects.get_or_create(user=request.user, game=game)
-
-            playlog.end_at = timezone.now()  # 현재 시간으로 end_time
-            totalplaytime.latest_at = timezone.now()
-
-            totaltime = (playlog.end_at - playlog.start_at).total_seconds()
-            playlog.playtime = totaltime  # playtime_seconds로 playtime_seconds 계산
-            totalplaytime.totaltime = totalplaytime.totaltime + totaltime
-
-            playlog.save()
-            totalplaytime.save()
-            # return Response({"message": "게임 플레이 종료시간 기록을 성공했습니다.", 
-            #                 "start_time":playlog.start_at,
-            #                 "end_time":playlog.end_at,
-            #                 "playtime": playlog.playtime,
-            #                 "totalplaytime":totalplaytime.totaltime}
-            #                 , status=status.HTTP_200_OK)
+            start_at, end_at, playtime = play
+
+            # 누적 플레이 시간 = DB에 반영된 시간 + 아직 반영되지 않은 시간
+            totaltime = TotalPlayTime.objects.filter(
+                user=request.user, game_id=game_id
+            ).values_list('totaltime', flat=True).first() or 0
+            totaltime += get_pending_playtime(request.user.pk, game_id)
+
             return std_response(
                 data={
-                    "start_time":playlog.start_at,
-                    "end_time":playlog.end_at,
-                    "playtime": playlog.playtime,
-                    "totalplaytime":totalplaytime.totaltime
+                    "start_time":start_at,
+                    "end_time":end_at,
+                    "playtime": playtime,
+                    "totalplaytime":totaltime
                 },
                 message="게임 플레이 종료시간 기록을 성공했습니다.",
                 status="success",
@@ -1175,6 +1405,47 @@ class GamePlaytimeAPIView(APIView):
             # return Response({"error": "게임이 존재하지 않습니다."}, status=status.HTTP_404_NOT_FOUND)
             return std_response(message="게임이 존재하지 않습니다.",status="fail",  status_code=status.HTTP_404_NOT_FOUND, error_code="SERVER_FAIL")
 
+    def finish_legacy_playlog(self, request, game_id, playtime_id):
+        # playlog = get_object_or_404(PlayLog, pk=request.data.get("playtime_id"))
+        try:
+            playlog = PlayLog.objects.get(pk=playtime_id)
+        except:
+            return std_response(
+                message="로그가 존재하지 않습니다.",
+                status="error",
+                status_code=status.HTTP_404_NOT_FOUND,
+                error_code="SERVER_FAIL"
+                )
+        totalplaytime,_ = TotalPlayTime.objects.get_or_create(user=request.user, game_id=game_id)
+
+        playlog.end_at = timezone.now()  # 현재 시간으로 end_time
+        totalplaytime.latest_at = timezone.now()
+
+        totaltime = (playlog.end_at - playlog.start_at).total_seconds()
+        playlog.playtime = totaltime  # playtime_seconds로 playtime_seconds 계산
+        totalplaytime.totaltime = totalplaytime.totaltime + totaltime
+
+        playlog.save()
+        totalplaytime.save()
+        ranking.incr_daily("playtime", {int(game_id): int(totaltime)})
+        # return Response({"message": "게임 플레이 종료시간 기록을 성공했습니다.", 
+        #                 "start_time":playlog.start_at,
+        #                 "end_time":playlog.end_at,
+        #                 "playtime": playlog.playtime,
+        #                 "totalplaytime":totalplaytime.totaltime}
+        #                 , status=status.HTTP_200_OK)
+        return std_response(
+            data={
+                "start_time":playlog.start_at,
+                "end_time":playlog.end_at,
+                "playtime": playlog.playtime,
+                "totalplaytime":totalplaytime.totaltime
+            },
+            message="게임 플레이 종료시간 기록을 성공했습니다.",
+            status="success",
+            status_code=status.HTTP_200_OK
+        )
+
 
 CLIENT = OpenAI(api_key=settings.OPEN_API_KEY)
 MAX_USES_PER_DAY = 10  # 하루 당 질문 10개로 제한기준
@@ -0,0 +1,334 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from unittest import mock
+from urllib.parse import parse_qs, unquote, urlsplit
+import uuid
+import zipfile
+
+import boto3
+from botocore.config import Config
+from django.core.management.base import BaseCommand
+
+from qnas.utils import publish_game_zip, rewrite_index_html
+
+
+S3_XMLNS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+class LocalS3Server(ThreadingHTTPServer):
+    """
+    벤치마크용 S3 대체 서버 (path-style, 내용은 저장하지 않고 크기만 기록)
+    PutObject, HeadObject, CopyObject, 멀티파트 업로드만 지원
+    latency: 요청마다 추가할 지연 시간(초), S3 왕복 시간 흉내
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency=0.0):
+        super().__init__(("127.0.0.1", 0), LocalS3Handler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.objects = {}
+        self.uploads = {}
+        self.requests = 0
+        self.received_bytes = 0
+
+    @property
+    def endpoint_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests = 0
+            self.received_bytes = 0
+
+
+class LocalS3Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def parse_request_path(self):
+        parsed = urlsplit(self.path)
+        return unquote(parsed.path.lstrip("/")), parse_qs(parsed.query, keep_blank_values=True)
+
+    def read_body(self):
+        # 내용은 버리고 크기만 반환
+        remaining = int(self.headers.get("Content-Length") or 0)
+        size = 0
+        while remaining:
+            chunk = self.rfile.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            size += len(chunk)
+            remaining -= len(chunk)
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.received_bytes += size
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        return size
+
+    def send(self, status_code, body=b"", headers=None):
+        self.send_response(status_code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def send_xml(self, body):
+        self.send(200, f'<?xml version="1.0" encoding="UTF-8"?>{body}'.encode(), {"Content-Type": "application/xml"})
+
+    def do_HEAD(self):
+        key, _ = self.parse_request_path()
+        self.read_body()
+        size = self.server.objects.get(key)
+        if size is None:
+            self.send(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(size))
+        self.send_header("ETag", '"bench"')
+        self.end_headers()
+
+    def do_PUT(self):
+        key, query = self.parse_request_path()
+        size = self.read_body()
+        etag = f'"{uuid.uuid4().hex}"'
+        if "partNumber" in query:
+            with self.server.lock:
+                self.server.uploads[query["uploadId"][0]][int(query["partNumber"][0])] = size
+            self.send(200, headers={"ETag": etag})
+        elif self.headers.get("x-amz-copy-source"):
+            source = unquote(self.headers["x-amz-copy-source"]).lstrip("/")
+            with self.server.lock:
+                self.server.objects[key] = self.server.objects[source]
+            self.send_xml(
+                f'<CopyObjectResult xmlns="{S3_XMLNS}"><ETag>{etag}</ETag>'
+                f'<LastModified>2026-01-01T00:00:00.000Z</LastModified></CopyObjectResult>'
+            )
+        else:
+            with self.server.lock:
+                self.server.objects[key] = size
+            self.send(200, headers={"ETag": etag})
+
+    def do_POST(self):
+        key, query = self.parse_request_path()
+        self.read_body()
+        bucket, _, object_key = key.partition("/")
+        if "uploads" in query:
+            upload_id = uuid.uuid4().hex
+            with self.server.lock:
+                self.server.uploads[upload_id] = {}
+            self.send_xml(
+                f'<InitiateMultipartUploadResult xmlns="{S3_XMLNS}"><Bucket>{bucket}</Bucket>'
+                f'<Key>{object_key}</Key><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>'
+            )
+        elif "uploadId" in query:
+            with self.server.lock:
+                parts = self.server.uploads.pop(query["uploadId"][0])
+                self.server.objects[key] = sum(parts.values())
+            self.send_xml(
+                f'<CompleteMultipartUploadResult xmlns="{S3_XMLNS}"><Bucket>{bucket}</Bucket>'
+                f'<Key>{object_key}</Key><ETag>"bench"</ETag></CompleteMultipartUploadResult>'
+            )
+        else:
+            self.send(400)
+
+    def do_DELETE(self):
+        _, query = self.parse_request_path()
+        self.read_body()
+        if "uploadId" in query:
+            with self.server.lock:
+                self.server.uploads.pop(query["uploadId"][0], None)
+        self.send(204)
+
+
+def make_unity_build_zip(path, total_size, file_count, seed=0):
+    """
+    Unity WebGL 빌드와 비슷한 구성의 zip 생성
+    압축되지 않은 wasm/data/js (압축 가능), 이미 압축된 *.gz, png (압축 불가) 섞음
+    """
+    rng = random.Random(seed)
+    words = [bytes(rng.choices(b"abcdefghijklmnopqrstuvwxyz_(){};", k=rng.randint(3, 12))) for _ in range(2048)]
+
+    def compressible(size):
+        out = bytearray()
+        while len(out) < size:
+            out += b" ".join(rng.choices(words, k=4096))
+        return bytes(out[:size])
+
+    def incompressible(size):
+        return rng.randbytes(size)
+
+    kinds = [
+        ("Build/build{}.wasm", compressible),
+        ("Build/build{}.data", compressible),
+        ("Build/build{}.framework.js", compressible),
+        ("Build/build{}.data.gz", incompressible),
+        ("TemplateData/image{}.png", incompressible),
+    ]
+    sizes = [rng.random() for _ in range(file_count)]
+    scale = total_size / sum(sizes)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        zf.writestr(
+            "index.html",
+            '<html><head><link rel="stylesheet" href="TemplateData/style.css"></head><body>'
+            '<div id="unity-container"></div><script>var buildUrl = "Build";'
+            'canvas.style.width = "960px"; canvas.style.height = "600px";</script></body></html>',
+        )
+        zf.writestr("TemplateData/style.css", "body { margin: 0 }")
+        for i, ratio in enumerate(sizes):
+            name, make = kinds[i % len(kinds)]
+            zf.writestr(name.format(i), make(max(int(ratio * scale), 1)))
+
+
+class InflateCounter:
+    """
+    zip 항목을 압축 해제해서 읽은 크기 합계 (seek 중 내부에서 다시 읽는 양 포함)
+    """
+
+    def __init__(self):
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.original_read = zipfile.ZipExtFile.read
+
+    def __enter__(self):
+        counter = self
+
+        def read(file, n=-1):
+            data = counter.original_read(file, n)
+            with counter.lock:
+                counter.bytes += len(data)
+            return data
+
+        self.patcher = mock.patch.object(zipfile.ZipExtFile, "read", read)
+        self.patcher.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.patcher.stop()
+
+
+def legacy_publish_game_zip(s3, zip_path, game_folder, bucket_name):
+    """
+    기존 game_register_task 방식 (비교용)
+    모든 항목을 메모리로 읽어 임시 zip 을 새로 만든 뒤, 파일을 하나씩 put_object 로 업로드
+    """
+    patterns = (
+        (r".+\.(data|symbols\.json)\.gz$", "application/octet-stream"),
+        (r".+\.js\.gz$", "application/javascript"),
+        (r".+\.wasm\.gz$", "application/wasm"),
+    )
+    content_types = {"js": "application/javascript", "html": "text/html", "ico": "image/x-icon",
+                     "png": "image/png", "css": "text/css"}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        out_zip_path = os.path.join(tmp_dir, "out.zip")
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            index_html = rewrite_index_html(zip_ref.read("index.html").decode("utf-8"), game_folder)
+            with zipfile.ZipFile(out_zip_path, "w") as new_zip:
+                for item in zip_ref.infolist():
+                    if item.filename != "index.html":
+                        new_zip.writestr(item, zip_ref.read(item.filename))
+                new_zip.writestr("index.html", index_html.encode("utf-8"))
+
+        count = 0
+        with zipfile.ZipFile(out_zip_path) as final_zip:
+            for file_name in final_zip.namelist():
+                file_extension = file_name.split('.')[-1].lower()
+                if not file_extension or '/' in file_extension:
+                    continue
+                content_type, content_encoding = content_types.get(file_extension), None
+                for pattern, pattern_type in patterns:
+                    if re.match(pattern, file_name):
+                        content_type, content_encoding = pattern_type, "gzip"
+                extra = {}
+                if content_type:
+                    extra["ContentType"] = content_type
+                if content_encoding:
+                    extra["ContentEncoding"] = content_encoding
+                s3.put_object(
+                    Bucket=bucket_name,
+                    Key=f"media/games/{game_folder}/{file_name}",
+                    Body=final_zip.open(file_name),
+                    **extra,
+                )
+                count += 1
+        return count
+
+
+class Command(BaseCommand):
+    help = "게임 파일 업로드(publish_game_zip) 벤치마크 (로컬 S3 대체 서버 사용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size-mb", type=int, default=200, help="zip 안의 파일 크기 합계 (MB)")
+        parser.add_argument("--files", type=int, default=40, help="zip 안의 파일 수")
+        parser.add_argument("--latency-ms", type=float, default=20, help="S3 요청당 추가 지연 시간 (ms)")
+        parser.add_argument("--workers", type=int, default=None, help="publish_game_zip 동시 업로드 수")
+        parser.add_argument("--skip-legacy", action="store_true", help="기존 방식 측정 생략")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        server = LocalS3Server(latency=options["latency_ms"] / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        s3 = boto3.client(
+            "s3",
+            endpoint_url=server.endpoint_url,
+            aws_access_key_id="bench",
+            aws_secret_access_key="bench",
+            region_name="us-east-1",
+            config=Config(s3={"addressing_style": "path"}, max_pool_connections=50),
+        )
+        bucket_name = settings.AWS_STORAGE_BUCKET_NAME
+
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                zip_path = os.path.join(tmp_dir, "build.zip")
+                make_unity_build_zip(zip_path, options["size_mb"] * 1024 * 1024, options["files"])
+                with zipfile.ZipFile(zip_path) as zf:
+                    original_size = sum(info.file_size for info in zf.infolist())
+                self.stdout.write(
+                    f"zip: {os.path.getsize(zip_path) / 1024 / 1024:.1f} MB "
+                    f"(압축 해제 {original_size / 1024 / 1024:.1f} MB, {options['files'] + 2} files), "
+                    f"latency: {options['latency_ms']} ms"
+                )
+                self.stdout.write(f"{'case':<28}{'seconds':>9}{'requests':>10}{'sent MB':>10}{'inflated x':>12}{'peak MB':>9}")
+
+                publish_kwargs = {}
+                if options["workers"]:
+                    publish_kwargs["max_workers"] = options["workers"]
+                cases = [
+                    ("current (first publish)", lambda: publish_game_zip(s3, zip_path, "bench-v1", **publish_kwargs)),
+                    # 같은 빌드를 다시 올리는 경우 (빌드 파일 저장소 재사용)
+                    ("current (re-publish)", lambda: publish_game_zip(s3, zip_path, "bench-v2", **publish_kwargs)),
+                ]
+                if not options["skip_legacy"]:
+                    cases.insert(0, ("legacy", lambda: legacy_publish_game_zip(s3, zip_path, "bench-legacy", bucket_name)))
+
+                for name, run in cases:
+                    server.reset_stats()
+                    tracemalloc.start()
+                    started = time.perf_counter()
+                    with InflateCounter() as inflated:
+                        run()
+                    seconds = time.perf_counter() - started
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    self.stdout.write(
+                        f"{name:<28}{seconds:>9.2f}{server.requests:>10}"
+                        f"{server.received_bytes / 1024 / 1024:>10.1f}"
+                        f"{inflated.bytes / original_size:>12.2f}{peak / 1024 / 1024:>9.1f}"
+                    )
+        finally:
+            server.shutdown()
+            server.server_close()
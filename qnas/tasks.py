@@ -1,35 +1,34 @@
+from collections import defaultdict
 from datetime import timedelta
 import logging
 from tempfile import NamedTemporaryFile
 import os
-import re
-from urllib.parse import urlparse
-import zipfile
+import time
 
-import boto3
 from celery import shared_task
 from celery.exceptions import Ignore
-import redis
 
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Q, Sum
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
 from django.utils import timezone
 
 from spartagames.config import ADMIN_STAFF_EMAIL, ADMIN_USER_EMAIL
+from spartagames.redis_client import r
+from spartagames.s3 import delete_s3_prefix, get_s3_client
 from .models import DeleteUsers, GameRegisterLog
-from games.models import Game
+from .utils import publish_game_zip
+from games.cache import invalidate_home_feed_cache
+from games.models import Game, Review
+from games.utils import refresh_search_documents
 
 
 logger = logging.getLogger("sparta_games_celery")
-redis_url = urlparse(settings.CELERY_BROKER_URL)
-r = redis.Redis(
-    host=redis_url.hostname,
-    port=redis_url.port,
-    password=redis_url.password,
-    db=0
-)
+
+# 게임 등록 중 업로드를 마친 파일 목록 보관 기간
+PUBLISHED_FILES_TIMEOUT = 60 * 60 * 24
 
 @shared_task
 def hard_delete_user():
@@ -58,15 +57,27 @@ def hard_delete_user():
                     content=f"제작자 {user.nickname}의 게임 데이터를 관리자 계정으로 이관"
                 )
                 game.maker = admin_user
-                game.save()
+                game.save(update_fields=["maker", "updated_at"])
+
+            # 이관된 게임들의 검색용 문서 갱신 (제작자 닉네임 변경)
+            refresh_search_documents(games)
+
+            # 리뷰 이관 처리 (좋아요/싫어요 수는 건드리지 않도록 author 만 갱신)
+            user.reviews.update(author=admin_user)
+
+            with transaction.atomic():
+                # 유저 삭제 시 함께 삭제되는 리뷰 좋아요/싫어요 만큼 리뷰의 좋아요/싫어요 수 차감
+                # toggle_review_like 와 같은 순서로 ReviewsLike 행을 잠근 뒤 리뷰별로 모아서 갱신
+                review_likes = user.review_likes.select_for_update().filter(is_like__in=[1, 2])
+                deltas = defaultdict(lambda: {"like_count": 0, "dislike_count": 0})
+                for review_id, is_like in review_likes.values_list("review_id", "is_like"):
+                    deltas[review_id]["like_count" if is_like == 1 else "dislike_count"] += 1
+                for review_id, delta in deltas.items():
+                    Review.objects.filter(pk=review_id).update(
+                        **{field: F(field) - count for field, count in delta.items() if count}
+                    )
 
-            # 리뷰 이관 처리
-            reviews = user.reviews.all()
-            for review in reviews:
-                review.author = admin_user
-                review.save()
-            
-            user.delete()
+                user.delete()
         
         logger.info(f"유저 완전 삭제 프로세스 완료")
     except Exception as e:
@@ -101,175 +112,82 @@ def game_register_task(self, game_id):
             # 무한 리트라이 문제 때문에 주석 처리
             # raise self.retry(exc=e)
 
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_S3_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_S3_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME,
-        )
-
-        try:
-            zip_resp = s3.get_object(
-                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                Key=f"media/{row.gamefile.name}"
-            )
-        except Exception as e:
-            logger.exception("S3에서 zip 파일 가져오기 실패", exc_info=True)
-            raise self.retry(exc=e)
+        s3 = get_s3_client()
 
+        # 원본 zip 파일을 임시 파일로 내려받음 (zip은 중앙 디렉터리를 파일 끝에서 읽어야 하므로 한 번은 내려받아야 함)
         with NamedTemporaryFile(delete=False) as tmp_file:
-            for chunk in zip_resp["Body"].iter_chunks(chunk_size=8192):
-                tmp_file.write(chunk)
             zip_path = tmp_file.name
+            try:
+                s3.download_fileobj(settings.AWS_STORAGE_BUCKET_NAME, f"media/{row.gamefile.name}", tmp_file)
+            except Exception as e:
+                logger.exception("S3에서 zip 파일 가져오기 실패", exc_info=True)
+                os.remove(zip_path)
+                raise self.retry(exc=e)
 
         game_folder = row.gamefile.name.split('/')[-1].split('.')[0]
 
-        # 업로드 된 같은 이름의 폴더나 파일이 존재할 경우 제거
-        s3_for_delete = boto3.resource(
-            "s3",
-            aws_access_key_id=settings.AWS_S3_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_S3_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME,
-        )
-        bucket_for_delete = s3_for_delete.Bucket(settings.AWS_STORAGE_BUCKET_NAME)
-        bucket_for_delete.objects.filter(Prefix=f"media/games/{game_folder}/").delete()
-
-        # index.html 변경 후 S3 업로드
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                index_text = zip_ref.read("index.html").decode("utf-8")
-                new_lines = ""
-                is_check_build = False
-
-                for line in index_text.splitlines():
-                    if 'link' in line:
-                        cursor = line.find("TemplateData")
-                        new_lines += line[:cursor] + f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/media/games/{game_folder}/" + line[cursor:]
-                    elif "buildUrl" in line and not is_check_build:
-                        is_check_build = True
-                        cursor = line.find("Build")
-                        new_lines += line[:cursor] + f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/media/games/{game_folder}/" + line[cursor:]
-                    elif "canvas.style.width" in line or "canvas.style.height" in line:
-                        cursor = line.find('"')
-                        new_lines += line[:cursor] + '"100%"\n'
-                    else:
-                        new_lines += line
-                    new_lines += "\n"
-
-                new_lines = new_lines.replace(
-                    '<body', '<body style="margin: 0; padding: 0; width: 100%; height: 100%; overflow: hidden;"'
-                ).replace(
-                    '<div id="unity-container"', '<div id="unity-container" style="width: 100%; height: 100%; overflow: hidden;"'
-                )
-
-                new_lines = new_lines.replace(
-                    "</body>",
-                    """
-                    <script>
-                    function sendSizeToParent() {
-                        var canvas = document.querySelector("#unity-canvas");
-                        var width = canvas.clientWidth;
-                        var height = canvas.clientHeight;
-                        window.parent.postMessage({ width: width, height: height }, '*');
-                    }
-
-                    window.addEventListener('resize', sendSizeToParent);
-                    window.addEventListener('load', sendSizeToParent);
-                    </script>
-                    </body>
-                    """
-                )
-
-                with NamedTemporaryFile(delete=False) as out_zip:
-                    with zipfile.ZipFile(out_zip, "w") as new_zip:
-                        for item in zip_ref.infolist():
-                            if item.filename != "index.html":
-                                new_zip.writestr(item, zip_ref.read(item.filename))
-                        new_zip.writestr("index.html", new_lines.encode("utf-8"))
+        # 업로드를 마친 파일 목록 (중간에 실패하면 다음 실행 때 남은 파일만 이어서 업로드)
+        published_key = f"game:published:{game_id}:{game_folder}"
+        published = {name.decode("utf-8") for name in r.smembers(published_key)}
 
-                    out_zip_path = out_zip.name
+        def mark_published(file_name):
+            r.sadd(published_key, file_name)
+            r.expire(published_key, PUBLISHED_FILES_TIMEOUT)
 
-            with zipfile.ZipFile(out_zip_path) as final_zip:
-                for file_name in final_zip.namelist():
-                    pattern1 = r".+\.(data|symbols\.json)\.gz$"
-                    pattern2 = r".+\.js\.gz$"
-                    pattern3 = r".+\.wasm\.gz$"
-                    
-                    # 만약 file_name이 폴더명 이라면 S3에 올리는 과정 거치지 않도록 스킵
-                    file_extension = file_name.split('.')[-1].lower()
-                    if not file_extension or '/' in file_extension:
-                        continue
-                    
-                    body = final_zip.open(file_name)
-
-                    content_type = None
-                    content_encoding = None
-
-                    # 메타데이터 설정
-                    metadata = {}
-                    if re.match(pattern1, file_name):
-                        content_type = 'application/octet-stream'
-                        content_encoding = 'gzip'
-                    elif re.match(pattern2, file_name):
-                        content_type = 'application/javascript'
-                        content_encoding = 'gzip'
-                    elif re.match(pattern3, file_name):
-                        content_type = 'application/wasm'
-                        content_encoding = 'gzip'
-                    else:
-                        if file_extension == "js":
-                            content_type = 'application/javascript'
-                        elif file_extension == "html":
-                            content_type = 'text/html'
-                        elif file_extension == "ico":
-                            content_type = 'image/x-icon'
-                        elif file_extension == "png":
-                            content_type = 'image/png'
-                        elif file_extension == "css":
-                            content_type = 'text/css'
+        try:
+            if not published:
+                # 업로드 된 같은 이름의 폴더나 파일이 존재할 경우 제거
+                delete_s3_prefix(f"media/games/{game_folder}/")
+            else:
+                logger.info(f"게임 {game_id} 이어서 업로드 (이미 업로드 된 파일 {len(published)}개)")
 
-                    s3.put_object(
-                        Body=body,
-                        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                        Key=f"media/games/{game_folder}/{file_name}",
-                        ContentType=(content_type if content_type else 'text/plain'),
-                        ContentEncoding=(content_encoding if content_encoding else 'identity'),
-                    )
-                    
-                    body.close()
+            # index.html만 메모리에서 변경하고, 나머지 파일은 원본 zip에서 바로 S3에 업로드
+            started = time.monotonic()
+            uploads = publish_game_zip(s3, zip_path, game_folder, skip=published, on_uploaded=mark_published)
+            seconds = time.monotonic() - started
 
         except Exception as e:
             logger.exception("게임 등록 중 에러 발생", exc_info=True)
             raise self.retry(exc=e)
-        
+
         # 생성했던 임시 파일 삭제
         finally:
-            # 열린 파일 핸들 강제로 close 시도
-            import gc
-            gc.collect()
-
-            if zip_path and os.path.exists(zip_path):
-                try:
-                    os.remove(zip_path)
-                except Exception as e:
-                    logger.warning(f"zip_path 삭제 실패: {e}", exc_info=True)
-
-            if out_zip_path and os.path.exists(out_zip_path):
-                try:
-                    os.remove(out_zip_path)
-                except Exception as e:
-                    logger.warning(f"out_zip_path 삭제 실패: {e}", exc_info=True)
-
-        logger.info(f"게임 등록을 완료했습니다. (game id: {game_id})")
+            try:
+                os.remove(zip_path)
+            except Exception as e:
+                logger.warning(f"zip_path 삭제 실패: {e}", exc_info=True)
+
+        r.delete(published_key)
+        original_bytes = sum(upload["bytes"] for upload in uploads)
+        uploaded_bytes = sum(upload["uploaded_bytes"] for upload in uploads)
+        # 빌드 파일 저장소에 이미 있어서 업로드하지 않은 크기
+        saved_bytes = sum(upload["stored_bytes"] for upload in uploads if upload["reused"])
+        logger.info(
+            f"게임 등록을 완료했습니다. (game id: {game_id}, files: {len(uploads)}, "
+            f"bytes: {uploaded_bytes}, saved: {saved_bytes}, seconds: {seconds:.2f})"
+        )
 
         row.gamepath = f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/media/games/{game_folder}"
         row.register_state = 1
-        row.save()
+        row.save(update_fields=["gamepath", "register_state", "updated_at"])
+
+        # 메인 홈 게임 목록 캐시 무효화
+        invalidate_home_feed_cache()
 
         return {
             "status": "success",
             "game_id": game_id,
             "gamepath": row.gamepath,
+            "resumed_files": len(published),
+            "uploaded_files": len(uploads),
+            "original_bytes": original_bytes,
+            "uploaded_bytes": uploaded_bytes,
+            "gzip_files": sum(upload["content_encoding"] == "gzip" for upload in uploads),
+            "reused_files": sum(upload["reused"] for upload in uploads),
+            "saved_bytes": saved_bytes,
+            "seconds": round(seconds, 3),
+            "mb_per_sec": round(uploaded_bytes / seconds / (1024 * 1024), 2) if seconds else None,
+            "files": uploads,
         }
     
     finally:
@@ -0,0 +1,307 @@
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+import gzip
+import hashlib
+import io
+import re
+import shutil
+from tempfile import SpooledTemporaryFile
+import threading
+import time
+import zipfile
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from django.conf import settings
+
+
+# 게임 파일 동시 업로드 수
+GAME_PUBLISH_MAX_WORKERS = getattr(settings, "GAME_PUBLISH_MAX_WORKERS", 8)
+GAME_PUBLISH_MULTIPART_THRESHOLD = getattr(settings, "GAME_PUBLISH_MULTIPART_THRESHOLD", 16 * 1024 * 1024)
+# 작은 파일은 스레드 하나로 한 번에 업로드 (동시 업로드 수만큼만 메모리 사용)
+SMALL_FILE_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=GAME_PUBLISH_MULTIPART_THRESHOLD,
+    use_threads=False,
+)
+# 큰 파일은 part 단위로 나눠 동시에 업로드 (실패한 part만 다시 요청하고 파일 전체를 다시 올리지 않음)
+LARGE_FILE_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=GAME_PUBLISH_MULTIPART_THRESHOLD,
+    multipart_chunksize=getattr(settings, "GAME_PUBLISH_MULTIPART_CHUNKSIZE", 8 * 1024 * 1024),
+    max_concurrency=getattr(settings, "GAME_PUBLISH_MULTIPART_CONCURRENCY", 4),
+    use_threads=True,
+)
+
+GZIP_DATA_PATTERN = re.compile(r".+\.(data|symbols\.json)\.gz$")
+GZIP_JS_PATTERN = re.compile(r".+\.js\.gz$")
+GZIP_WASM_PATTERN = re.compile(r".+\.wasm\.gz$")
+
+CONTENT_TYPES = {
+    "js": "application/javascript",
+    "html": "text/html",
+    "ico": "image/x-icon",
+    "png": "image/png",
+    "css": "text/css",
+    "wasm": "application/wasm",
+    "data": "application/octet-stream",
+}
+
+# 압축되지 않은 빌드 파일은 업로드 시 gzip으로 압축해서 같은 경로에 ContentEncoding: gzip 으로 저장
+# (경로가 바뀌지 않으므로 index.html, Unity 로더 수정 없이 브라우저가 자동으로 압축 해제)
+COMPRESSIBLE_EXTENSIONS = ("js", "wasm", "data")
+GZIP_COMPRESS_LEVEL = 6
+# 이 크기보다 작은 파일은 압축하지 않음
+GZIP_MIN_SIZE = 1024
+# 압축 후 크기가 원본의 90% 이상이면 원본 그대로 업로드
+GZIP_MAX_RATIO = 0.9
+# 압축 결과, 압축 해제한 원본을 메모리에 둘 최대 크기 (넘으면 임시 파일로 저장)
+GZIP_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+# 빌드 파일 저장소 (원본 파일의 SHA-256 으로 저장, 업로드 시 압축한 파일은 .gz)
+# 같은 내용의 파일은 한 번만 업로드하고 게임 폴더에는 S3 안에서 복사함
+GAME_BLOB_PREFIX = "media/games/blobs"
+
+
+def rewrite_index_html(index_text, game_folder):
+    """
+    index.html 내용 수정
+    <link> 태그 href, buildUrl 경로를 S3 게임 폴더 경로로 변경하고 iframe 크기 조절용 스타일/스크립트 추가
+    """
+    game_url = f"https://{settings.AWS_S3_CUSTOM_DOMAIN}/media/games/{game_folder}/"
+    new_lines = ""
+    is_check_build = False
+
+    for line in index_text.splitlines():
+        if 'link' in line:
+            cursor = line.find("TemplateData")
+            new_lines += line[:cursor] + game_url + line[cursor:]
+        elif "buildUrl" in line and not is_check_build:
+            is_check_build = True
+            cursor = line.find("Build")
+            new_lines += line[:cursor] + game_url + line[cursor:]
+        elif "canvas.style.width" in line or "canvas.style.height" in line:
+            cursor = line.find('"')
+            new_lines += line[:cursor] + '"100%"\n'
+        else:
+            new_lines += line
+        new_lines += "\n"
+
+    new_lines = new_lines.replace(
+        '<body', '<body style="margin: 0; padding: 0; width: 100%; height: 100%; overflow: hidden;"'
+    ).replace(
+        '<div id="unity-container"', '<div id="unity-container" style="width: 100%; height: 100%; overflow: hidden;"'
+    )
+
+    new_lines = new_lines.replace(
+        "</body>",
+        """
+                    <script>
+                    function sendSizeToParent() {
+                        var canvas = document.querySelector("#unity-canvas");
+                        var width = canvas.clientWidth;
+                        var height = canvas.clientHeight;
+                        window.parent.postMessage({ width: width, height: height }, '*');
+                    }
+
+                    window.addEventListener('resize', sendSizeToParent);
+                    window.addEventListener('load', sendSizeToParent);
+                    </script>
+                    </body>
+                    """
+    )
+    return new_lines
+
+
+def get_game_file_headers(file_name):
+    """
+    게임 파일의 ContentType, ContentEncoding
+    """
+    file_extension = file_name.split('.')[-1].lower()
+    if GZIP_DATA_PATTERN.match(file_name):
+        return 'application/octet-stream', 'gzip'
+    if GZIP_JS_PATTERN.match(file_name):
+        return 'application/javascript', 'gzip'
+    if GZIP_WASM_PATTERN.match(file_name):
+        return 'application/wasm', 'gzip'
+    return CONTENT_TYPES.get(file_extension, 'text/plain'), 'identity'
+
+
+def is_compressible(file_name, size):
+    file_extension = file_name.split('.')[-1].lower()
+    return file_extension in COMPRESSIBLE_EXTENSIONS and size >= GZIP_MIN_SIZE
+
+
+def gzip_game_file(source, size):
+    """
+    파일을 gzip으로 압축
+    압축 결과(처음 위치로 이동한 임시 파일)와 크기 반환, 크기가 충분히 줄지 않으면 None 반환
+    zlib은 압축 중 GIL을 해제하므로 업로드 스레드에서 바로 압축함
+    """
+    compressed = SpooledTemporaryFile(max_size=GZIP_SPOOL_MAX_SIZE)
+    with gzip.GzipFile(fileobj=compressed, mode="wb", compresslevel=GZIP_COMPRESS_LEVEL, mtime=0) as gz:
+        shutil.copyfileobj(source, gz, 1024 * 1024)
+
+    compressed_size = compressed.tell()
+    if compressed_size >= size * GZIP_MAX_RATIO:
+        compressed.close()
+        return None
+    compressed.seek(0)
+    return compressed, compressed_size
+
+
+def spool_game_file(source):
+    """
+    zip 항목을 한 번만 압축 해제하면서 SHA-256 계산과 임시 파일 저장을 함께 함
+    처음 위치로 이동한 임시 파일과 SHA-256 반환
+    ZipExtFile 을 그대로 다시 읽거나 업로드하면 (s3transfer 는 크기 확인을 위해 끝까지 seek 함)
+    seek 할 때마다 처음부터 다시 압축을 해제하므로, 이후 압축/업로드는 임시 파일에서 읽음
+    """
+    digest = hashlib.sha256()
+    spool = SpooledTemporaryFile(max_size=GZIP_SPOOL_MAX_SIZE)
+    try:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(chunk)
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool, digest.hexdigest()
+
+
+def get_blob_key(digest, compressed):
+    return f"{GAME_BLOB_PREFIX}/{digest}{'.gz' if compressed else ''}"
+
+
+def get_blob_size(s3, blob_key):
+    """
+    저장소에 있는 파일 크기 (없으면 None)
+    """
+    try:
+        return s3.head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=blob_key)["ContentLength"]
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+
+def is_game_file(file_name):
+    # 폴더명이면 S3에 올리지 않음
+    file_extension = file_name.split('.')[-1].lower()
+    return bool(file_extension) and '/' not in file_extension
+
+
+def publish_game_zip(s3, zip_path, game_folder, skip=(), on_uploaded=None, max_workers=GAME_PUBLISH_MAX_WORKERS):
+    """
+    게임 zip 파일의 각 파일을 S3 게임 폴더(media/games/<game_folder>/)에 업로드
+    중간 zip 파일을 만들지 않고, index.html만 메모리에서 수정한 뒤
+    나머지 파일은 원본 zip에서 바로 읽어 여러 스레드로 동시에 업로드함
+    index.html 외의 파일은 빌드 파일 저장소(GAME_BLOB_PREFIX)에 없을 때만 업로드하고 게임 폴더로 복사함
+    skip: 이미 업로드한 파일 (재시도 시 이어서 업로드)
+    on_uploaded: 파일 하나의 업로드가 끝날 때마다 파일명으로 호출
+    반환값: 업로드한 파일별 전송량/소요 시간 목록
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        entries = [
+            info for info in zip_ref.infolist()
+            if is_game_file(info.filename) and info.filename not in skip
+        ]
+        index_html = rewrite_index_html(zip_ref.read("index.html").decode("utf-8"), game_folder).encode("utf-8")
+
+    # ZipFile 객체는 스레드마다 따로 열어서 사용 (파일 위치 공유 방지)
+    local = threading.local()
+    opened = []
+    opened_lock = threading.Lock()
+
+    def get_zip():
+        if not hasattr(local, "zip_ref"):
+            local.zip_ref = zipfile.ZipFile(zip_path, "r")
+            with opened_lock:
+                opened.append(local.zip_ref)
+        return local.zip_ref
+
+    def put_file(body, key, content_type, content_encoding, size):
+        with body:
+            s3.upload_fileobj(
+                body,
+                settings.AWS_STORAGE_BUCKET_NAME,
+                key,
+                ExtraArgs={"ContentType": content_type, "ContentEncoding": content_encoding},
+                Config=LARGE_FILE_TRANSFER_CONFIG if size >= GAME_PUBLISH_MULTIPART_THRESHOLD else SMALL_FILE_TRANSFER_CONFIG,
+            )
+
+    def upload(info):
+        file_name = info.filename
+        game_key = f"media/games/{game_folder}/{file_name}"
+        content_type, content_encoding = get_game_file_headers(file_name)
+        started = time.monotonic()
+
+        if file_name == "index.html":
+            # index.html은 게임마다 내용이 다르므로 저장소를 거치지 않음
+            size = stored_size = len(index_html)
+            put_file(io.BytesIO(index_html), game_key, content_type, content_encoding, size)
+            reused = False
+        else:
+            size = info.file_size
+            with get_zip().open(info) as source:
+                spool, digest = spool_game_file(source)
+            with spool:
+                compressible = content_encoding == "identity" and is_compressible(file_name, size)
+
+                # 저장소에 같은 파일이 있으면 업로드하지 않음
+                blob_key, stored_size = None, None
+                for compressed in ((True, False) if compressible else (False,)):
+                    stored_size = get_blob_size(s3, get_blob_key(digest, compressed))
+                    if stored_size is not None:
+                        blob_key = get_blob_key(digest, compressed)
+                        if compressed:
+                            content_encoding = "gzip"
+                        break
+                reused = blob_key is not None
+
+                if not reused:
+                    compressed = gzip_game_file(spool, size) if compressible else None
+                    if compressed:
+                        body, stored_size = compressed
+                        content_encoding = "gzip"
+                    else:
+                        spool.seek(0)
+                        body, stored_size = spool, size
+                    blob_key = get_blob_key(digest, bool(compressed))
+                    put_file(body, blob_key, content_type, content_encoding, stored_size)
+
+            # 게임 폴더로 복사 (S3 안에서 복사하므로 전송량 없음)
+            s3.copy_object(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=game_key,
+                CopySource={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": blob_key},
+                MetadataDirective="REPLACE",
+                ContentType=content_type,
+                ContentEncoding=content_encoding,
+            )
+        seconds = time.monotonic() - started
+        uploaded_size = 0 if reused else stored_size
+
+        if on_uploaded:
+            on_uploaded(file_name)
+        return {
+            "file": file_name,
+            "bytes": size,
+            "stored_bytes": stored_size,
+            "uploaded_bytes": uploaded_size,
+            "content_encoding": content_encoding,
+            "reused": reused,
+            "seconds": round(seconds, 3),
+            "mb_per_sec": round(uploaded_size / seconds / (1024 * 1024), 2) if seconds else None,
+            "multipart": uploaded_size >= GAME_PUBLISH_MULTIPART_THRESHOLD,
+        }
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(upload, info) for info in entries]
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            # 하나라도 실패하면 남은 업로드를 취소하고 예외 전달 (완료된 파일은 on_uploaded로 기록됨)
+            for future in not_done:
+                future.cancel()
+            return [future.result() for future in futures if future in done]
+    finally:
+        for zip_ref in opened:
+            zip_ref.close()
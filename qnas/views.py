@@ -1,14 +1,13 @@
-import io
 import os
 import re
-import zipfile
+from tempfile import NamedTemporaryFile
 
-import boto3
+from botocore.exceptions import ClientError
 
 from django.conf import settings
 from django.core.files.storage import FileSystemStorage
 from django.db.models import Q
-from django.http import FileResponse
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -26,12 +25,15 @@ from .serializers import (
     CategorySerializer,
     GameRegisterListSerializer,
 )
-from .tasks import r
+from .utils import publish_game_zip
+from spartagames.redis_client import r
+from spartagames.s3 import get_s3_client
+from games.cache import invalidate_home_feed_cache
 from games.models import (
     Game,
 )
 from commons.models import Notification
-from commons.utils import NotificationSubType, create_notification
+from commons.utils import NotificationSubType, queue_notifications
 
 from spartagames.utils import std_response
 from rest_framework import status
@@ -39,6 +41,14 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated  # 로그인 인증토큰
 
 
+# 게임 zip 파일 다운로드 시 S3 응답을 나눠서 전달할 크기
+DZIP_CHUNK_SIZE = 1024 * 1024
+# 게임 zip 파일 다운로드 url 유효 시간
+DZIP_PRESIGNED_URL_EXPIRES = 60 * 5
+# 이어받기용 Range 헤더 (단일 구간만 허용)
+DZIP_RANGE_PATTERN = re.compile(r"^bytes=(\d+-\d*|-\d+)$")
+
+
 # ---------- API---------- #
 # Deprecated
 class QnAPostListAPIView(APIView):
@@ -283,135 +293,22 @@ def game_register(request, game_id):
     # ~/<업로드시각>_<압축파일명>.zip 에서 '<업로드시각>_<압축파일명>' 추출
     game_folder = path.split('/')[-1].split('.')[0]
 
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=config.AWS_AUTH["aws_access_key_id"],
-        aws_secret_access_key=config.AWS_AUTH["aws_secret_access_key"],
-        region_name='ap-northeast-2'
-    )
-    
-    # S3에서 zip 파일을 읽어옴
-    zip_resp = s3.get_object(Bucket=config.AWS_S3_BUCKET_NAME, Key=path)
-
-    # BytesIO를 사용하여 메모리에 파일 데이터를 읽음
-    zip_data = io.BytesIO(zip_resp['Body'].read())
-
-    zip_ref = zipfile.ZipFile(zip_data)
+    s3 = get_s3_client()
 
-    """
-    index.html 내용 수정
-    <link> 태그 href 값 수정 (line: 7, 8)
-    var buildUrl 변수 값 수정 (line: 59)
-    
-    new_lines: 덮어쓸 내용 저장
-    is_check_build: Build 키워드 찾은 후 True로 변경 (이후 라인에서 Build 찾는 것을 피하기 위함)
-    """
-
-    new_lines = str()
-    is_check_build = False
-
-    # 덮어쓸 내용 담기
-    index_text = zip_ref.read('index.html').decode('utf-8')
-    for line in index_text.splitlines():
-        if line.find('link') > -1:
-            cursor = line.find('TemplateData')
-            new_lines += line[:cursor] + \
-                f'https://{settings.AWS_S3_CUSTOM_DOMAIN}/media/games/{game_folder}/' + line[cursor:]
-        elif line.find('buildUrl') > -1 and not is_check_build:
-            is_check_build = True
-            cursor = line.find('Build')
-            new_lines += line[:cursor] + \
-                f'https://{settings.AWS_S3_CUSTOM_DOMAIN}/media/games/{game_folder}/' + line[cursor:]
-        elif line.find('canvas.style.width') > -1 or line.find('canvas.style.height') > -1:
-            is_check_build = True
-            cursor = line.find('\"')
-            new_lines += line[:cursor] + "\"100%\"\n"
-        else:
-            new_lines += line
-        new_lines += '\n'
-    
-    # 추가할 JavaScript 코드 (iframe의 width, height 조절을 위해 추가함)
-    additional_script = """
-    <script>
-      function sendSizeToParent() {
-        var canvas = document.querySelector("#unity-canvas");
-        var width = canvas.clientWidth;
-        var height = canvas.clientHeight;
-        window.parent.postMessage({ width: width, height: height }, '*');
-      }
-
-      window.addEventListener('resize', sendSizeToParent);
-      window.addEventListener('load', sendSizeToParent);
-    </script>
-    """
-    # CSS 스타일 추가 (body 태그와 unity-container에 overflow: hidden 추가)
-    new_lines = new_lines.replace(
-        '<body', '<body style="margin: 0; padding: 0; width: 100%; height: 100%; overflow: hidden;"')
-    new_lines = new_lines.replace(
-        '<div id="unity-container"', '<div id="unity-container" style="width: 100%; height: 100%; overflow: hidden;"')
-
-    # </body> 태그 전에 추가할 스크립트 삽입
-    body_close_category_index = new_lines.find('</body>')
-    new_lines = new_lines[:body_close_category_index] + \
-        additional_script + new_lines[body_close_category_index:]
-
-    new_zip_data = io.BytesIO()
-    with zipfile.ZipFile(new_zip_data, 'w') as new_zip_ref:
-        for item in zip_ref.infolist():
-            if item.filename != 'index.html':
-                new_zip_ref.writestr(item, zip_ref.read(item.filename))
-        new_zip_ref.writestr('index.html', new_lines.encode('utf-8'))
-
-        for file_name in new_zip_ref.namelist():
-            pattern1 = r".+\.(data|symbols\.json)\.gz$"
-            pattern2 = r".+\.js\.gz$"
-            pattern3 = r".+\.wasm\.gz$"
-            file_extension = file_name.split('.')[-1].lower()
-            
-            # 만약 file_name이 폴더명 이라면 S3에 올리는 과정 거치지 않도록 스킵
-            if not file_extension or '/' in file_extension:
-                continue
-
-            content_type = None
-            content_encoding = None
-
-            # 메타데이터 설정
-            metadata = {}
-            if re.match(pattern1, file_name):
-                content_type = 'application/octet-stream'
-                content_encoding = 'gzip'
-            elif re.match(pattern2, file_name):
-                content_type = 'application/javascript'
-                content_encoding = 'gzip'
-            elif re.match(pattern3, file_name):
-                content_type = 'application/wasm'
-                content_encoding = 'gzip'
-            else:
-                if file_extension == "js":
-                    content_type = 'application/javascript'
-                elif file_extension == "html":
-                    content_type = 'text/html'
-                elif file_extension == "ico":
-                    content_type = 'image/x-icon'
-                elif file_extension == "png":
-                    content_type = 'image/png'
-                elif file_extension == "css":
-                    content_type = 'text/css'
-
-            response = s3.put_object(
-                Body=new_zip_ref.open(file_name),
-                Bucket=config.AWS_S3_BUCKET_NAME,
-                Key=f"media/games/{game_folder}/{file_name}",
-                ContentType=(content_type if content_type else 'text/plain'),
-                ContentEncoding=(content_encoding if content_encoding else 'identity')
-            )
-
-    zip_ref.close()
+    # S3에서 zip 파일을 임시 파일로 내려받은 뒤 (메모리에 올리지 않음)
+    # index.html 수정 후 게임 폴더에 업로드 (game_register_task 와 같은 처리)
+    with NamedTemporaryFile(suffix=".zip") as zip_file:
+        s3.download_fileobj(config.AWS_S3_BUCKET_NAME, path, zip_file)
+        zip_file.flush()
+        publish_game_zip(s3, zip_file.name, game_folder)
 
     # 게임 폴더 경로를 저장하고, 등록 상태 1로 변경(등록 성공)
     row.gamepath = f'https://{settings.AWS_S3_CUSTOM_DOMAIN}/media/games/{game_folder}'
     row.register_state = 1
-    row.save()
+    row.save(update_fields=["gamepath", "register_state", "updated_at"])
+
+    # 메인 홈 게임 목록 캐시 무효화
+    invalidate_home_feed_cache()
 
     # 알맞은 HTTP Response 리턴
     # return Response({"message": f"등록을 성공했습니다. (게시물 id: {game_id})"}, status=status.HTTP_200_OK)
@@ -426,9 +323,9 @@ def game_register(request, game_id):
 
     # 페이지 알림
     # 2025-09-08 수정. user 값을 게임의 제작자로 수정
-    notif = create_notification(
+    queue_notifications(
         # user=request.user,
-        user=row.maker,
+        users=[row.maker],
         noti_type=Notification.NotificationType.GAME_UPLOAD,
         noti_sub_type=NotificationSubType.REGISTER_APPROVE,
         related_object=row,
@@ -507,7 +404,7 @@ def game_register_deny(request, game_id):
             status_code=status.HTTP_404_NOT_FOUND
         )
     game.register_state = 2
-    game.save()
+    game.save(update_fields=["register_state", "updated_at"])
     
     # 등록 거부 사유 로그 추가
     GameRegisterLog.objects.create(
@@ -519,9 +416,9 @@ def game_register_deny(request, game_id):
 
     # 페이지 알림
     # 2025-09-08 수정. user 값을 게임의 제작자로 수정
-    notif = create_notification(
+    queue_notifications(
         # user=request.user,
-        user=game.maker,
+        users=[game.maker],
         noti_type=Notification.NotificationType.GAME_UPLOAD,
         noti_sub_type=NotificationSubType.REGISTER_REJECT,
         related_object=game,
@@ -537,8 +434,8 @@ def game_register_deny(request, game_id):
     )
 
 
-# FileResponse 이므로 std_response로 변경하지 않음
-@api_view(['POST'])
+# 파일 응답(StreamingHttpResponse)이므로 std_response로 변경하지 않음
+@api_view(['GET', 'POST'])
 # @permission_classes([IsAuthenticated])
 def game_dzip(request, game_id):
     # 관리자 여부 확인
@@ -560,26 +457,71 @@ def game_dzip(request, game_id):
         )
     zip_path = "media/" + row.gamefile.name
     zip_name = os.path.basename(zip_path)
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=config.AWS_AUTH["aws_access_key_id"],
-        aws_secret_access_key=config.AWS_AUTH["aws_secret_access_key"],
-        region_name='ap-northeast-2'
-    )
-    s3_response = s3_client.get_object(Bucket=config.AWS_S3_BUCKET_NAME, Key=zip_path)
-    file_stream = s3_response['Body'].read()
+    s3_client = get_s3_client()
+
+    # redirect=true 이면 짧은 시간 동안 유효한 S3 다운로드 url로 이동 (웹 서버를 거치지 않음)
+    if request.query_params.get("redirect") == "true":
+        presigned_url = s3_client.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={
+                "Bucket": config.AWS_S3_BUCKET_NAME,
+                "Key": zip_path,
+                "ResponseContentDisposition": f'attachment; filename="{zip_name}"',
+            },
+            ExpiresIn=DZIP_PRESIGNED_URL_EXPIRES,
+        )
+        return HttpResponseRedirect(presigned_url)
+
+    # Range 요청이면 해당 구간만 S3에서 가져옴 (이어받기)
+    # If-Range 값이 현재 파일의 ETag 와 다르면 파일이 바뀐 것이므로 전체를 보냄
+    params = {"Bucket": config.AWS_S3_BUCKET_NAME, "Key": zip_path}
+    range_header = request.headers.get("Range")
+    if range_header and DZIP_RANGE_PATTERN.match(range_header):
+        params["Range"] = range_header
+        if request.headers.get("If-Range"):
+            params["IfMatch"] = request.headers["If-Range"]
+    try:
+        s3_response = s3_client.get_object(**params)
+    except ClientError as e:
+        error_code = e.response["Error"]["Code"]
+        if error_code == "PreconditionFailed":
+            params.pop("Range")
+            params.pop("IfMatch")
+            s3_response = s3_client.get_object(**params)
+        elif error_code == "InvalidRange":
+            response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            response["Content-Range"] = f'bytes */{e.response["Error"].get("ActualObjectSize", "*")}'
+            return response
+        else:
+            raise
 
-    # 메모리 스트림을 FileResponse로 반환
-    response = FileResponse(io.BytesIO(file_stream), content_type='application/zip')
+    # S3 응답을 나눠서 그대로 전달 (파일 전체를 메모리에 올리지 않음)
+    response = StreamingHttpResponse(
+        _iter_s3_body(s3_response["Body"]),
+        status=status.HTTP_206_PARTIAL_CONTENT if s3_response.get("ContentRange") else status.HTTP_200_OK,
+        content_type='application/zip',
+    )
+    response["Content-Length"] = s3_response["ContentLength"]
+    response["Accept-Ranges"] = "bytes"
+    if s3_response.get("ContentRange"):
+        response["Content-Range"] = s3_response["ContentRange"]
+    if s3_response.get("ETag"):
+        response["ETag"] = s3_response["ETag"]
 
     # 'Content-Disposition' value 값(HTTP Response 헤더값)을 설정
     # 파일 이름을 zip_name 으로 다운로드 폴더에 받겠다는 뜻
     response['Content-Disposition'] = f'attachment; filename="{zip_name}"'
 
-    # FileResponse 객체를 리턴
     return response
 
 
+def _iter_s3_body(body):
+    try:
+        yield from body.iter_chunks(chunk_size=DZIP_CHUNK_SIZE)
+    finally:
+        body.close()
+
+
 # 게임 등록 거부 사유 불러오는 API
 @api_view(['GET'])
 # @permission_classes([IsAuthenticated])
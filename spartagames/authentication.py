@@ -0,0 +1,122 @@
+import copy
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+# 요청 객체(HttpRequest)에 저장하는 인증 결과 (RequestContextMiddleware 와 DRF 인증이 함께 사용)
+REQUEST_AUTH_ATTR = "_jwt_authentication"
+
+# user_id -> User 프로세스 로컬 캐시 (0 이면 사용하지 않음)
+# 유저 정보 수정/삭제 시 이 프로세스의 캐시는 바로 지우고, 다른 프로세스는 TTL 이 지나면 반영됨
+JWT_USER_CACHE_TIMEOUT = getattr(settings, "JWT_USER_CACHE_TIMEOUT", 0)
+JWT_USER_CACHE_MAXSIZE = getattr(settings, "JWT_USER_CACHE_MAXSIZE", 10000)
+
+_user_cache = TTLCache(maxsize=JWT_USER_CACHE_MAXSIZE, ttl=JWT_USER_CACHE_TIMEOUT or 1)
+_user_cache_lock = threading.Lock()
+
+
+def get_cached_user(user_id):
+    with _user_cache_lock:
+        user = _user_cache.get(user_id)
+    # 요청마다 별도 객체를 사용 (뷰에서 request.user 를 수정해도 캐시에 영향 없음)
+    return copy.copy(user) if user is not None else None
+
+
+def cache_user(user):
+    with _user_cache_lock:
+        _user_cache[getattr(user, api_settings.USER_ID_FIELD)] = copy.copy(user)
+
+
+def invalidate_cached_user(user_id):
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+def get_request_authentication(request):
+    """
+    요청에 저장된 인증 결과 (없으면 None)
+    반환값: ((user, validated_token) 또는 None, AuthenticationFailed 또는 None)
+    """
+    return getattr(getattr(request, "_request", request), REQUEST_AUTH_ATTR, None)
+
+
+def set_request_authentication(request, auth=None, error=None):
+    setattr(getattr(request, "_request", request), REQUEST_AUTH_ATTR, (auth, error))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user_on_change(sender, instance, **kwargs):
+    # 프로필 수정, 비활성화, 비밀번호 변경, 탈퇴 시 캐시 삭제
+    invalidate_cached_user(getattr(instance, api_settings.USER_ID_FIELD))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication + 요청 단위 인증 결과 재사용 + user 캐시
+    RequestContextMiddleware 에서 한 번 인증하면 DRF 뷰에서는 토큰 검증과 유저 조회를 다시 하지 않음
+    """
+
+    def authenticate(self, request):
+        # DRF Request 인 경우 원래 HttpRequest 에 저장
+        result = get_request_authentication(request)
+        if result is None:
+            try:
+                result = (super().authenticate(request), None)
+            except AuthenticationFailed as e:
+                # 잘못된 토큰이면 DRF 인증에서 같은 에러(401)가 나도록 저장
+                result = (None, e)
+            set_request_authentication(request, *result)
+
+        auth, error = result
+        if error is not None:
+            raise error
+        return auth
+
+    def get_request_token(self, request):
+        """
+        요청 헤더의 토큰 검증 (DB 조회 없음), 토큰이 없으면 None
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        return self.get_validated_token(raw_token)
+
+    def get_cached_user(self, validated_token):
+        """
+        캐시에 있는 유저 (DB 조회 없음), 없으면 None
+        """
+        if not JWT_USER_CACHE_TIMEOUT:
+            return None
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_cached_user(user_id)
+        # 캐시에는 활성 유저만 저장하므로 비밀번호 변경 여부만 확인
+        if user is not None and api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+    def get_user(self, validated_token):
+        user = self.get_cached_user(validated_token)
+        if user is None:
+            user = super().get_user(validated_token)
+            if JWT_USER_CACHE_TIMEOUT:
+                cache_user(user)
+        return user
@@ -1,6 +1,6 @@
 import os
 from celery import Celery
-from celery.signals import task_prerun, task_postrun
+from celery.signals import task_prerun, task_postrun, worker_process_init
 from spartagames.logging_context import set_request_context, clear_request_context
 
 # Django의 settings.py 파일을 Celery에서 사용할 수 있도록 설정
@@ -13,7 +13,7 @@ app = Celery('spartagames')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Django 앱에서 tasks.py 파일을 자동으로 찾아 Celery에 태스크로 등록
-app.autodiscover_tasks(['qnas', 'games', 'accounts'])
+app.autodiscover_tasks(['qnas', 'games', 'accounts', 'commons'])
 
 
 # 기본 디버그 태스크
@@ -39,3 +39,10 @@ def celery_task_start(sender=None, task_id=None, task=None, args=None, kwargs=No
 @task_postrun.connect
 def celery_task_end(sender=None, **kwargs):
     clear_request_context()
+
+
+@worker_process_init.connect
+def celery_worker_process_init(**kwargs):
+    # prefork 로 만들어진 worker 프로세스는 부모의 S3 클라이언트(연결)를 쓰지 않고 새로 만듦
+    from spartagames.s3 import reset_s3_clients
+    reset_s3_clients()
@@ -1,20 +1,32 @@
-import asyncio
-import inspect
 import logging
 import uuid
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from channels.db import database_sync_to_async
 from django.utils.deprecation import MiddlewareMixin
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
 
+from .authentication import CachedJWTAuthentication, set_request_authentication
 from .logging_context import set_request_context, clear_request_context
 
 
 logger = logging.getLogger("sparta_games")
 
 
-class CustomXFrameOptionsMiddleware(MiddlewareMixin):
+class ResponseOnlyMiddlewareMixin(MiddlewareMixin):
+    """
+    process_response 에서 응답 헤더/데이터만 바꾸는 (DB 등 I/O 가 없는) 미들웨어용
+    async 모드에서 MiddlewareMixin 처럼 sync_to_async 로 스레드를 거치지 않고 이벤트 루프에서 바로 실행
+    """
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+
+class CustomXFrameOptionsMiddleware(ResponseOnlyMiddlewareMixin):
     def process_response(self, request, response):
         # 로컬 환경의 React 앱 주소를 허용
         if request.get_host() in ['127.0.0.1:8000', 'localhost:5173', 'sparta-games.net','spartagames-git-dev-horanges-projects.vercel.app','spartagames-horanges-projects.vercel.app']:
@@ -24,7 +36,7 @@ class CustomXFrameOptionsMiddleware(MiddlewareMixin):
         return response
 
 
-class DRFStandardResponseMiddleware(MiddlewareMixin):
+class DRFStandardResponseMiddleware(ResponseOnlyMiddlewareMixin):
     """
     DRF 뷰에서 나오는 모든 응답을 std_response 형식으로 통일하는 미들웨어
     """
@@ -104,66 +116,109 @@ class DRFStandardResponseMiddleware(MiddlewareMixin):
         return response
 
 
-class RequestContextMiddleware(MiddlewareMixin):
-    def __init__(self, get_response):
-        super().__init__(get_response)
-        self.jwt_authenticator = JWTAuthentication()
+class RequestContextMiddleware:
+    """
+    요청마다 request_id, user_id 를 로그 컨텍스트에 설정
+    WSGI(sync), ASGI(async) 모두 지원하며, async 에서는 DB 조회가 필요할 때만 스레드로 전환함
+    """
+    sync_capable = True
+    async_capable = True
 
-    async def __call__(self, request):
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.jwt_authenticator = CachedJWTAuthentication()
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
         try:
-            request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
-            request.request_id = request_id
-
-            # JWT 기반 유저 확인
+            # JWT 기반 유저 확인 (인증 결과는 request 에 저장되어 DRF 인증에서 재사용)
             user = getattr(request, "user", None)
             try:
-                header = self.jwt_authenticator.get_header(request)
-                if header is not None:
-                    raw_token = self.jwt_authenticator.get_raw_token(header)
-                    if raw_token is not None:
-                        validated_token = self.jwt_authenticator.get_validated_token(raw_token)
-                        user = self.jwt_authenticator.get_user(validated_token)
-                        request.user = user  # Django 레벨에서 user 세팅
+                auth = self.jwt_authenticator.authenticate(request)
+                if auth is not None:
+                    user, _ = auth
+                    request.user = user  # Django 레벨에서 user 세팅
             except Exception:
                 # 토큰이 없거나 잘못된 경우에는 그냥 anonymous 유지
                 user = None
-            
-            if user and request.user.is_authenticated:
-                user_id = request.user.pk
-            else:
-                user_id = "anonymous"
-
-            set_request_context(
-                request_id=request_id,
-                user_id=user_id,
-                path=request.path,
-                method=request.method,
-            )
-
-            logger.info(
-                "REQUEST START",
-                extra={
-                    "request_id": request_id,
-                    "user_id": user_id,
-                    "path": request.path,
-                    "method": request.method,
-                }
-            )
-
-            # response = self.get_response(request)
+            request_id = self._start_request(request, user)
             response = self.get_response(request)
-            if inspect.iscoroutine(response):
-                response = await response
-
-            logger.info(
-                f"REQUEST END (status_code: {response.status_code})",
-                extra={
-                    "request_id": request_id,
-                    "status_code": response.status_code,
-                }
-            )
-
-            response["X-Request-ID"] = request_id
-            return response
+            return self._end_request(request_id, response)
         finally:
             clear_request_context()
+
+    async def __acall__(self, request):
+        try:
+            # 세션 유저(request.user)는 DB 조회가 필요하므로 async 에서는 JWT 유저만 확인
+            user = await self._aauthenticate(request)
+            if user is not None:
+                request.user = user  # Django 레벨에서 user 세팅
+            request_id = self._start_request(request, user)
+            response = await self.get_response(request)
+            return self._end_request(request_id, response)
+        finally:
+            clear_request_context()
+
+    async def _aauthenticate(self, request):
+        """
+        토큰 검증은 이벤트 루프에서 하고, 캐시에 없는 유저만 database_sync_to_async 로 조회
+        """
+        try:
+            validated_token = self.jwt_authenticator.get_request_token(request)
+            if validated_token is None:
+                set_request_authentication(request)
+                return None
+            user = self.jwt_authenticator.get_cached_user(validated_token)
+            if user is None:
+                user = await database_sync_to_async(self.jwt_authenticator.get_user)(validated_token)
+            set_request_authentication(request, (user, validated_token))
+            return user
+        except AuthenticationFailed as e:
+            set_request_authentication(request, error=e)
+        except Exception:
+            # 그 외 에러는 DRF 인증에서 다시 확인
+            pass
+        return None
+
+    def _start_request(self, request, user):
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        request.request_id = request_id
+
+        if user and user.is_authenticated:
+            user_id = user.pk
+        else:
+            user_id = "anonymous"
+
+        set_request_context(
+            request_id=request_id,
+            user_id=user_id,
+            path=request.path,
+            method=request.method,
+        )
+
+        logger.info(
+            "REQUEST START",
+            extra={
+                "request_id": request_id,
+                "user_id": user_id,
+                "path": request.path,
+                "method": request.method,
+            }
+        )
+        return request_id
+
+    def _end_request(self, request_id, response):
+        logger.info(
+            f"REQUEST END (status_code: {response.status_code})",
+            extra={
+                "request_id": request_id,
+                "status_code": response.status_code,
+            }
+        )
+
+        response["X-Request-ID"] = request_id
+        return response
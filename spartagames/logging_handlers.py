@@ -0,0 +1,165 @@
+import atexit
+import copy
+from datetime import datetime, timezone
+import json
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import os
+import queue
+import sys
+import threading
+import weakref
+import zlib
+
+from django.utils.module_loading import import_string
+
+
+# LogRecord 기본 속성 (JSON 출력 시 extra 로 넘긴 값만 따로 구분하기 위해 사용)
+_RECORD_ATTRS = set(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {"message", "asctime"}
+# RequestContextFilter 에서 넣는 값 (JSON 출력 시 항상 포함)
+_CONTEXT_ATTRS = ("request_id", "user_id", "path", "method")
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    한 줄에 하나의 JSON 객체로 출력
+    """
+
+    def format(self, record):
+        data = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for attr in _CONTEXT_ATTRS:
+            data[attr] = getattr(record, attr, "-")
+        # logger.info(..., extra={...}) 로 넘긴 값
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in data:
+                data[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class RequestSamplingFilter(logging.Filter):
+    """
+    요청 시작/종료 로그(REQUEST START, REQUEST END) 중 일부만 남김
+    같은 request_id 의 시작/종료 로그는 함께 남기거나 함께 버림
+    WARNING 이상 로그와 에러 응답(status_code 400 이상) 로그는 항상 남김
+    """
+
+    def __init__(self, rate=1.0, messages=("REQUEST START", "REQUEST END")):
+        super().__init__()
+        self.threshold = int(rate * 10000)
+        self.messages = tuple(messages)
+
+    def filter(self, record):
+        if self.threshold >= 10000 or record.levelno >= logging.WARNING:
+            return True
+        if not isinstance(record.msg, str) or not record.msg.startswith(self.messages):
+            return True
+        if getattr(record, "status_code", 0) >= 400:
+            return True
+        request_id = str(getattr(record, "request_id", ""))
+        return zlib.crc32(request_id.encode()) % 10000 < self.threshold
+
+
+class _QueueListener(QueueListener):
+
+    def enqueue_sentinel(self):
+        # 큐가 가득 차 있어도 종료 신호는 버리지 않음
+        self.queue.put(self._sentinel)
+
+
+class QueuedHandler(QueueHandler):
+    """
+    로그를 큐에 넣고 별도 스레드(QueueListener)에서 실제 handler 로 출력
+    요청 처리 스레드는 파일/콘솔 출력을 기다리지 않음
+
+    handler_class, handler_options: 실제 출력할 handler (예: logging.FileHandler, {"filename": ...})
+    queue_size: 큐 최대 크기
+    policy: 큐가 가득 찼을 때 "drop" 이면 버림, "block" 이면 빌 때까지 기다림 (ERROR 이상은 항상 기다림)
+    """
+
+    def __init__(self, handler_class="logging.StreamHandler", handler_options=None, queue_size=10000, policy="drop"):
+        if policy not in ("drop", "block"):
+            raise ValueError(f"invalid policy ({policy})")
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.target = import_string(handler_class)(**(handler_options or {}))
+        self.policy = policy
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.listener = None
+        self.start()
+        _queued_handlers.add(self)
+
+    def setFormatter(self, fmt):
+        # 포맷은 출력 스레드에서 하도록 실제 handler 에 설정
+        self.target.setFormatter(fmt)
+
+    def start(self):
+        self.listener = _QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def prepare(self, record):
+        # 메시지와 예외만 요청 스레드에서 문자열로 만들고 (args, traceback 을 다른 스레드로 넘기지 않음)
+        # 나머지 포맷은 출력 스레드에서 처리
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.policy == "block" or record.levelno >= logging.ERROR:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+                dropped = self.dropped
+            # 버린 개수를 가끔 stderr 로 알림 (로깅을 다시 거치지 않음)
+            if dropped == 1 or dropped % 1000 == 0:
+                sys.stderr.write(f"logging queue full: {dropped} records dropped ({self.name})\n")
+
+    def close(self):
+        self.stop()
+        self.target.close()
+        super().close()
+
+
+_queued_handlers = weakref.WeakSet()
+
+
+def _stop_queued_handlers():
+    # 종료 시 큐에 남은 로그 출력
+    for handler in list(_queued_handlers):
+        handler.stop()
+
+
+def _restart_queued_handlers():
+    # fork 된 자식 프로세스(Celery prefork worker 등)에는 출력 스레드가 없으므로 새로 시작
+    for handler in list(_queued_handlers):
+        handler.queue = queue.Queue(maxsize=handler.queue.maxsize)
+        handler._dropped_lock = threading.Lock()
+        handler.start()
+
+
+atexit.register(_stop_queued_handlers)
+os.register_at_fork(after_in_child=_restart_queued_handlers)
@@ -1,6 +1,90 @@
-from rest_framework.pagination import PageNumberPagination
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
+
+# 실행계획의 예상 행 수가 이 값보다 작으면 정확한 COUNT로 계산
+APPROXIMATE_COUNT_THRESHOLD = 1000
+
+
+def use_cursor_pagination(request):
+    """
+    ?pagination=cursor 로 요청한 경우 키셋(커서) 페이지네이션 사용
+    """
+    return request.query_params.get('pagination') == 'cursor'
+
+
+def approximate_count(queryset):
+    """
+    전체 개수 근사치
+    PostgreSQL에서는 COUNT(*) 대신 실행계획(EXPLAIN)의 예상 행 수를 사용하고,
+    예상 행 수가 작거나 다른 DB인 경우에는 정확한 COUNT를 사용
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]['Plan']['Plan Rows']
+        if estimate >= APPROXIMATE_COUNT_THRESHOLD:
+            return estimate
+    return queryset.count()
+
+
+class PinnedQuerySets:
+    """
+    고정 목록(pinned)을 먼저, 나머지 목록(rest)을 이어서 하나의 목록처럼 페이지네이션하기 위한 객체
+    전체를 메모리에 불러오지 않고 COUNT 쿼리 2번과 필요한 구간만 LIMIT/OFFSET으로 조회함
+    """
+
+    def __init__(self, pinned, rest):
+        self.pinned = pinned
+        self.rest = rest
+
+    @property
+    def ordered(self):
+        return self.pinned.ordered and self.rest.ordered
+
+    def pinned_count(self):
+        if not hasattr(self, "_pinned_count"):
+            self._pinned_count = self.pinned.count()
+        return self._pinned_count
+
+    def count(self):
+        if not hasattr(self, "_count"):
+            self._count = self.pinned_count() + self.rest.count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+
+        pinned_count = self.pinned_count()
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+
+        items = []
+        # 고정 목록에 걸친 구간
+        if start < pinned_count:
+            items += list(self.pinned[start:min(stop, pinned_count)])
+        # 나머지 목록에 걸친 구간
+        if stop > pinned_count:
+            items += list(self.rest[max(start - pinned_count, 0):stop - pinned_count])
+        return items
+
+
 class ReviewCustomPagination(PageNumberPagination):
     page_size = 4  # 기본 페이지 크기
     page_size_query_param = 'limit'  # 클라이언트가 페이지 크기를 제어
@@ -11,15 +95,14 @@ class ReviewCustomPagination(PageNumberPagination):
         """
         빈 값을 추가하고 총 개수를 조정합니다.
         """
-        # 데이터가 리스트인지 QuerySet인지 확인
-        if not hasattr(queryset, 'count'):
-            queryset = list(queryset)
+        # 부모 클래스의 paginate_queryset 호출
+        page = super().paginate_queryset(queryset, request, view)
 
         # 총 개수 계산 (빈 값 포함)
-        self.total_count = len(queryset)
-        
-        # 부모 클래스의 paginate_queryset 호출
-        return super().paginate_queryset(queryset, request, view)
+        # QuerySet, PinnedQuerySets는 COUNT 쿼리로, 리스트는 len()으로 계산됨
+        self.total_count = self.page.paginator.count
+
+        return page
 
     def get_paginated_response(self, data):
         """
@@ -38,4 +121,115 @@ class CustomPagination(PageNumberPagination):
     page_size = 20  # 기본 페이지 크기
     page_size_query_param = 'limit'  # 클라이언트가 페이지 크기를 제어
     page_query_param = 'page'  # 페이지 번호 쿼리 파라미터
-    max_page_size = 100  # 최대 허용 페이지 크기
\ No newline at end of file
+    max_page_size = 100  # 최대 허용 페이지 크기
+
+class KeysetPagination(CursorPagination):
+    """
+    정렬 필드 조합(예: (created_at, id))의 마지막 값을 커서로 사용하는 키셋 페이지네이션
+    OFFSET 없이 인덱스 범위 조건으로 다음 페이지를 조회하므로 깊은 페이지도 첫 페이지와 비용이 같음
+    ordering의 마지막 필드는 유일한 값(id)이어야 함
+    """
+    page_size_query_param = 'limit'  # 클라이언트가 페이지 크기를 제어
+    max_page_size = 100  # 최대 허용 페이지 크기
+    ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        # 총 개수 (근사치)
+        self.total_count = approximate_count(queryset)
+
+        # 이전 페이지 조회 시에는 정렬 방향을 뒤집어 조회한 뒤 결과를 다시 뒤집음
+        ordering = [self._invert(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            queryset = queryset.filter(self.get_keyset_filter(queryset.model, ordering, self.cursor.position))
+
+        # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self.encode_position(self.page[-1])
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self.encode_position(self.page[0])
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.total_count,  # 총 개수 (근사치)
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def encode_position(self, instance):
+        """
+        정렬 필드 값들을 JSON 문자열로 변환 (datetime은 마이크로초까지 유지)
+        """
+        values = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            if isinstance(value, (datetime.datetime, datetime.date)):
+                value = value.isoformat()
+            values.append(value)
+        return json.dumps(values)
+
+    def decode_position(self, model, ordering, position):
+        try:
+            values = json.loads(position)
+            if len(values) != len(ordering):
+                raise ValueError
+            decoded = []
+            for field, value in zip(ordering, values):
+                try:
+                    value = model._meta.get_field(field.lstrip('-')).to_python(value)
+                except FieldDoesNotExist:
+                    # annotate로 추가한 값은 그대로 사용
+                    pass
+                decoded.append(value)
+            return decoded
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_keyset_filter(self, model, ordering, position):
+        """
+        (a, b, c) 정렬 기준으로 커서 다음 행들을 조회하는 조건
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z) (내림차순 필드는 <)
+        """
+        values = self.decode_position(model, ordering, position)
+        keyset = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            keyset |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return keyset
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else f"-{field}"
@@ -0,0 +1,15 @@
+from urllib.parse import urlparse
+
+import redis
+from django.conf import settings
+
+
+# Celery 브로커와 같은 Redis (db 0) 를 사용하는 공용 클라이언트
+# 게임 등록 중복 방지 키, 게임 조회/플레이 이벤트 버퍼 등에 사용
+redis_url = urlparse(settings.CELERY_BROKER_URL)
+r = redis.Redis(
+    host=redis_url.hostname,
+    port=redis_url.port,
+    password=redis_url.password,
+    db=0
+)
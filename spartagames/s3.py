@@ -0,0 +1,75 @@
+import os
+import threading
+
+import boto3
+from botocore.config import Config
+from django.conf import settings
+
+
+# 프로세스 공용 S3 클라이언트
+# 요청/작업마다 boto3.client 를 새로 만들면 인증 정보 확인, 엔드포인트 설정, TLS 연결을 매번 다시 하므로
+# 한 번 만든 클라이언트(연결 풀 포함)를 재사용함 (boto3 client 는 여러 스레드에서 함께 사용해도 안전함)
+S3_CLIENT_CONFIG = Config(
+    # 게임 파일 업로드 스레드 수 x part 동시 업로드 수 보다 크게 설정
+    max_pool_connections=getattr(settings, "AWS_S3_MAX_POOL_CONNECTIONS", 50),
+    tcp_keepalive=True,
+    retries={"max_attempts": 5, "mode": "standard"},
+)
+
+_lock = threading.Lock()
+_session = None
+_clients = {}
+
+
+def get_s3_client(region_name=None):
+    """
+    S3 클라이언트 (리전별로 프로세스당 하나)
+    """
+    region_name = region_name or settings.AWS_S3_REGION_NAME
+    client = _clients.get(region_name)
+    if client is None:
+        with _lock:
+            client = _clients.get(region_name)
+            if client is None:
+                client = _get_session().client("s3", region_name=region_name, config=S3_CLIENT_CONFIG)
+                _clients[region_name] = client
+    return client
+
+
+def _get_session():
+    # boto3 Session 생성은 스레드 안전하지 않으므로 _lock 안에서만 호출
+    global _session
+    if _session is None:
+        _session = boto3.session.Session(
+            aws_access_key_id=settings.AWS_S3_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_S3_SECRET_ACCESS_KEY,
+        )
+    return _session
+
+
+def reset_s3_clients():
+    """
+    클라이언트 초기화
+    fork 된 자식 프로세스(Celery prefork worker, gunicorn worker 등)가
+    부모 프로세스의 연결(소켓)과 잠금 상태를 이어받아 사용하지 않도록 새로 만들게 함
+    """
+    global _lock, _session, _clients
+    _lock = threading.Lock()
+    _session = None
+    _clients = {}
+
+
+os.register_at_fork(after_in_child=reset_s3_clients)
+
+
+def delete_s3_prefix(prefix, bucket_name=None):
+    """
+    prefix 로 시작하는 S3 객체 모두 삭제 (1,000개씩 일괄 삭제)
+    """
+    bucket_name = bucket_name or settings.AWS_STORAGE_BUCKET_NAME
+    s3 = get_s3_client()
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        objects = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+        if objects:
+            s3.delete_objects(Bucket=bucket_name, Delete={"Objects": objects, "Quiet": True})
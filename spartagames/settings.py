@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
 
     # Third Party
     "corsheaders",
@@ -165,6 +166,15 @@ CHANNEL_LAYERS = {
     },
 }
 
+# 캐시 (Celery, Channels와 같은 Redis 서버의 1번 데이터베이스 사용)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1',
+        'KEY_PREFIX': 'spartagames',
+    },
+}
+
 # Celery 브로커로 Django 데이터베이스 사용
 CELERY_BROKER_URL = 'redis://127.0.0.1:6379/0'
 CELERY_RESULT_BACKEND = 'django-db'
@@ -197,6 +207,22 @@ CELERY_BEAT_SCHEDULE = {
     #    'task': 'games.tasks.assign_review_top_chips',
     #    'schedule': crontab(hour=3, minute=40),
     #},
+    'flush-game-events': {
+        'task': 'games.tasks.flush_game_events',
+        'schedule': timedelta(seconds=10),
+    },
+    'rebuild-game-rankings-daily': {
+        'task': 'games.tasks.rebuild_game_rankings',
+        'schedule': crontab(hour=3, minute=20),
+    },
+    'reconcile-game-ratings-daily': {
+        'task': 'games.tasks.reconcile_game_ratings',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'cleanup-gamefile-uploads-daily': {
+        'task': 'games.tasks.cleanup_gamefile_uploads',
+        'schedule': crontab(hour=3, minute=10),
+    },
     'hard-delete-user': {
         'task': 'qnas.tasks.hard_delete_user',
         'schedule': crontab(hour=6, minute=0),
@@ -255,7 +281,7 @@ SITE_ID = 2
 # DRF Auth setting - default: JWT
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "spartagames.authentication.CachedJWTAuthentication",
     ],
     'DEFAULT_PAGINATION_CLASS': 'spartagames.pagination.CustomPagination',
     'PAGE_SIZE': 20,
@@ -270,6 +296,9 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+# JWT 인증 시 user_id -> User 프로세스 로컬 캐시 (spartagames.authentication), 0 이면 사용하지 않음
+JWT_USER_CACHE_TIMEOUT = 30
+JWT_USER_CACHE_MAXSIZE = 10000
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -295,6 +324,17 @@ AWS_S3_CUSTOM_DOMAIN = f"{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_S3_REGION_NAME}.amazo
 AWS_S3_FILE_OVERWRITE = False
 AWS_QUERYSTRING_AUTH = False
 
+# 게임 빌드 파일 S3 업로드 설정 (qnas.utils.publish_game_zip)
+# 동시에 업로드할 파일 수
+GAME_PUBLISH_MAX_WORKERS = 8
+# 이 크기 이상인 파일은 multipart로 나눠서 업로드 (.data, .wasm, .unityweb 등)
+GAME_PUBLISH_MULTIPART_THRESHOLD = 16 * 1024 * 1024
+GAME_PUBLISH_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+# 파일 하나당 동시에 업로드할 part 수
+GAME_PUBLISH_MULTIPART_CONCURRENCY = 4
+# 공용 S3 클라이언트 연결 풀 크기 (spartagames.s3), MAX_WORKERS x MULTIPART_CONCURRENCY 보다 커야 함
+AWS_S3_MAX_POOL_CONNECTIONS = 50
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
@@ -319,6 +359,13 @@ ACCOUNT_EMAIL_REQUIRED = True  # 이메일을 필수로 요구
 ACCOUNT_USERNAME_REQUIRED = False  # username 필드를 사용하지 않음
 ACCOUNT_AUTHENTICATION_METHOD = 'email'  # 이메일을 로그인에 사용
 
+# 로그는 큐에 넣고 별도 스레드에서 출력 (spartagames.logging_handlers.QueuedHandler)
+# 큐가 가득 차면 "drop": 버림 (ERROR 이상은 제외), "block": 빌 때까지 기다림
+LOG_QUEUE_SIZE = 10000
+LOG_QUEUE_POLICY = "drop"
+# 요청 시작/종료 로그를 남길 비율 (에러 응답은 항상 남김)
+LOG_REQUEST_SAMPLE_RATE = 0.1
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -326,6 +373,10 @@ LOGGING = {
         "request_context": {
             "()": "spartagames.logging_context.RequestContextFilter",
         },
+        "request_sampling": {
+            "()": "spartagames.logging_handlers.RequestSamplingFilter",
+            "rate": LOG_REQUEST_SAMPLE_RATE,
+        },
     },
     "formatters": {
         "verbose": {
@@ -335,27 +386,37 @@ LOGGING = {
                 "%(message)s path=%(path)s method=%(method)s"
             )
         },
+        "json": {
+            "()": "spartagames.logging_handlers.JsonFormatter",
+        },
     },
     "handlers": {
         'info_level_log_file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': BASE_DIR / 'spartagames_BE_info_level.log',
-            "filters": ["request_context"],
-            "formatter": "verbose",
-            "encoding": "utf-8",
+            '()': 'spartagames.logging_handlers.QueuedHandler',
+            'handler_class': 'logging.FileHandler',
+            'handler_options': {'filename': BASE_DIR / 'spartagames_BE_info_level.log', 'encoding': 'utf-8'},
+            'queue_size': LOG_QUEUE_SIZE,
+            'policy': LOG_QUEUE_POLICY,
+            "filters": ["request_context", "request_sampling"],
+            "formatter": "json",
         },
         'celery_log_file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': BASE_DIR / 'spartagames_BE_celery.log',
+            '()': 'spartagames.logging_handlers.QueuedHandler',
+            'handler_class': 'logging.FileHandler',
+            'handler_options': {'filename': BASE_DIR / 'spartagames_BE_celery.log', 'encoding': 'utf-8'},
+            'queue_size': LOG_QUEUE_SIZE,
+            'policy': LOG_QUEUE_POLICY,
             "filters": ["request_context"],
-            "formatter": "verbose",
-            "encoding": "utf-8",
+            "formatter": "json",
         },
         "console": {
-            "class": "logging.StreamHandler",
-            "filters": ["request_context"],
+            '()': 'spartagames.logging_handlers.QueuedHandler',
+            'handler_class': 'logging.StreamHandler',
+            'queue_size': LOG_QUEUE_SIZE,
+            'policy': LOG_QUEUE_POLICY,
+            "filters": ["request_context", "request_sampling"],
             "formatter": "verbose",
         },
     },
@@ -2,6 +2,8 @@
 
 from rest_framework.pagination import PageNumberPagination
 
+from spartagames.pagination import KeysetPagination
+
 
 class TeamBuildPostPagination(PageNumberPagination):
     page_size = 12  # 기본 페이지 크기 설정
@@ -10,6 +12,11 @@ class TeamBuildPostPagination(PageNumberPagination):
     max_page_size = 100  # 허용되는 최대 페이지 크기
 
 
+class TeamBuildPostCursorPagination(KeysetPagination):
+    page_size = 12  # 기본 페이지 크기 설정
+    ordering = ('-create_dt', '-id')  # 정렬 조건에 따라 뷰에서 변경
+
+
 class MyTeamBuildPostPagination(PageNumberPagination):
     page_size = 3  # 기본 페이지 크기 설정
     page_size_query_param = 'limit'  # 클라이언트가 페이지 크기를 조정할 수 있는 파라미터
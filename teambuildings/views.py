@@ -4,8 +4,6 @@ import os
 import requests  # S3 사용
 from urllib.parse import urlparse
 
-import boto3
-
 from django.utils import timezone
 from django.db.models import Q, Case, When, Value, IntegerField
 from django.core.files.storage import default_storage
@@ -24,6 +22,7 @@ from .models import TeamBuildPost, TeamBuildProfile, TeamBuildPostComment, Role
 from .models import PURPOSE_CHOICES, DURATION_CHOICES, MEETING_TYPE_CHOICES
 from .pagination import (
     TeamBuildPostPagination,
+    TeamBuildPostCursorPagination,
     TeamBuildProfileListPagination,
     TeamBuildPostCommentPagination,
 )
@@ -39,7 +38,9 @@ from .utils import validate_want_roles, validate_choice, extract_srcs, parse_lin
 from games.models import GameCategory
 from games.utils import validate_image
 
-from spartagames.config import AWS_AUTH, AWS_S3_BUCKET_NAME, AWS_S3_REGION_NAME, AWS_S3_CUSTOM_DOMAIN, AWS_S3_BUCKET_IMAGES
+from spartagames.config import AWS_S3_BUCKET_NAME, AWS_S3_REGION_NAME, AWS_S3_CUSTOM_DOMAIN, AWS_S3_BUCKET_IMAGES
+from spartagames.pagination import use_cursor_pagination
+from spartagames.s3 import get_s3_client
 from spartagames.utils import std_response
 from commons.models import UploadImage
 
@@ -221,8 +222,12 @@ class TeamBuildPostAPIView(APIView):
             
             teambuildposts = teambuildposts.filter(want_roles__name__in=roles_list).distinct()
 
-        # 페이지네이션
-        paginator = TeamBuildPostPagination()
+        # 페이지네이션 (?pagination=cursor 인 경우 (마감 여부, create_dt, id) 키셋 페이지네이션)
+        if use_cursor_pagination(request):
+            paginator = TeamBuildPostCursorPagination()
+            paginator.ordering = ('is_open_priority', '-create_dt', '-id')
+        else:
+            paginator = TeamBuildPostPagination()
         paginated_posts = paginator.paginate_queryset(teambuildposts, request)
         serializer = TeamBuildPostSerializer(paginated_posts, many=True)
         response_data = paginator.get_paginated_response(serializer.data).data
@@ -347,12 +352,7 @@ class TeamBuildPostAPIView(APIView):
         post.want_roles.set(Role.objects.filter(name__in=want_roles))
 
         # S3 클라이언트 불러오기
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=AWS_AUTH["aws_access_key_id"],
-            aws_secret_access_key=AWS_AUTH["aws_secret_access_key"],
-            region_name=AWS_S3_REGION_NAME,
-        )
+        s3 = get_s3_client(AWS_S3_REGION_NAME)
 
         # content 에서 img src 파싱
         srcs = extract_srcs(post.content, base_url=f"{AWS_S3_BUCKET_IMAGES}/screenshot/teambuildings")
@@ -470,8 +470,11 @@ def teambuild_post_search(request):
         valid_durations = get_valid_duration_keys(duration)
         teambuild_posts = teambuild_posts.filter(duration__in=valid_durations)
 
-    # 페이지네이션
-    paginator = TeamBuildPostPagination()
+    # 페이지네이션 (?pagination=cursor 인 경우 (create_dt, id) 키셋 페이지네이션)
+    if use_cursor_pagination(request):
+        paginator = TeamBuildPostCursorPagination()
+    else:
+        paginator = TeamBuildPostPagination()
     paginated_teambuild_posts = paginator.paginate_queryset(teambuild_posts, request)
     _serializer = TeamBuildPostSerializer(paginated_teambuild_posts, many=True)
     response_data = paginator.get_paginated_response(_serializer.data).data
@@ -566,12 +569,7 @@ class TeamBuildPostDetailAPIView(APIView):
             new_srcs = extract_srcs(post.content, base_url=f"{AWS_S3_BUCKET_IMAGES}/screenshot/teambuildings")
             
             # S3 클라이언트 불러오기
-            s3 = boto3.client(
-                's3',
-                aws_access_key_id=AWS_AUTH["aws_access_key_id"],
-                aws_secret_access_key=AWS_AUTH["aws_secret_access_key"],
-                region_name=AWS_S3_REGION_NAME,
-            )
+            s3 = get_s3_client(AWS_S3_REGION_NAME)
             
             # 수정 이후 사라진 이미지에 대해, DB 데이터 삭제 및 S3 오브젝트 삭제 처리
             delete_srcs = set(old_srcs) - set(new_srcs)
@@ -723,12 +721,7 @@ class TeamBuildPostDetailAPIView(APIView):
             
             # S3 오브젝트 삭제
             # S3 클라이언트 불러오기
-            s3 = boto3.client(
-                's3',
-                aws_access_key_id=AWS_AUTH["aws_access_key_id"],
-                aws_secret_access_key=AWS_AUTH["aws_secret_access_key"],
-                region_name=AWS_S3_REGION_NAME,
-            )
+            s3 = get_s3_client(AWS_S3_REGION_NAME)
             # 삭제
             s3.delete_objects(
                 Bucket=AWS_S3_BUCKET_NAME,
@@ -1168,12 +1161,7 @@ class CreateTeamBuildProfileAPIView(APIView):
         profile.game_genre.set(game_genres)
 
         # S3 클라이언트 불러오기
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=AWS_AUTH["aws_access_key_id"],
-            aws_secret_access_key=AWS_AUTH["aws_secret_access_key"],
-            region_name=AWS_S3_REGION_NAME,
-        )
+        s3 = get_s3_client(AWS_S3_REGION_NAME)
 
         # content 에서 img src 파싱
         srcs = extract_srcs(profile.content, base_url=f"{AWS_S3_BUCKET_IMAGES}/screenshot/teambuildings")
@@ -1413,12 +1401,7 @@ class TeamBuildProfileAPIView(APIView):
         new_srcs = extract_srcs(profile.content, base_url=f"{AWS_S3_BUCKET_IMAGES}/screenshot/teambuildings")
         
         # S3 클라이언트 불러오기
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=AWS_AUTH["aws_access_key_id"],
-            aws_secret_access_key=AWS_AUTH["aws_secret_access_key"],
-            region_name=AWS_S3_REGION_NAME,
-        )
+        s3 = get_s3_client(AWS_S3_REGION_NAME)
         
         # 수정 이후 사라진 이미지에 대해, DB 데이터 삭제 및 S3 오브젝트 삭제 처리
         delete_srcs = set(old_srcs) - set(new_srcs)
@@ -1499,12 +1482,7 @@ class TeamBuildProfileAPIView(APIView):
             
             # S3 오브젝트 삭제
             # S3 클라이언트 불러오기
-            s3 = boto3.client(
-                's3',
-                aws_access_key_id=AWS_AUTH["aws_access_key_id"],
-                aws_secret_access_key=AWS_AUTH["aws_secret_access_key"],
-                region_name=AWS_S3_REGION_NAME,
-            )
+            s3 = get_s3_client(AWS_S3_REGION_NAME)
             # 삭제
             s3.delete_objects(
                 Bucket=AWS_S3_BUCKET_NAME,
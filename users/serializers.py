@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from games.models import Game, Like
+from games.serializers import GameListBatchSerializer
 
 class MyGameListSerializer(serializers.ModelSerializer):
     maker_data = serializers.SerializerMethodField()
@@ -13,6 +14,7 @@ class MyGameListSerializer(serializers.ModelSerializer):
             "id", "title", "thumbnail", "star", "content", "register_state",
             "maker_data", "chips", "is_liked", "category_data"
         )
+        list_serializer_class = GameListBatchSerializer
     
     def get_maker_data(self, obj):
         return {
@@ -21,28 +23,14 @@ class MyGameListSerializer(serializers.ModelSerializer):
         }
     
     def get_chips(self, obj):
-        chips = obj.chip.all()
-        difficulty_chips = ["EASY", "NORMAL", "HARD"]
-        priority_chips = ["Daily Top", "New Game", "Bookmark Top", "Long Play", "Review Top"]
-
-        result = []
-
-        # 난이도 칩 하나 선택
-        difficulty_chip = chips.filter(name__in=difficulty_chips).first()
-        if difficulty_chip:
-            result.append({"id": difficulty_chip.id, "name": difficulty_chip.name})
-
-        # 우선순위 칩 최대 2개 추가
-        for chip_name in priority_chips:
-            if len(result) >= 3:
-                break
-            chip = chips.filter(name=chip_name).first()
-            if chip:
-                result.append({"id": chip.id, "name": chip.name})
-
-        return result
+        return obj.display_chips
     
     def get_is_liked(self, obj):
+        # 목록 직렬화 시 미리 조회한 즐겨찾기 목록 사용
+        liked_game_ids = self.context.get('liked_game_ids')
+        if liked_game_ids is not None:
+            return obj.pk in liked_game_ids
+
         user = self.context.get('user')
         # 사용자가 인증된 경우 해당 게임에 대한 좋아요 상태를 확인
         if user and user.is_authenticated:
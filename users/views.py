@@ -23,6 +23,7 @@ from games.models import (
     GameCategory,
 )
 from games.serializers import GameListSerializer
+from games.utils import refresh_search_documents
 from teambuildings.models import TeamBuildPost
 from teambuildings.pagination import MyTeamBuildPostPagination
 from teambuildings.serializers import TeamBuildPostSerializer
@@ -153,6 +154,7 @@ class ProfileAPIView(APIView):
         #     return Response({"error_message": "이미 존재하는 email입니다.."})
 
         # 닉네임
+        nickname_changed = nickname != user.nickname
         user.nickname = nickname
         # 프로필 이미지
         # 2025-03-22 FE팀 요청
@@ -179,6 +181,10 @@ class ProfileAPIView(APIView):
         # 변경한 데이터 저장
         user.save()
 
+        # 닉네임 변경 시 제작한 게임들의 검색용 문서 갱신
+        if nickname_changed:
+            refresh_search_documents(user.games.all())
+
         categories = list(user.game_category.values_list('id', flat=True))
         data = {
             "nickname": user.nickname,
@@ -615,7 +621,7 @@ def gamepacks(request, user_id):
     
     # 게임팩 세팅
     # 1. 즐겨찾기한 게임
-    liked_games = Game.objects.filter(likes__user=user, is_visible=True, register_state=1).order_by('-created_at')[:4]
+    liked_games = list(Game.objects.filter(likes__user=user, is_visible=True, register_state=1).order_by('-created_at')[:4])
     # 2. 관심 있는 카테고리의 게임 가져오기
     interested_categories = user.game_category.all()
     category_games = Game.objects.filter(
@@ -624,12 +630,12 @@ def gamepacks(request, user_id):
         register_state=1
     ).exclude(likes__user=user).distinct().order_by('-star','-created_at')
     # 좋아요한 게임과 최근 플레이한 게임을 조합하여 최대 4개의 게임으로 구성
-    liked_games_count = liked_games.count()
+    liked_games_count = len(liked_games)
     if liked_games_count < 4:
         additional_category_games = category_games[:4 - liked_games_count]
-        combined_games = list(liked_games) + list(additional_category_games)
+        combined_games = liked_games + list(additional_category_games)
     else:
-        combined_games = list(liked_games)  # 좋아요한 게임만으로 4개가 이미 채워짐
+        combined_games = liked_games  # 좋아요한 게임만으로 4개가 이미 채워짐
     
     # 리턴
     if combined_games:
@@ -673,7 +679,8 @@ def recently_played_games(request, user_id):
     recently_played_games = Game.objects.filter(is_visible=True, register_state=1, totalplaytime__user=user).order_by('-totalplaytime__latest_at').distinct()
 
     # 리턴
-    if recently_played_games:
+    # 전체 목록을 불러오지 않도록 exists()로 존재 여부만 확인
+    if recently_played_games.exists():
         # 페이지네이션 적용
         paginator = CustomPagination()
         paginated_data = paginator.paginate_queryset(recently_played_games, request)